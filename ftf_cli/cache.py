@@ -0,0 +1,151 @@
+"""Persistent on-disk cache for results that only depend on file contents.
+
+Entries are small JSON files under ``$FTF_CACHE_DIR`` (default
+``~/.facets/cache``), grouped by namespace and addressed by a SHA-256 key.
+Writes are atomic, so concurrent ftf processes can share a cache directory.
+A missing, unreadable or corrupt entry is treated as a cache miss.
+"""
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+import click
+
+CACHE_DIR_ENV = "FTF_CACHE_DIR"
+
+
+def get_cache_dir():
+    """Return the cache directory from FTF_CACHE_DIR, defaulting to ~/.facets/cache."""
+    return os.environ.get(CACHE_DIR_ENV) or os.path.expanduser("~/.facets/cache")
+
+
+@functools.lru_cache(maxsize=None)
+def cli_version():
+    """Return the installed ftf-cli version, used to invalidate entries on upgrade."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("ftf-cli")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@functools.lru_cache(maxsize=None)
+def source_digest(*module_files):
+    """Return a digest of the given source files, used as the version of the rules they define."""
+    digest = hashlib.sha256()
+    for module_file in module_files:
+        with open(module_file, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def make_key(*parts):
+    """Return the SHA-256 hex key for the given str/bytes parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+def _entry_path(namespace, key):
+    return os.path.join(get_cache_dir(), namespace, key[:2], f"{key}.json")
+
+
+def load(namespace, key):
+    """Return the cached value for key, or None on a miss."""
+    try:
+        with open(_entry_path(namespace, key), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store(namespace, key, value):
+    """Store a JSON-serialisable value for key. Failures to write are ignored."""
+    path = _entry_path(namespace, key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def remove(namespace, key):
+    """Remove the entry for key, if any. Failures to remove are ignored."""
+    try:
+        os.remove(_entry_path(namespace, key))
+    except OSError:
+        pass
+
+
+class _Tee(io.TextIOBase):
+    """Text stream that records everything written to it and passes it through."""
+
+    def __init__(self, stream):
+        super().__init__()
+        self._stream = stream
+        self.recorded = []
+
+    @property
+    def encoding(self):
+        return getattr(self._stream, "encoding", "utf-8")
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return False
+
+    def write(self, data):
+        if not isinstance(data, str):
+            # Makes click treat this as a text stream rather than a binary one.
+            raise TypeError(f"write() argument must be str, not {type(data).__name__}")
+        self.recorded.append(data)
+        return self._stream.write(data)
+
+    def flush(self):
+        self._stream.flush()
+
+
+def cached_check(namespace, key, check, use_cache=True):
+    """Run a check, or replay the output and verdict it recorded for the same key.
+
+    The check reports through click.echo and signals failure by raising
+    click.UsageError; both are recorded and replayed. Any other exception is
+    not cached.
+
+    Returns:
+        The check's return value on a fresh run, None when replayed.
+    """
+    if use_cache:
+        entry = load(namespace, key)
+        if entry is not None:
+            click.echo(entry["output"], nl=False)
+            if entry["error"] is not None:
+                raise click.UsageError(entry["error"])
+            return None
+
+    tee = _Tee(sys.stdout)
+    try:
+        with contextlib.redirect_stdout(tee):
+            result = check()
+    except click.UsageError as e:
+        store(namespace, key, {"output": "".join(tee.recorded), "error": e.message})
+        raise
+    store(namespace, key, {"output": "".join(tee.recorded), "error": None})
+    return result
@@ -1,37 +1,70 @@
+import importlib
+import sys
+
 import click
-from ftf_cli.commands.generate_module import generate_module
-from ftf_cli.commands.add_variable import add_variable
-from ftf_cli.commands.login import login
-from ftf_cli.commands.validate_directory import validate_directory
-from ftf_cli.commands.preview_module import preview_module
-from ftf_cli.commands.expose_provider import expose_provider
-from ftf_cli.commands.add_input import add_input
-from ftf_cli.commands.delete_module import delete_module
-from ftf_cli.commands.get_output_types import get_output_types
-from ftf_cli.commands.get_output_type_details import get_output_type_details
-from ftf_cli.commands.validate_facets import validate_facets
-from ftf_cli.commands.register_output_type import register_output_type
-from ftf_cli.commands.add_import import add_import
-from ftf_cli.commands.get_resources import get_resources
-
-
-@click.group()
+
+# Command name -> "module:attribute". Modules are only imported when the
+# command is looked up, so `ftf --help` and light commands do not pay for
+# the heavy dependencies (checkov, hcl, jsonschema, ...) of the others.
+LAZY_COMMANDS = {
+    "add-import": "ftf_cli.commands.add_import:add_import",
+    "add-input": "ftf_cli.commands.add_input:add_input",
+    "add-variable": "ftf_cli.commands.add_variable:add_variable",
+    "delete-module": "ftf_cli.commands.delete_module:delete_module",
+    "expose-provider": "ftf_cli.commands.expose_provider:expose_provider",
+    "generate-module": "ftf_cli.commands.generate_module:generate_module",
+    "get-output-types": "ftf_cli.commands.get_output_types:get_output_types",
+    "get-output-type-details": "ftf_cli.commands.get_output_type_details:get_output_type_details",
+    "login": "ftf_cli.commands.login:login",
+    "preview-module": "ftf_cli.commands.preview_module:preview_module",
+    "register-output-type": "ftf_cli.commands.register_output_type:register_output_type",
+    "validate-directory": "ftf_cli.commands.validate_directory:validate_directory",
+    "validate-facets": "ftf_cli.commands.validate_facets:validate_facets",
+    "get-resources": "ftf_cli.commands.get_resources:get_resources",
+    "serve": "ftf_cli.commands.serve:serve",
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports command modules only when a command is resolved."""
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            return self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name):
+        module_name, attr_name = self.lazy_subcommands[cmd_name].split(":")
+        command = getattr(importlib.import_module(module_name), attr_name)
+        if not isinstance(command, click.Command):
+            raise ValueError(
+                f"Lazy loading of {cmd_name} failed: {module_name}.{attr_name} is not a click command"
+            )
+        return command
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=LAZY_COMMANDS)
 def cli():
     """FTF CLI command entry point."""
     pass
 
 
-cli.add_command(add_import)
-cli.add_command(add_input)
-cli.add_command(add_variable)
-cli.add_command(delete_module)
-cli.add_command(expose_provider)
-cli.add_command(generate_module)
-cli.add_command(get_output_types)
-cli.add_command(get_output_type_details)
-cli.add_command(login)
-cli.add_command(preview_module)
-cli.add_command(register_output_type)
-cli.add_command(validate_directory)
-cli.add_command(validate_facets)
-cli.add_command(get_resources)
+def main():
+    """Console script entry point.
+
+    Forwards the command to a running `ftf serve` daemon when one is available
+    and falls back to running it in-process otherwise.
+    """
+    from ftf_cli.server import forward
+
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    cli()
@@ -0,0 +1,171 @@
+"""HTTP client for the Facets control plane.
+
+Every request goes through one requests.Session per process, so connections
+and TLS sessions are reused by all the calls a command makes (and across
+commands run by `ftf serve`). Requests have connect and read timeouts, and
+are retried with exponential backoff and full jitter, waiting as long as a
+Retry-After header asks. GET and DELETE requests are retried on 429 and 5xx
+responses and on connection errors. Other requests, such as uploads, are only
+retried when the control plane cannot have acted on them: on 429 and 503
+responses and when no connection could be made. Read timeouts are never
+retried: the control plane may still be processing the request.
+
+Timeouts and retries are read from the environment:
+
+- ``FTF_CONNECT_TIMEOUT``: seconds to establish a connection (default 10)
+- ``FTF_READ_TIMEOUT``: seconds to wait for response data (default 120)
+- ``FTF_HTTP_RETRIES``: retries after the first attempt (default 3)
+"""
+import email.utils
+import functools
+import os
+import random
+import time
+from urllib.parse import urlparse
+
+CONNECT_TIMEOUT_ENV = "FTF_CONNECT_TIMEOUT"
+READ_TIMEOUT_ENV = "FTF_READ_TIMEOUT"
+RETRIES_ENV = "FTF_HTTP_RETRIES"
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 120.0
+DEFAULT_RETRIES = 3
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Methods that may be sent again after the control plane might have processed them
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "DELETE")
+# Responses to other methods that mean the request was not processed
+UNPROCESSED_STATUSES = (429, 503)
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+
+def normalize_url(control_plane_url):
+    """Return the scheme://host[:port] of a control plane URL, defaulting to https."""
+    url = control_plane_url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+@functools.lru_cache(maxsize=None)
+def get_session():
+    """Return the requests.Session shared by every client in this process."""
+    import requests
+
+    return requests.Session()
+
+
+class ControlPlaneClient:
+    """Authenticated requests to one control plane."""
+
+    def __init__(self, control_plane_url, username, token, timeout=None, retries=None):
+        self.base_url = normalize_url(control_plane_url)
+        self.auth = (username, token)
+        self.timeout = timeout or (
+            _env_number(CONNECT_TIMEOUT_ENV, DEFAULT_CONNECT_TIMEOUT),
+            _env_number(READ_TIMEOUT_ENV, DEFAULT_READ_TIMEOUT),
+        )
+        self.retries = retries if retries is not None else int(_env_number(RETRIES_ENV, DEFAULT_RETRIES))
+
+    @classmethod
+    def from_credentials(cls, credentials):
+        """Return a client for a profile's credentials, as returned by is_logged_in."""
+        return cls(credentials["control_plane_url"], credentials["username"], credentials["token"])
+
+    def url(self, path):
+        return f"{self.base_url}{path}"
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def request(self, method, path, **kwargs):
+        """Send a request to path on the control plane, retrying transient failures.
+
+        Keyword arguments are passed to requests.Session.request. A `data`
+        file object with a `seek` method is rewound before each retry.
+        Requests other than IDEMPOTENT_METHODS are only retried on
+        UNPROCESSED_STATUSES and when no connection could be made.
+
+        Returns:
+            The last response, which may be an error response once retries run out.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails after all retries,
+                or on a read timeout.
+        """
+        import requests
+
+        kwargs.setdefault("auth", self.auth)
+        kwargs.setdefault("timeout", self.timeout)
+        data = kwargs.get("data")
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry_statuses = RETRY_STATUSES if idempotent else UNPROCESSED_STATUSES
+        attempt = 0
+        while True:
+            if attempt and hasattr(data, "seek"):
+                data.seek(0)
+            try:
+                response = get_session().request(method, self.url(path), **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                if attempt >= self.retries or not (idempotent or _not_connected(e)):
+                    raise
+                time.sleep(_backoff(attempt))
+            else:
+                if response.status_code not in retry_statuses or attempt >= self.retries:
+                    return response
+                delay = _retry_after(response)
+                response.close()
+                time.sleep(_backoff(attempt) if delay is None else delay)
+            attempt += 1
+
+
+def _not_connected(error):
+    """Return whether a requests ConnectionError happened before a connection was made."""
+    import requests
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, NewConnectionError)
+
+
+def _env_number(name, default):
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        import click
+
+        raise click.UsageError(f"❌ {name} must be a number, got {value!r}.")
+
+
+def _backoff(attempt):
+    """Return a random delay of up to BACKOFF_BASE * 2**attempt seconds, capped at BACKOFF_MAX."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _retry_after(response):
+    """Return the delay in seconds requested by a Retry-After header, capped at BACKOFF_MAX, or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(delay, 0.0), BACKOFF_MAX)
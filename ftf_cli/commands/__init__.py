@@ -1,18 +1,7 @@
-from .generate_module import generate_module
-from .add_variable import add_variable
-from .validate_directory import validate_directory
-from .add_input import add_input
-from .expose_provider import expose_provider
-from .delete_module import delete_module
-from .login import login
-from .preview_module import preview_module
-from .get_output_types import get_output_types
-from .get_output_type_details import get_output_type_details
-from .register_output_type import register_output_type
-from .add_import import add_import
-from .get_resources import get_resources
+import importlib
 
-# Newly added command import
+# Commands are resolved on first attribute access so that importing a single
+# command module does not import every other command (and its dependencies).
 
 __all__ = [
     "add_import",
@@ -28,4 +17,11 @@ __all__ = [
     "preview_module",
     "validate_directory",
     "get_resources",
+    "serve",
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return getattr(importlib.import_module(f".{name}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,7 +2,6 @@ import os
 import re
 from typing import Dict, List, Optional, Union, Any, Tuple
 import click
-import questionary
 import yaml
 import sys
 from ftf_cli.utils import (
@@ -42,6 +41,12 @@ from ftf_cli.utils import (
     "--resource-address",
     help="The full resource address to import (e.g., 'azurerm_key_vault.for_each_key_vault[0]'). If provided, runs in non-interactive mode and skips resource discovery.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Fully parse and validate every Terraform file, even if it is unchanged since resources were last discovered.",
+)
 def add_import(
     path: str,
     name: Optional[str] = None,
@@ -50,6 +55,7 @@ def add_import(
     index: Optional[str] = None,
     key: Optional[str] = None,
     resource_address: Optional[str] = None,
+    no_cache: bool = False,
 ) -> None:
     """Add an import declaration to the module.
 
@@ -109,7 +115,7 @@ def add_import(
 
         # Discover resources in the module
         click.echo("Discovering resources in the module...")
-        resources = discover_resources(path)
+        resources = discover_resources(path, use_cache=not no_cache)
 
         if not resources:
             click.echo("❌ No resources found in the module.")
@@ -252,6 +258,8 @@ def select_resource(resources: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]
     Returns:
         The selected resource or None if no resource was selected
     """
+    import questionary
+
     choices = []
     for r in resources:
         choices.append(f"{r['display']}")
@@ -296,6 +304,8 @@ def configure_import(
     Returns:
         Import configuration dictionary or None if configuration failed
     """
+    import questionary
+
     # Get resource name from address (e.g., aws_s3_bucket.bucket -> bucket)
     default_name = resource["address"].split(".")[-1]
 
@@ -452,6 +462,8 @@ def update_facets_yaml(
         True if a new import was added, "updated" if an existing import was updated,
         False if the operation was canceled or failed
     """
+    import questionary
+
     result = update_facets_yaml_imports(yaml_path, import_config, mode="interactive")
 
     # If an import with the same name exists, handle interactive prompts
@@ -1,19 +1,16 @@
 import os
 import re
 import traceback
-from subprocess import run
 
 import click
-import hcl
-import requests
 import yaml
-from lark import Token, Tree
 
+from ftf_cli.module import Module
 from ftf_cli.utils import (
     is_logged_in,
     transform_properties_to_terraform,
-    ensure_formatting_for_object,
-    get_profile_with_priority,
+    format_terraform,
+    resolve_default_profile,
     parse_namespace_and_name,
 )
 
@@ -23,7 +20,7 @@ from ftf_cli.utils import (
 @click.option(
     "-p",
     "--profile",
-    default=get_profile_with_priority(),
+    default=resolve_default_profile,
     help="The profile name to use (defaults to the current default profile)",
 )
 @click.option(
@@ -56,11 +53,7 @@ from ftf_cli.utils import (
 )
 def add_input(path, profile, name, display_name, description, output_type):
     """Add an existing registered output as a input in facets.yaml and populate the attributes in variables.tf exposed by selected output."""
-
-    if run("terraform version", shell=True, capture_output=True).returncode != 0:
-        raise click.UsageError(
-            "❌ Terraform is not installed. Please install Terraform to continue."
-        )
+    from ftf_cli.client import ControlPlaneClient
 
     # validate if facets.yaml and variables.tf exists
     facets_yaml = os.path.join(path, "facets.yaml")
@@ -71,8 +64,7 @@ def add_input(path, profile, name, display_name, description, output_type):
         )
     try:
 
-        with open(facets_yaml, "r") as file:
-            facets_data = yaml.safe_load(file)
+        facets_data = Module(path).load_yaml()
 
         required_inputs = facets_data.get("inputs", {})
         required_inputs_map = {}
@@ -117,14 +109,9 @@ def add_input(path, profile, name, display_name, description, output_type):
                 f"❌ Not logged in under profile {profile}. Please login first."
             )
 
-        # Extract credentials
-        control_plane_url = credentials["control_plane_url"]
-        username = credentials["username"]
-        token = credentials["token"]
+        client = ControlPlaneClient.from_credentials(credentials)
 
-        response = requests.get(
-            f"{control_plane_url}/cc-ui/v1/tf-outputs", auth=(username, token)
-        )
+        response = client.get("/cc-ui/v1/tf-outputs")
 
         registered_outputs = {(output["namespace"], output["name"]): output for output in response.json()}
         available_output_types = [f'{namespace}/{name}' for namespace, name in registered_outputs.keys()]
@@ -180,7 +167,6 @@ def add_input(path, profile, name, display_name, description, output_type):
         inputs_var = generate_inputs_variable(output_schemas)
 
         replace_inputs_variable(variable_file, inputs_var)
-        ensure_formatting_for_object(variable_file)
 
         click.echo(f"✅ Input added to the {variable_file}.")
 
@@ -237,13 +223,14 @@ def replace_inputs_variable(file_path, new_inputs_block):
         file_path (str): Path to the Terraform file.
         new_inputs_block (str): The new 'inputs' variable block to replace or append.
     """
-    with open(file_path, "r+") as file:
-        content = file.read()
-        if not content.endswith("\n"):
-            file.write("\n")
+    import hcl
+    from lark import Token, Tree
+
+    content = Module(os.path.dirname(file_path)).read(os.path.basename(file_path))
+    if not content.endswith("\n"):
+        content += "\n"
 
-    with open(file_path, "r") as file:
-        start_node = hcl.parse(file)
+    start_node = hcl.parses(content)
 
     new_start_node = hcl.parses(new_inputs_block)
 
@@ -278,5 +265,4 @@ def replace_inputs_variable(file_path, new_inputs_block):
         body_node.children[inputs_tree_index] = new_inputs_node
 
     with open(file_path, "w") as file:
-        new_content = hcl.writes(body_node)
-        file.write(new_content)
+        file.write(format_terraform(hcl.writes(body_node)))
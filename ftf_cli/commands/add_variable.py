@@ -1,4 +1,3 @@
-from subprocess import run
 import click
 from ftf_cli.utils import (
     validate_facets_yaml,
@@ -7,8 +6,6 @@ from ftf_cli.utils import (
     update_spec_variable,
     validate_number,
 )
-from ruamel.yaml.scalarstring import DoubleQuotedScalarString
-from ruamel.yaml import YAML
 
 
 @click.command()
@@ -58,13 +55,11 @@ def add_variable(
     name, title, type, description, options, required, default, path, pattern
 ):
     """Add a new variable to the module."""
+    from ruamel.yaml.scalarstring import DoubleQuotedScalarString
+    from ruamel.yaml import YAML
 
     yaml = YAML()
     yaml.preserve_quotes = True
-    if run("terraform version", shell=True, capture_output=True).returncode != 0:
-        raise click.UsageError(
-            "❌ Terraform is not installed. Please install Terraform to continue."
-        )
 
     yaml_path = validate_facets_yaml(path)
     variables_tf_path = validate_variables_tf(path)
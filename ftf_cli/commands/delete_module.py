@@ -1,9 +1,8 @@
-import os
 import traceback
 import click
-import requests
 
-from ftf_cli.utils import is_logged_in
+from ftf_cli.operations import forget_module_upload
+from ftf_cli.utils import is_logged_in, resolve_default_profile
 
 
 @click.command()
@@ -35,11 +34,13 @@ from ftf_cli.utils import is_logged_in
 @click.option(
     "-p",
     "--profile",
-    default=lambda: os.getenv("FACETS_PROFILE", "default"),
-    help="The profile name to use or defaults to environment variable FACETS_PROFILE if set.",
+    default=resolve_default_profile,
+    help="The profile name to use (defaults to the current default profile)",
 )
 def delete_module(intent, flavor, version, profile, stage):
     """Delete a module from the control plane"""
+    from ftf_cli.client import ControlPlaneClient
+
     try:
         stage = stage.upper()
         # check if profile is set
@@ -50,14 +51,9 @@ def delete_module(intent, flavor, version, profile, stage):
                 f"❌ Not logged in under profile {profile}. Please login first."
             )
 
-        # Extract credentials
-        control_plane_url = credentials["control_plane_url"]
-        username = credentials["username"]
-        token = credentials["token"]
+        client = ControlPlaneClient.from_credentials(credentials)
 
-        response = requests.get(
-            f"{control_plane_url}/cc-ui/v1/modules", auth=(username, token)
-        )
+        response = client.get("/cc-ui/v1/modules")
 
         module_id = -1
 
@@ -87,11 +83,12 @@ def delete_module(intent, flavor, version, profile, stage):
                 f"❌ Module with intent {intent} flavor {flavor} version {version} not found."
             )
 
-        delete_response = requests.delete(
-            f"{control_plane_url}/cc-ui/v1/modules/{module_id}",
-            auth=(username, token),
-        )
+        delete_response = client.delete(f"/cc-ui/v1/modules/{module_id}")
         if delete_response.status_code == 200:
+            # preview-module must upload the module again, even if it is unchanged
+            forget_module_upload(
+                profile, credentials["control_plane_url"], credentials["username"], intent, flavor, version
+            )
             click.echo(
                 f"✅ Module with intent {intent} flavor {flavor} version {version} deleted successfully."
             )
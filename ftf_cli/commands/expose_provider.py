@@ -1,8 +1,7 @@
 import click
 import yaml
 import os
-import questionary
-import hcl2
+from ftf_cli.module import Module
 from ftf_cli.utils import generate_output_tree
 
 
@@ -40,6 +39,8 @@ from ftf_cli.utils import generate_output_tree
 )
 def expose_provider(path, name, source, version, attributes, output):
     """Exposes the provider in facets yaml"""
+    import questionary
+
     pairs = attributes.split(",")
     prosssed_attributes = {}
     for pair in pairs:
@@ -65,8 +66,7 @@ def expose_provider(path, name, source, version, attributes, output):
                 f"❌ {output_file} or {facets_yaml_path} not found. Run validate directory command to validate directory"
             )
 
-        with open(facets_yaml_path, "r") as file:
-            facets_yaml = yaml.safe_load(file)
+        facets_yaml = Module(path).load_yaml()
 
         # Get outputs declared in facets yaml
         outputs = facets_yaml.get("outputs")
@@ -166,6 +166,8 @@ def generate_default_output(output_type):
 
 def prompt_user_for_output_selection(obj, attribute, is_root=False):
     """Function to keep prompting the user to select fields from output lookup"""
+    import questionary
+
     keys = list(obj.keys())
     if not is_root:
         keys.append("*")
@@ -209,8 +211,7 @@ def generate_output_lookup(path):
         )
         return
 
-    with open(output_file, "r") as file:
-        parsed_outputs = hcl2.load(file)
+    parsed_outputs = Module(path).load_hcl2("outputs.tf")
 
     locals = parsed_outputs.get("locals", [{}])[0]
     output_interfaces = locals.get("output_interfaces", [{}])[0]
@@ -1,6 +1,5 @@
 import os
 import click
-from jinja2 import Environment, FileSystemLoader
 import importlib.resources as pkg_resources
 
 
@@ -23,6 +22,8 @@ import importlib.resources as pkg_resources
 )
 def generate_module(path, intent, flavor, cloud, title, description, version):
     """Generate a new module."""
+    from jinja2 import Environment, FileSystemLoader
+
     if str(version).isdigit():
         raise click.UsageError(
             f"❌ Version {version} is not a valid version. Use a valid version like 1.0"
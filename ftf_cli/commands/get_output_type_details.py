@@ -1,16 +1,15 @@
 import json
 import traceback
 import click
-import requests
 
-from ftf_cli.utils import is_logged_in, get_profile_with_priority, parse_namespace_and_name
+from ftf_cli.utils import is_logged_in, resolve_default_profile, parse_namespace_and_name
 
 
 @click.command()
 @click.option(
     "-p",
     "--profile",
-    default=get_profile_with_priority(),
+    default=resolve_default_profile,
     help="The profile name to use (defaults to the current default profile)",
 )
 @click.option(
@@ -22,6 +21,8 @@ from ftf_cli.utils import is_logged_in, get_profile_with_priority, parse_namespa
 )
 def get_output_type_details(profile, output_type):
     """Get the details of a registered output type from the control plane"""
+    from ftf_cli.client import ControlPlaneClient
+
     try:
         # Validate output_type format
         namespace, name = parse_namespace_and_name(output_type)
@@ -34,15 +35,10 @@ def get_output_type_details(profile, output_type):
                 f"❌ Not logged in under profile {profile}. Please login first."
             )
 
-        # Extract credentials
-        control_plane_url = credentials["control_plane_url"]
-        username = credentials["username"]
-        token = credentials["token"]
+        client = ControlPlaneClient.from_credentials(credentials)
 
         # Make a request to fetch output types
-        response = requests.get(
-            f"{control_plane_url}/cc-ui/v1/tf-outputs", auth=(username, token)
-        )
+        response = client.get("/cc-ui/v1/tf-outputs")
 
         if response.status_code == 200:
             # Create lookup by (namespace, name) tuple
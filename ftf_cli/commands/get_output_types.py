@@ -1,19 +1,20 @@
 import os
 import click
-import requests
 
-from ftf_cli.utils import is_logged_in, get_profile_with_priority
+from ftf_cli.utils import is_logged_in, resolve_default_profile
 
 
 @click.command()
 @click.option(
     "-p",
     "--profile",
-    default=get_profile_with_priority(),
+    default=resolve_default_profile,
     help="The profile name to use (defaults to the current default profile)",
 )
 def get_output_types(profile):
     """Get the list of registered output types in the control plane"""
+    from ftf_cli.client import ControlPlaneClient
+
     try:
         # Check if profile is set
         click.echo(f"Profile selected: {profile}")
@@ -23,15 +24,10 @@ def get_output_types(profile):
                 f"❌ Not logged in under profile {profile}. Please login first."
             )
 
-        # Extract credentials
-        control_plane_url = credentials["control_plane_url"]
-        username = credentials["username"]
-        token = credentials["token"]
+        client = ControlPlaneClient.from_credentials(credentials)
 
         # Make a request to fetch output types
-        response = requests.get(
-            f"{control_plane_url}/cc-ui/v1/tf-outputs", auth=(username, token)
-        )
+        response = client.get("/cc-ui/v1/tf-outputs")
 
         if response.status_code == 200:
             registered_output_types = []
@@ -4,9 +4,15 @@ from ftf_cli.utils import discover_resources
 
 @click.command()
 @click.argument("path", type=click.Path(exists=True))
-def get_resources(path):
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Fully parse and validate every Terraform file, even if it is unchanged since resources were last discovered.",
+)
+def get_resources(path, no_cache):
     """List all Terraform resources in the given module directory."""
-    resources = discover_resources(path)
+    resources = discover_resources(path, use_cache=not no_cache)
     if not resources:
         click.echo("No resources found in the module.")
         return
@@ -4,7 +4,6 @@ import os
 from urllib.parse import urlparse
 
 import click
-import requests
 
 from ftf_cli.utils import fetch_user_details, store_credentials, set_default_profile
 
@@ -70,6 +69,8 @@ def profile_exists(profile_name):
 
 def login_with_existing_profile(profile_name):
     """Attempt to login using an existing profile's stored credentials."""
+    import requests
+
     cred_path = os.path.expanduser("~/.facets/credentials")
     config = configparser.ConfigParser()
     config.read(cred_path)
@@ -103,6 +104,8 @@ def login_with_existing_profile(profile_name):
 
 def use_existing_profile():
     """Check for and use existing profiles if available."""
+    import requests
+
     cred_path = os.path.expanduser("~/.facets/credentials")
     if not os.path.exists(cred_path):
         return False
@@ -189,6 +192,8 @@ def validate_and_clean_url(control_plane_url):
 
 def authenticate_and_store(control_plane_url, username, token, profile):
     """Authenticate with the control plane and store credentials."""
+    import requests
+
     try:
         response = fetch_user_details(control_plane_url, username, token)
         response.raise_for_status()
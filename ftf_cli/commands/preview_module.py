@@ -2,17 +2,24 @@ import os
 import click
 import getpass
 import yaml
-import hcl2
 import json
 from ftf_cli.utils import (
     is_logged_in,
     validate_boolean,
     generate_output_lookup_tree,
-    get_profile_with_priority,
+    resolve_default_profile,
     generate_output_tree,
 )
 from ftf_cli.commands.validate_directory import validate_directory
-from ftf_cli.operations import register_module, publish_module, ModuleOperationError
+from ftf_cli.module import Module
+from ftf_cli.operations import (
+    DEFAULT_COMPRESSION_LEVEL,
+    module_upload_key,
+    register_module,
+    publish_module,
+    module_archive_files,
+    ModuleOperationError,
+)
 
 
 @click.command()
@@ -20,7 +27,7 @@ from ftf_cli.operations import register_module, publish_module, ModuleOperationE
 @click.option(
     "-p",
     "--profile",
-    default=get_profile_with_priority(),
+    default=resolve_default_profile,
     help="The profile name to use (defaults to the current default profile)",
 )
 @click.option(
@@ -68,6 +75,30 @@ from ftf_cli.operations import register_module, publish_module, ModuleOperationE
     is_flag=False,
     help="Do not update the output type in facets. Set to true only if you have already registered the output type before calling this command.",
 )
+@click.option(
+    "--no-scan-cache",
+    is_flag=True,
+    default=False,
+    help="Run the checkov scan even if the Terraform files are unchanged since the last scan.",
+)
+@click.option(
+    "--force-upload",
+    is_flag=True,
+    default=False,
+    help="Upload the module even if it is unchanged since its last successful upload.",
+)
+@click.option(
+    "--compression-level",
+    type=click.IntRange(0, 9),
+    default=DEFAULT_COMPRESSION_LEVEL,
+    help="Deflate level for the module archive, from 0 (no compression) to 9 (smallest).",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="List the files that would be archived and uploaded, then exit without validating or uploading.",
+)
 def preview_module(
     path,
     profile,
@@ -78,6 +109,10 @@ def preview_module(
     publish,
     skip_terraform_validation,
     skip_output_write,
+    no_scan_cache,
+    force_upload,
+    compression_level,
+    dry_run,
 ):
     """Register a module at the specified path using the given or default profile."""
 
@@ -85,9 +120,7 @@ def preview_module(
         output_file = os.path.join(path, "outputs.tf")
         if not os.path.exists(output_file):
             return None
-        with open(output_file, "r", encoding="utf-8") as file:
-            parsed = hcl2.load(file)
-        return parsed
+        return Module(path).load_hcl2("outputs.tf")
 
     def extract_output_structures(parsed_outputs):
         locals_list = parsed_outputs.get("locals")
@@ -112,8 +145,7 @@ def preview_module(
 
         return output_interfaces, output_attributes
 
-    def write_output_lookup_tree(path, output_interfaces, output_attributes):
-        output_json_path = os.path.join(path, "output-lookup-tree.json")
+    def output_lookup_tree_json(output_interfaces, output_attributes):
         output = {
             "out": {
                 "attributes": output_attributes,
@@ -121,21 +153,68 @@ def preview_module(
             }
         }
         transformed_output = generate_output_lookup_tree(output)
-        with open(output_json_path, "w", encoding="utf-8") as file:
-            json.dump(transformed_output, file, indent=4)
-        return output_json_path
+        return json.dumps(transformed_output, indent=4).encode()
 
-    def write_output_facets_yaml(path, output_interfaces, output_attributes):
-        output_facets_file = os.path.join(path, "output.facets.yaml")
+    def output_facets_yaml(output_interfaces, output_attributes):
         interfaces_schema = generate_output_tree(output_interfaces)
         attributes_schema = generate_output_tree(output_attributes)
         out_schema = {
             "interfaces": interfaces_schema,
             "attributes": attributes_schema,
         }
-        with open(output_facets_file, "w", encoding="utf-8") as f:
-            yaml.dump({"out": out_schema}, f, sort_keys=False)
-        return output_facets_file
+        return yaml.dump({"out": out_schema}, sort_keys=False).encode()
+
+    def set_local_version(facets_data):
+        new_version = f"{facets_data.get('version', '1.0')}-{git_ref}"
+        facets_data["version"] = new_version
+
+        new_sample_version = f"{facets_data.get('sample', {}).get('version', '1.0')}-{git_ref}"
+        facets_data["sample"]["version"] = new_sample_version
+
+        click.echo(f"Version modified to: {new_version}")
+        click.echo(f"Sample version modified to: {new_sample_version}")
+
+    def generated_archive_files(facets_data):
+        """Return the files added to the uploaded archive from memory; the module directory is not modified."""
+        archive_files = {"facets.yaml": yaml.dump(facets_data, sort_keys=False).encode()}
+
+        parsed_outputs = parse_outputs_tf(path)
+        output_interfaces = None
+        output_attributes = None
+        if parsed_outputs:
+            output_interfaces, output_attributes = extract_output_structures(parsed_outputs)
+
+        # Generate the output lookup tree if outputs.tf exists
+        if output_interfaces is not None and output_attributes is not None:
+            try:
+                archive_files["output-lookup-tree.json"] = output_lookup_tree_json(
+                    output_interfaces, output_attributes
+                )
+                click.echo("Output lookup tree added to the module archive as output-lookup-tree.json")
+            except Exception as e:
+                click.echo(f"Error generating output lookup tree: {e}")
+        elif not os.path.exists(os.path.join(path, "outputs.tf")):
+            click.echo(f"Warning: {os.path.join(path, 'outputs.tf')} not found. Skipping output tree generation.")
+
+        # Generate output.facets.yaml if needed
+        if not skip_output_write and output_interfaces is not None and output_attributes is not None:
+            if not os.path.exists(os.path.join(path, "output.facets.yaml")):
+                try:
+                    archive_files["output.facets.yaml"] = output_facets_yaml(output_interfaces, output_attributes)
+                    click.echo("output.facets.yaml added to the module archive")
+                except Exception as e:
+                    click.echo(f"Error generating output.facets.yaml: {e}")
+            else:
+                click.echo("output.facets.yaml already exists, skipping generation.")
+
+        return archive_files
+
+    if dry_run:
+        facets_data = Module(path).load_yaml()
+        if git_ref.startswith("local-"):
+            set_local_version(facets_data)
+        list_archive_files(path, generated_archive_files(facets_data))
+        return
 
     click.echo(f"Profile selected: {profile}")
 
@@ -152,6 +231,9 @@ def preview_module(
     ctx.params["path"] = path
     ctx.params["check_only"] = False  # Set default for check_only
     ctx.params["skip_terraform_validation"] = skip_terraform_validation
+    ctx.params["no_cache"] = False
+    ctx.params["no_scan_cache"] = no_scan_cache
+    ctx.params["provider_mirror"] = None
     try:
         validate_directory.invoke(ctx)
     except click.ClickException as e:
@@ -164,31 +246,13 @@ def preview_module(
         )
 
     # Load facets.yaml and modify if necessary
-    yaml_file = os.path.join(path, "facets.yaml")
-    with open(yaml_file, "r", encoding="utf-8") as file:
-        facets_data = yaml.safe_load(file)
+    facets_data = Module(path).load_yaml()
 
     original_version = facets_data.get("version", "1.0")
-    original_sample_version = facets_data.get("sample", {}).get("version", "1.0")
     is_local_develop = git_ref.startswith("local-")
     # Modify version if git_ref indicates local environment
     if is_local_develop:
-        new_version = f"{original_version}-{git_ref}"
-        facets_data["version"] = new_version
-
-        new_sample_version = f"{original_sample_version}-{git_ref}"
-        facets_data["sample"]["version"] = new_sample_version
-
-        click.echo(f"Version modified to: {new_version}")
-        click.echo(f"Sample version modified to: {new_sample_version}")
-
-        # Write modified version back to facets.yaml
-        with open(yaml_file, "w", encoding="utf-8") as file:
-            yaml.dump(facets_data, file, sort_keys=False)
-
-    # Write the updated facets.yaml with validated files
-    with open(yaml_file, "w", encoding="utf-8") as file:
-        yaml.dump(facets_data, file, sort_keys=False)
+        set_local_version(facets_data)
 
     control_plane_url = credentials["control_plane_url"]
     username = credentials["username"]
@@ -205,40 +269,16 @@ def preview_module(
 
     success_message = f'[PREVIEW] Module with Intent "{intent}", Flavor "{flavor}", and Version "{facets_data["version"]}" successfully previewed to {control_plane_url}'
 
-    output_json_path = None
-    output_facets_path = None
-    parsed_outputs = parse_outputs_tf(path)
-    output_interfaces = None
-    output_attributes = None
-    if parsed_outputs:
-        output_interfaces, output_attributes = extract_output_structures(parsed_outputs)
-    try:
-        # Generate the output lookup tree if outputs.tf exists
-        if output_interfaces is not None and output_attributes is not None:
-            try:
-                output_json_path = write_output_lookup_tree(path, output_interfaces, output_attributes)
-                click.echo(f"Output lookup tree saved to {output_json_path}")
-            except Exception as e:
-                click.echo(f"Error generating output lookup tree: {e}")
-        else:
-            output_json_path = None
-            if parse_outputs_tf(path) is None:
-                click.echo(f"Warning: {os.path.join(path, 'outputs.tf')} not found. Skipping output tree generation.")
-
-        # Generate output.facets.yaml if needed
-        output_facets_file = os.path.join(path, "output.facets.yaml")
-        if not skip_output_write and output_interfaces is not None and output_attributes is not None:
-            if not os.path.exists(output_facets_file):
-                try:
-                    output_facets_path = write_output_facets_yaml(path, output_interfaces, output_attributes)
-                    click.echo(f"output.facets.yaml saved to {output_facets_path}")
-                except Exception as e:
-                    click.echo(f"Error generating output.facets.yaml: {e}")
-            else:
-                click.echo("output.facets.yaml already exists, skipping generation.")
+    archive_files = generated_archive_files(facets_data)
 
-        # Register the module
-        register_module(
+    try:
+        # Register the module, unless the same archive was already uploaded
+        upload_cache_key = None
+        if not force_upload:
+            upload_cache_key = module_upload_key(
+                profile, control_plane_url, username, intent, flavor, facets_data["version"]
+            )
+        uploaded = register_module(
             control_plane_url=control_plane_url,
             username=username,
             token=token,
@@ -248,39 +288,23 @@ def preview_module(
             is_feature_branch=(not publishable and not publish),
             auto_create=auto_create_intent,
             skip_output_write=skip_output_write,
+            upload_cache_key=upload_cache_key,
+            compression_level=compression_level,
+            extra_files=archive_files,
         )
 
-        click.echo("✔ Module preview successfully registered.")
-        click.echo(f"\n\n✔✔✔ {success_message}\n")
+        if uploaded:
+            click.echo("✔ Module preview successfully registered.")
+            click.echo(f"\n\n✔✔✔ {success_message}\n")
+        else:
+            click.echo(
+                f'\n\n[PREVIEW] Module with Intent "{intent}", Flavor "{flavor}", and Version '
+                f'"{facets_data["version"]}" is unchanged since its last upload to {control_plane_url}; '
+                "upload skipped. Use --force-upload if it was changed or deleted in the control plane.\n"
+            )
 
     except ModuleOperationError as e:
         raise click.UsageError(f"❌ Failed to register module for preview: {e}")
-    finally:
-        # Revert version back to original after attempting registration
-        if is_local_develop:
-            facets_data["version"] = original_version
-            facets_data["sample"]["version"] = original_sample_version
-            with open(yaml_file, "w", encoding="utf-8") as file:
-                yaml.dump(facets_data, file, sort_keys=False)
-            click.echo(f"Version reverted to: {original_version}")
-            click.echo(f"Sample version reverted to: {original_sample_version}")
-
-        # Remove the output-lookup-tree.json file if it exists
-        if output_json_path and os.path.exists(output_json_path):
-            try:
-                os.remove(output_json_path)
-                click.echo(f"Removed temporary file: {output_json_path}")
-            except Exception as e:
-                click.echo(
-                    f"Warning: Failed to remove temporary file {output_json_path}: {e}"
-                )
-        # Remove output.facets.yaml if it was generated
-        if output_facets_path and os.path.exists(output_facets_path):
-            try:
-                os.remove(output_facets_path)
-                click.echo(f"Removed temporary file: {output_facets_path}")
-            except Exception as e:
-                click.echo(f"Warning: Failed to remove temporary file {output_facets_path}: {e}")
 
     success_message_published = f'[PUBLISH] Module with Intent "{intent}", Flavor "{flavor}", and Version "{facets_data["version"]}" successfully published to {control_plane_url}'
 
@@ -307,5 +331,17 @@ def preview_module(
         raise click.UsageError(f"❌ Failed to Publish module: {e}")
 
 
+def list_archive_files(path, extra_files=None):
+    """Print the files preview-module would archive from path and extra_files, with their total size.
+
+    As in the archive, extra_files replace files of the module directory with the same name.
+    """
+    sizes = {arcname: os.path.getsize(file_path) for file_path, arcname in module_archive_files(path)}
+    sizes.update((arcname, len(content)) for arcname, content in (extra_files or {}).items())
+    for arcname, size in sorted(sizes.items()):
+        click.echo(f"{arcname} ({size} bytes)")
+    click.echo(f"\n{len(sizes)} files, {sum(sizes.values())} bytes would be archived.")
+
+
 if __name__ == "__main__":
     preview_module()
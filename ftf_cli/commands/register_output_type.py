@@ -1,10 +1,8 @@
 import os
 import click
-import requests
 import yaml
 import json
-from requests import JSONDecodeError
-from ftf_cli.utils import is_logged_in, get_profile_with_priority, properties_to_lookup_tree
+from ftf_cli.utils import is_logged_in, resolve_default_profile, properties_to_lookup_tree
 
 
 @click.command()
@@ -14,7 +12,7 @@ from ftf_cli.utils import is_logged_in, get_profile_with_priority, properties_to
 @click.option(
     "-p",
     "--profile",
-    default=get_profile_with_priority(),
+    default=resolve_default_profile,
     help="The profile name to use (defaults to the current default profile)",
 )
 @click.option(
@@ -25,6 +23,9 @@ from ftf_cli.utils import is_logged_in, get_profile_with_priority, properties_to
 )
 def register_output_type(yaml_path, profile, inferred_from_module):
     """Register a new output type in the control plane using a YAML definition file."""
+    from ftf_cli.client import ControlPlaneClient
+    from requests import JSONDecodeError
+
     try:
         # Check if profile is set
         click.echo(f"Profile selected: {profile}")
@@ -96,17 +97,10 @@ def register_output_type(yaml_path, profile, inferred_from_module):
             "providers": providers,
         }
 
-        # Extract credentials
-        control_plane_url = credentials["control_plane_url"]
-        username = credentials["username"]
-        token = credentials["token"]
+        client = ControlPlaneClient.from_credentials(credentials)
 
         # Make a request to register the output type
-        response = requests.post(
-            f"{control_plane_url}/cc-ui/v1/tf-outputs",
-            json=request_payload,
-            auth=(username, token),
-        )
+        response = client.post("/cc-ui/v1/tf-outputs", json=request_payload)
 
         if response.status_code in [200, 201]:
             click.echo(
@@ -0,0 +1,37 @@
+import click
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    default=None,
+    help="Path of the Unix socket to listen on. Defaults to environment variable FTF_SERVER_SOCKET or ~/.facets/ftf.sock.",
+)
+@click.option(
+    "--idle-timeout",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Stop the server after this many seconds without requests. 0 keeps it running until stopped.",
+)
+@click.option(
+    "--stop",
+    is_flag=True,
+    default=False,
+    help="Stop the running server instead of starting one.",
+)
+def serve(socket_path, idle_timeout, stop):
+    """Run a local server that keeps ftf warm for repeated validations."""
+    from ftf_cli import server
+
+    if stop:
+        if server.stop(socket_path):
+            click.echo("✅ ftf server stopped.")
+        else:
+            click.echo("No running ftf server found.")
+        return
+
+    try:
+        server.serve(socket_path=socket_path, idle_timeout=idle_timeout)
+    except KeyboardInterrupt:
+        pass
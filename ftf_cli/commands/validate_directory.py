@@ -5,8 +5,6 @@ from ftf_cli.utils import (
     validate_boolean,
     validate_facets_tf_vars,
 )
-from checkov.runner_filter import RunnerFilter
-from checkov.terraform.runner import Runner
 
 
 @click.command()
@@ -23,23 +21,41 @@ from checkov.terraform.runner import Runner
     callback=validate_boolean,
     help="Skip Terraform validation steps if set to true.",
 )
-def validate_directory(path, check_only, skip_terraform_validation):
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Re-validate facets.yaml and variables.tf even if they are unchanged since their last validation.",
+)
+@click.option(
+    "--no-scan-cache",
+    is_flag=True,
+    default=False,
+    help="Run the checkov scan even if the Terraform files are unchanged since the last scan.",
+)
+@click.option(
+    "--provider-mirror",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    help="Install providers only from this filesystem mirror (see `terraform providers mirror`). Defaults to environment variable FTF_PROVIDER_MIRROR if set.",
+)
+def validate_directory(
+    path, check_only, skip_terraform_validation, no_cache, no_scan_cache, provider_mirror
+):
     """Validate the Terraform module and its security aspects."""
+    from concurrent.futures import ThreadPoolExecutor
+    from ftf_cli.terraform import require_terraform
 
-    # Check if Terraform is installed
-    if run("terraform version", shell=True, capture_output=True).returncode != 0:
-        raise click.UsageError(
-            "❌ Terraform is not installed. Please install Terraform to continue."
-        )
+    terraform = require_terraform()
 
     try:
         # Validate the facets.yaml file in the given path
-        validate_facets_yaml(path)
+        validate_facets_yaml(path, use_cache=not no_cache)
         click.echo("✅ facets.yaml validated successfully.")
 
         # Run terraform fmt in check mode if check-only flag is present
         fmt_command = (
-            ["terraform", "fmt", "-check"] if check_only else ["terraform", "fmt"]
+            [terraform, "fmt", "-check"] if check_only else [terraform, "fmt"]
         )
         process = run(
             fmt_command,
@@ -54,63 +70,39 @@ def validate_directory(path, check_only, skip_terraform_validation):
         for line in process.stderr.splitlines():
             click.echo(line)
 
-        validate_facets_tf_vars(path)
-        click.echo(
-            "✅ Terraform files are correctly formatted."
-            if check_only
-            else "🎨 Terraform files formatted."
-        )
-
-        if not skip_terraform_validation:
-            # Run terraform init and validate
-            process = run(
-                ["terraform", "-chdir={}".format(path), "init", "-backend=false"],
-                check=True,
-                capture_output=True,
-                text=True,
+        # terraform init/validate and checkov only read the formatted files, so they run
+        # alongside the variables.tf check; their output is reported in stage order.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            terraform_future = (
+                None if skip_terraform_validation else executor.submit(terraform_init_and_validate, path, provider_mirror)
             )
+            checkov_future = executor.submit(run_checkov, path, use_cache=not no_scan_cache)
 
-            for line in process.stdout.splitlines():
-                click.echo(line)
-
-            for line in process.stderr.splitlines():
-                click.echo(line)
-            click.echo("🚀 Terraform initialized.")
-
-            process = run(
-                ["terraform", "-chdir={}".format(path), "validate"],
-                check=True,
-                capture_output=True,
-                text=True,
+            validate_facets_tf_vars(path, use_cache=not no_cache)
+            click.echo(
+                "✅ Terraform files are correctly formatted."
+                if check_only
+                else "🎨 Terraform files formatted."
             )
 
-            for line in process.stdout.splitlines():
-                click.echo(line)
-
-            for line in process.stderr.splitlines():
-                click.echo(line)
-            click.echo("🔍 Terraform validation successful.")
-        else:
-            click.echo("⏭ Skipping Terraform validation as per flag.")
+            if terraform_future:
+                output, error = terraform_future.result()
+                for line in output:
+                    click.echo(line)
+                if error:
+                    raise error
+            else:
+                click.echo("⏭ Skipping Terraform validation as per flag.")
 
-        # Run Checkov via API
-        runner = Runner()
-        report = runner.run(
-            root_folder=path, runner_filter=RunnerFilter(framework=["terraform"])
-        )
+            findings = checkov_future.result()
 
         # Process Checkov results
-        if any(
-            check
-            for check in report.failed_checks
-            if check.severity in ["HIGH", "CRITICAL"]
-        ):
+        if findings:
             click.echo("⛔ Checkov validation failed.")
-            for check in report.failed_checks:
-                if check.severity in ["HIGH", "CRITICAL"]:
-                    click.echo(
-                        f"Check: {check.check_id}, Severity: {check.severity}, File: {check.file_path}, Line: {check.file_line}"
-                    )
+            for check in findings:
+                click.echo(
+                    f"Check: {check['check_id']}, Severity: {check['severity']}, File: {check['file_path']}, Line: {check['file_line']}"
+                )
             raise click.UsageError("Checkov validation did not pass.")
         else:
             click.echo("✅ Checkov validation passed.")
@@ -132,5 +124,173 @@ def validate_directory(path, check_only, skip_terraform_validation):
         raise click.UsageError(f"❌ Validation failed: {e}")
 
 
+def terraform_init_and_validate(path, provider_mirror=None):
+    """Run terraform init and validate in path.
+
+    init uses the shared provider plugin cache (see ftf_cli.terraform), optionally
+    installing providers from provider_mirror, and is skipped when the module's
+    provider and module requirements are unchanged since the last successful init.
+
+    Returns:
+        tuple: (output lines of the steps that completed, CalledProcessError of the failed step or None)
+    """
+    from ftf_cli.terraform import (
+        init_env,
+        init_fingerprint,
+        is_initialized,
+        plugin_cache_lock,
+        record_init,
+        require_terraform,
+    )
+
+    terraform = require_terraform()
+    output = []
+    try:
+        try:
+            fingerprint = init_fingerprint(path, provider_mirror)
+        except Exception:
+            fingerprint = None  # unparsable configuration: let terraform init report it
+
+        if fingerprint and is_initialized(path, fingerprint):
+            output.append("🚀 Terraform already initialized, requirements unchanged.")
+        else:
+            with plugin_cache_lock():
+                process = run(
+                    [terraform, "-chdir={}".format(path), "init", "-backend=false"],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                    env=init_env(provider_mirror),
+                )
+            output.extend(process.stdout.splitlines())
+            output.extend(process.stderr.splitlines())
+            output.append("🚀 Terraform initialized.")
+            if fingerprint:
+                # Recomputed: init may have just written the dependency lock file.
+                record_init(path, init_fingerprint(path, provider_mirror))
+
+        process = run(
+            [terraform, "-chdir={}".format(path), "validate"],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        output.extend(process.stdout.splitlines())
+        output.extend(process.stderr.splitlines())
+        output.append("🔍 Terraform validation successful.")
+    except CalledProcessError as e:
+        return output, e
+    return output, None
+
+
+# Settings passed to checkov's RunnerFilter; part of the scan cache key.
+CHECKOV_RUNNER_FILTER = {"framework": ["terraform"]}
+SCANNED_FILE_SUFFIXES = (".tf", ".tf.json", ".tfvars", ".tfvars.json")
+
+
+def run_checkov(path, use_cache=True):
+    """Run the checkov terraform checks on path and return the HIGH and CRITICAL findings.
+
+    Findings are cached under a digest of the module's Terraform files (and those of
+    the local modules it uses), the checkov version and the runner filter, so an
+    unchanged module is not scanned again.
+
+    Returns:
+        list: dicts with check_id, severity, file_path and file_line of each finding
+    """
+    from ftf_cli import cache
+
+    key = checkov_cache_key(path)
+    if use_cache:
+        findings = cache.load("checkov", key)
+        if findings is not None:
+            return findings
+
+    from checkov.runner_filter import RunnerFilter
+    from checkov.terraform.runner import Runner
+
+    runner = Runner()
+    report = runner.run(
+        root_folder=path, runner_filter=RunnerFilter(**CHECKOV_RUNNER_FILTER)
+    )
+    findings = [
+        {
+            "check_id": str(check.check_id),
+            "severity": str(check.severity),
+            "file_path": str(check.file_path),
+            "file_line": str(check.file_line),
+        }
+        for check in report.failed_checks
+        if check.severity in ["HIGH", "CRITICAL"]
+    ]
+    cache.store("checkov", key, findings)
+    return findings
+
+
+def checkov_cache_key(path):
+    """Digest of the Terraform files checkov scans, the checkov version and the runner filter.
+
+    The files are those under path and under the local module directories
+    (`source = "../shared"`) they use, followed transitively, so edits to a
+    local module outside path are scanned again.
+    """
+    import json
+    import os
+    from checkov.version import version as checkov_version
+    from ftf_cli import cache
+
+    root = os.path.abspath(path)
+    parts = [checkov_version, json.dumps(CHECKOV_RUNNER_FILTER, sort_keys=True)]
+    directories = [root]
+    visited = set()
+    while directories:
+        directory = directories.pop(0)
+        if directory in visited:
+            continue
+        visited.add(directory)
+        for dirpath, dirnames, filenames in os.walk(directory):
+            # checkov skips hidden directories such as .terraform
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            for filename in sorted(filenames):
+                if filename.endswith(SCANNED_FILE_SUFFIXES):
+                    file_path = os.path.join(dirpath, filename)
+                    with open(file_path, "rb") as f:
+                        content = f.read()
+                    parts.extend([os.path.relpath(file_path, root), content])
+                    if filename.endswith(".tf"):
+                        directories.extend(
+                            source_dir for source_dir in _local_module_sources(file_path, content)
+                            if os.path.commonpath([root, source_dir]) != root
+                        )
+    return cache.make_key(*parts)
+
+
+def _local_module_sources(file_path, content):
+    """Return the absolute directories of the local modules used by a Terraform file."""
+    import os
+    import re
+    from ftf_cli.module import Module
+
+    # Only files that may use a local module are parsed.
+    if not re.search(rb"""\bsource\s*=\s*"\.\.?/""", content):
+        return []
+    directory, filename = os.path.split(file_path)
+    try:
+        parsed = Module(directory).load_hcl2(filename)
+    except Exception:
+        return []  # reported by the checkov and terraform validation steps
+
+    sources = []
+    for block in parsed.get("module", []):
+        for body in block.values():
+            source = body.get("source")
+            source = source[0] if isinstance(source, list) and source else source
+            if isinstance(source, str) and source.startswith(("./", "../")):
+                source_dir = os.path.normpath(os.path.join(directory, source))
+                if os.path.isdir(source_dir):
+                    sources.append(source_dir)
+    return sources
+
+
 if __name__ == "__main__":
     validate_directory()
@@ -1,26 +1,180 @@
+import os
+
 import click
 from ftf_cli.utils import validate_facets_yaml
 
 
+class PathOrGlob(click.Path):
+    """An existing path, or a glob pattern that is expanded by the command."""
+
+    name = "path_or_glob"
+
+    def convert(self, value, param, ctx):
+        if is_glob(value):
+            return value
+        return super().convert(value, param, ctx)
+
+
+def is_glob(value):
+    return any(char in value for char in "*?[")
+
+
 @click.command()
-@click.argument("path", type=click.Path(exists=True, file_okay=False, dir_okay=True))
+@click.argument("path", type=PathOrGlob(exists=True, file_okay=False, dir_okay=True))
 @click.option(
     "--filename",
     default="facets.yaml",
     help="Name of the facets YAML file to validate.",
 )
-def validate_facets(path, filename):
-    """Validate the facets YAML file within the specified directory."""
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Re-validate even if the file is unchanged since its last validation.",
+)
+@click.option(
+    "-r",
+    "--recursive",
+    is_flag=True,
+    default=False,
+    help="Validate every module under PATH instead of PATH itself. Implied when PATH is a glob.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of modules to validate in parallel when validating many. Defaults to the number of CPUs.",
+)
+@click.option(
+    "--summary",
+    type=click.Path(dir_okay=False, writable=True, allow_dash=True),
+    default=None,
+    help="Write a JSON summary of the results to this file ('-' for stdout) when validating many.",
+)
+def validate_facets(path, filename, no_cache, recursive, jobs, summary):
+    """Validate the facets YAML file within the specified directory.
+
+    With --recursive or a glob PATH (e.g. 'modules/**'), validate every module found.
+    """
+
+    if recursive or is_glob(path):
+        validate_many(path, filename, not no_cache, jobs, summary)
+        return
 
     try:
         # Validate the specified facets yaml file in given path
-        validate_facets_yaml(path, filename)
-        click.echo(f"✅ {filename} validated successfully.[0m")
+        validate_facets_yaml(path, filename, use_cache=not no_cache)
+        click.echo(f"✅ {filename} validated successfully.\x1b[0m")
 
     except Exception as e:
-        click.echo(f"❌ Validation failed: {e}[0m")
+        click.echo(f"❌ Validation failed: {e}\x1b[0m")
         raise e
 
 
+def validate_many(path, filename, use_cache, jobs, summary):
+    """Validate every module under a root directory or matching a glob, streaming results."""
+    module_dirs = find_module_dirs(path, filename)
+    if not module_dirs:
+        raise click.UsageError(f"❌ No {filename} files found for {path}.")
+
+    # Keep stdout machine-readable when the summary is written to it.
+    progress_to_stderr = summary == "-"
+    jobs = jobs or os.cpu_count() or 1
+    click.echo(
+        f"Validating {len(module_dirs)} modules with {min(jobs, len(module_dirs))} jobs...",
+        err=progress_to_stderr,
+    )
+
+    results = []
+    for result in iter_validation_results(module_dirs, filename, use_cache, jobs):
+        results.append(result)
+        if result["status"] == "passed":
+            click.echo(f"✅ {result['path']}", err=progress_to_stderr)
+        else:
+            click.echo(f"❌ {result['path']}: {result['error']}", err=progress_to_stderr)
+
+    failed = sum(1 for result in results if result["status"] == "failed")
+    if summary:
+        import json
+
+        with click.open_file(summary, "w") as f:
+            json.dump(
+                {
+                    "total": len(results),
+                    "passed": len(results) - failed,
+                    "failed": failed,
+                    "modules": sorted(results, key=lambda result: result["path"]),
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+
+    click.echo(f"{len(results) - failed} passed, {failed} failed.", err=progress_to_stderr)
+    if failed:
+        raise click.UsageError(f"❌ {failed} of {len(results)} modules failed validation.")
+
+
+def find_module_dirs(path, filename="facets.yaml"):
+    """Return the sorted directories containing filename, under a root directory or matching a glob.
+
+    Glob matches may be module directories or the facets files themselves; `**` matches any depth.
+    Hidden directories and `.terraform` are not searched when walking a root directory.
+    """
+    import glob
+
+    module_dirs = set()
+    if is_glob(path):
+        for match in glob.glob(path, recursive=True):
+            if os.path.isdir(match) and os.path.isfile(os.path.join(match, filename)):
+                module_dirs.add(match)
+            elif os.path.basename(match) == filename and os.path.isfile(match):
+                module_dirs.add(os.path.dirname(match) or ".")
+    else:
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            if filename in filenames:
+                module_dirs.add(dirpath)
+    return sorted(module_dirs)
+
+
+def validate_module(path, filename="facets.yaml", use_cache=True):
+    """Validate one module's facets file with its output captured.
+
+    Returns:
+        dict: path, status ("passed" or "failed") and error message if failed.
+    """
+    import contextlib
+    import io
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            validate_facets_yaml(path, filename, use_cache=use_cache)
+    except click.ClickException as e:
+        return {"path": path, "status": "failed", "error": e.format_message()}
+    except Exception as e:
+        return {"path": path, "status": "failed", "error": str(e)}
+    return {"path": path, "status": "passed", "error": None}
+
+
+def iter_validation_results(module_dirs, filename, use_cache, jobs):
+    """Yield validation results as modules finish, in a process pool unless jobs is 1."""
+    if jobs == 1 or len(module_dirs) == 1:
+        for module_dir in module_dirs:
+            yield validate_module(module_dir, filename, use_cache)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(validate_module, module_dir, filename, use_cache)
+            for module_dir in module_dirs
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
 if __name__ == "__main__":
     validate_facets()
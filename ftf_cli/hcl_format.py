@@ -0,0 +1,297 @@
+"""In-process formatter producing `terraform fmt` layout for HCL source.
+
+Follows the whitespace rules of Terraform's formatter (hclwrite): two-space
+indentation per line that opens brackets, single spaces between tokens except
+around dots, inside brackets, before commas and between a function name and
+its arguments, and vertical alignment of `=` and trailing comments across
+consecutive attribute lines. Only whitespace between tokens changes: strings,
+comments and heredoc bodies are kept as written. Terraform's expression
+rewrites (e.g. unwrapping interpolation-only strings) are not applied.
+"""
+import re
+
+_IDENT = re.compile(r"[^\W\d][\w-]*")
+_NUMBER = re.compile(r"[0-9]+(\.[0-9]+)?([eE][+-]?[0-9]+)?")
+_HEREDOC = re.compile(r"<<-?([^\W\d][\w-]*)\r?\n")
+_PUNCTUATION = (
+    "...", "=>", "::", "==", "!=", "<=", ">=", "&&", "||",
+    "{", "}", "[", "]", "(", ")", "=", ",", ".", ":", "?", "!",
+    "-", "+", "*", "/", "%", "<", ">",
+)
+
+_OPENING = ("{", "[", "(", "${", "%{")
+_CLOSING = ("}", "]", ")", "SEQ_END")
+# Tokens after which a minus sign is a negation rather than a subtraction.
+_NEGATION_CONTEXT = (
+    None, "(", "{", "[", "=", ":", ",", "?", "+", "*", "/", "%", "-",
+    "==", "!=", ">", ">=", "<", "<=", "&&", "||", "!",
+)
+
+
+class _Token:
+    __slots__ = ("type", "text", "spaces")
+
+    def __init__(self, type_, text):
+        self.type = type_
+        self.text = text
+        self.spaces = 0
+
+    @property
+    def ends_line(self):
+        return self.type == "NL" or (self.type == "COMMENT" and self.text.endswith("\n"))
+
+
+def format_hcl(source):
+    """Return source formatted like `terraform fmt` would format it.
+
+    Raises:
+        ValueError: If source cannot be tokenized, e.g. an unterminated string.
+    """
+    lines = _split_lines(_tokenize(source))
+    _format_indent(lines)
+    _format_spaces(lines)
+    _format_cells(lines)
+    return "".join(
+        " " * token.spaces + token.text
+        for lead, assign, comment in lines
+        for token in lead + assign + comment
+    )
+
+
+def _tokenize(source):
+    tokens = []
+    interpolations = []  # open brace depth within each open template interpolation
+    pos = 0
+    while pos < len(source):
+        char = source[pos]
+        if char in " \t":
+            pos += 1
+            continue
+
+        if char == "\n" or source.startswith("\r\n", pos):
+            text = "\n" if char == "\n" else "\r\n"
+            tokens.append(_Token("NL", text))
+            pos += len(text)
+        elif char == "#" or source.startswith("//", pos):
+            end = source.find("\n", pos)
+            end = len(source) if end == -1 else end + 1
+            tokens.append(_Token("COMMENT", source[pos:end]))
+            pos = end
+        elif source.startswith("/*", pos):
+            end = source.find("*/", pos + 2)
+            if end == -1:
+                raise ValueError("unterminated comment")
+            tokens.append(_Token("BLOCK_COMMENT", source[pos:end + 2]))
+            pos = end + 2
+        elif char == '"':
+            tokens.append(_Token("OQUOTE", '"'))
+            pos = _scan_template(source, pos + 1, tokens, interpolations)
+        elif interpolations and interpolations[-1] == 0 and (
+            char == "}" or source.startswith("~}", pos)
+        ):
+            text = "}" if char == "}" else "~}"
+            tokens.append(_Token("SEQ_END", text))
+            interpolations.pop()
+            pos = _scan_template(source, pos + len(text), tokens, interpolations)
+        elif source.startswith("<<", pos) and _HEREDOC.match(source, pos):
+            pos = _scan_heredoc(source, pos, tokens)
+        elif _NUMBER.match(source, pos):
+            match = _NUMBER.match(source, pos)
+            tokens.append(_Token("NUMBER", match.group()))
+            pos = match.end()
+        elif _IDENT.match(source, pos):
+            match = _IDENT.match(source, pos)
+            tokens.append(_Token("IDENT", match.group()))
+            pos = match.end()
+        else:
+            for punctuation in _PUNCTUATION:
+                if source.startswith(punctuation, pos):
+                    break
+            else:
+                raise ValueError(f"unexpected character {char!r} at offset {pos}")
+            if interpolations and punctuation == "{":
+                interpolations[-1] += 1
+            elif interpolations and punctuation == "}":
+                interpolations[-1] -= 1
+            tokens.append(_Token(punctuation, punctuation))
+            pos += len(punctuation)
+
+    if interpolations:
+        raise ValueError("unterminated template interpolation")
+    return tokens
+
+
+def _scan_template(source, pos, tokens, interpolations):
+    """Scan a quoted template from pos up to its closing quote or next interpolation."""
+    start = pos
+    while pos < len(source):
+        char = source[pos]
+        if char == "\\":
+            pos += 2
+        elif source.startswith(("$${", "%%{"), pos):
+            pos += 3
+        elif char in "\r\n":
+            break
+        elif char == '"' or source.startswith(("${", "%{"), pos):
+            if pos > start:
+                tokens.append(_Token("QLIT", source[start:pos]))
+            if char == '"':
+                tokens.append(_Token("CQUOTE", '"'))
+                return pos + 1
+            text = source[pos:pos + 3] if source.startswith("~", pos + 2) else source[pos:pos + 2]
+            tokens.append(_Token(source[pos:pos + 2], text))
+            interpolations.append(0)
+            return pos + len(text)
+        else:
+            pos += 1
+    raise ValueError("unterminated string")
+
+
+def _scan_heredoc(source, pos, tokens):
+    """Keep a heredoc, from its opening marker to its closing marker, as one token."""
+    match = _HEREDOC.match(source, pos)
+    line_start = match.end()
+    while line_start < len(source):
+        line_end = source.find("\n", line_start)
+        if line_end == -1:
+            line_end = len(source)
+        if source[line_start:line_end].strip() == match.group(1):
+            if source[line_end - 1:line_end] == "\r":
+                line_end -= 1
+            tokens.append(_Token("HEREDOC", source[pos:line_end]))
+            return line_end
+        line_start = line_end + 1
+    raise ValueError(f"unterminated heredoc {match.group(1)}")
+
+
+def _split_lines(tokens):
+    """Split tokens into lines of (lead, assign, comment) cells."""
+    lines = []
+    start = 0
+    for index, token in enumerate(tokens):
+        if token.ends_line:
+            lines.append(tokens[start:index + 1])
+            start = index + 1
+    if start < len(tokens):
+        lines.append(tokens[start:])
+
+    cells = []
+    for lead in lines:
+        assign = []
+        comment = []
+        if len(lead) > 1 and lead[-1].type in ("COMMENT", "BLOCK_COMMENT"):
+            lead, comment = lead[:-1], lead[-1:]
+        for index, token in enumerate(lead):
+            if index > 0 and token.type == "=":
+                # Only align single-line values, not ones opening a multi-line expression.
+                if _bracket_change(lead[index:]) == 0:
+                    lead, assign = lead[:index], lead[index:]
+                break
+        cells.append((lead, assign, comment))
+    return cells
+
+
+def _bracket_change(tokens):
+    change = 0
+    for token in tokens:
+        if token.type in _OPENING:
+            change += 1
+        elif token.type in _CLOSING:
+            change -= 1
+    return change
+
+
+def _format_indent(lines):
+    indents = []  # net brackets opened by each line that increased the indentation
+    for lead, assign, comment in lines:
+        if not lead:
+            continue
+        if lead[0].type == "NL":
+            lead[0].spaces = 0
+            continue
+
+        change = _bracket_change(lead) + _bracket_change(assign)
+        if change > 0:
+            lead[0].spaces = 2 * len(indents)
+            indents.append(change)
+            continue
+
+        closed = -change
+        while closed > 0 and indents:
+            if closed >= indents[-1]:
+                closed -= indents.pop()
+            else:
+                indents[-1] -= closed
+                closed = 0
+        lead[0].spaces = 2 * len(indents)
+
+
+def _format_spaces(lines):
+    for lead, assign, comment in lines:
+        for cell in (lead, assign):
+            for index in range(1, len(cell)):
+                before = cell[index - 2] if index > 1 else (
+                    lead[-1] if cell is assign and lead else None
+                )
+                cell[index].spaces = int(_space_after(cell[index - 1], before, cell[index]))
+
+
+def _space_after(subject, before, after):
+    """Return whether `terraform fmt` puts a space between subject and the token after it."""
+    if after.type == "NL":
+        return False
+    if subject.type == "IDENT" and after.type == "(":
+        return False
+    if "::" in (subject.type, after.type) and "IDENT" in (subject.type, after.type):
+        return False
+    if subject.type == "." or after.type == ".":
+        return False
+    if after.type in (",", "..."):
+        return False
+    if subject.type == ",":
+        return True
+    if subject.type in ("QLIT", "OQUOTE", "HEREDOC") or after.type in ("QLIT", "CQUOTE"):
+        return False
+    if subject.type == "IDENT" and subject.text == "in" and before is not None and before.type == "IDENT":
+        return True
+    if after.type == "[" and (
+        subject.type in ("IDENT", "NUMBER") or _bracket_change([subject]) < 0
+    ):
+        return False
+    if subject.type == "-":
+        return (before.type if before is not None else None) not in _NEGATION_CONTEXT
+    if subject.type == "!":
+        return False
+    if subject.type == "{" or after.type == "}":
+        return not (subject.type == "{" and after.type == "}")
+    if subject.type in ("${", "%{") and after.type == "{":
+        return True
+    if subject.type == "}" and after.type == "SEQ_END":
+        return True
+    if subject.type == "SEQ_END" and after.type in ("${", "%{"):
+        return False
+    if _bracket_change([subject]) > 0 or _bracket_change([after]) < 0:
+        return False
+    return True
+
+
+def _columns(tokens):
+    return sum(token.spaces + len(token.text) for token in tokens)
+
+
+def _format_cells(lines):
+    # Align the `=` of consecutive attribute lines, then their trailing comments.
+    for cell, width in (
+        (1, lambda line: _columns(line[0])),
+        (2, lambda line: _columns(line[0]) + _columns(line[1])),
+    ):
+        chain = []
+        for line in lines + [((), (), ())]:
+            if line[cell]:
+                chain.append(line)
+                continue
+            if chain:
+                widest = max(width(chain_line) for chain_line in chain)
+                for chain_line in chain:
+                    chain_line[cell][0].spaces = widest - width(chain_line) + 1
+                chain = []
@@ -0,0 +1,224 @@
+"""Fast scanner for the resource blocks of a Terraform file.
+
+`scan_resources` finds `resource "type" "name"` blocks and their top-level
+`count` and `for_each` arguments without building a syntax tree. It skips
+strings (including nested template interpolations), comments and heredocs
+so braces inside them do not count. Literal and plain reference
+meta-arguments are converted directly; any other meta-argument expression,
+such as a conditional, is parsed on its own by python-hcl2 so that values
+match a full parse exactly. Source whose block structure the scanner does
+not understand raises AmbiguousSource, and the caller falls back to a full
+parse. Errors inside expressions that do not affect the block structure,
+such as `x = 1 +`, are not detected; a full parse is needed to validate a
+file.
+"""
+import copy
+import functools
+import re
+
+META_ARGUMENTS = ("count", "for_each")
+
+_CODE = re.compile(
+    r"""
+      [ \t]+
+    | (?P<nl>\r?\n)
+    | (?P<comment>(?:\#|//)[^\n]*|/\*.*?\*/)
+    | (?P<heredoc><<-?(?P<marker>[^\W\d][\w-]*)\r?\n)
+    | (?P<quote>")
+    | (?P<open>[{\[(])
+    | (?P<close>[}\])])
+    | (?P<word>[^\W\d][\w-]*)
+    | (?P<number>[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+    | (?P<punct>\.\.\.|=>|==|!=|<=|>=|&&|\|\||::|~(?=\})|[=.,:?!<>+\-*/%])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# The literal part of a quoted template, up to its end or next interpolation.
+_STRING_PART = re.compile(r"""(?:[^"\\$%\r\n]|\\.|\$\$\{|%%\{|[$%](?!\{))*""")
+_SIMPLE_STRING = re.compile(r"""[^"\\$%\r\n]*""")
+_REFERENCE_PART = re.compile(r"[^\W\d][\w-]*")
+
+
+class AmbiguousSource(ValueError):
+    """The source needs a full parse to be interpreted exactly."""
+
+
+def scan_resources(content):
+    """Return (type, name, meta-arguments) for each resource block in content, in order.
+
+    Meta-arguments are returned as python-hcl2 represents them, e.g.
+    {"count": [2]} or {"for_each": ["${var.items}"]}.
+
+    Raises:
+        AmbiguousSource: If content needs a full parse.
+    """
+    tokens = _tokenize(content)
+    resources = []
+    position = _scan_body(content, tokens, 0, resources, top_level=True)
+    if position != len(tokens):
+        raise AmbiguousSource("unbalanced braces")
+    return resources
+
+
+def _tokenize(content):
+    """Return (kind, text, offset) tokens, with strings as single "string" or "template" tokens."""
+    tokens = []
+    interpolations = []  # open brackets within each open template interpolation
+    pos = 0
+    end = len(content)
+    while pos < end:
+        match = _CODE.match(content, pos)
+        if match is None:
+            raise AmbiguousSource(f"unexpected character at offset {pos}")
+        kind = match.lastgroup
+        pos = match.end()
+
+        if kind is None or kind == "comment":
+            continue
+        if kind == "punct" and content.startswith("/*", match.start()):
+            raise AmbiguousSource("unterminated comment")
+        if kind == "heredoc":
+            if match.group("heredoc").endswith("\r\n"):
+                raise AmbiguousSource("heredoc with a CRLF line ending")  # python-hcl2 rejects these
+            closing = re.compile(
+                r"^[ \t]*" + re.escape(match.group("marker")) + r"[ \t]*\r?$", re.MULTILINE
+            ).search(content, pos)
+            if closing is None:
+                raise AmbiguousSource("unterminated heredoc")
+            tokens.append(("heredoc", content[match.start():closing.end()], match.start()))
+            pos = closing.end()
+        elif kind == "quote":
+            simple = _SIMPLE_STRING.match(content, pos)
+            if content.startswith('"', simple.end()):
+                tokens.append(("string", simple.group(), match.start()))
+                pos = simple.end() + 1
+            else:
+                tokens.append(("template", "", match.start()))
+                pos = _scan_template(content, pos, tokens, interpolations)
+        elif kind == "close" and match.group() == "}" and interpolations and interpolations[-1] == 0:
+            # The end of a template interpolation: continue with the rest of the string.
+            interpolations.pop()
+            tokens.append(("close", "}", match.start()))
+            pos = _scan_template(content, pos, tokens, interpolations)
+        else:
+            if interpolations and kind in ("open", "close"):
+                interpolations[-1] += 1 if kind == "open" else -1
+            tokens.append((kind, match.group(), match.start()))
+
+    if interpolations:
+        raise AmbiguousSource("unterminated template interpolation")
+    return tokens
+
+
+def _scan_template(content, pos, tokens, interpolations):
+    """Skip the literal part of a quoted template from pos; open its next interpolation, if any."""
+    pos = _STRING_PART.match(content, pos).end()
+    if content.startswith('"', pos):
+        return pos + 1
+    if content.startswith(("${", "%{"), pos):
+        tokens.append(("open", content[pos:pos + 2], pos))
+        interpolations.append(0)
+        return pos + 3 if content.startswith("~", pos + 2) else pos + 2
+    raise AmbiguousSource("unterminated string")
+
+
+def _scan_body(content, tokens, position, resources, top_level=False, meta_arguments=None):
+    """Scan the statements of a body up to its closing brace; return the position after it."""
+    while True:
+        while position < len(tokens) and tokens[position][0] == "nl":
+            position += 1
+        if position == len(tokens):
+            if top_level:
+                return position
+            raise AmbiguousSource("unterminated block")
+        kind, name, _ = tokens[position]
+        if kind == "close" and name == "}" and not top_level:
+            return position + 1
+        if kind != "word":
+            raise AmbiguousSource(f"unexpected {name!r} at the start of a statement")
+        position += 1
+
+        if position < len(tokens) and tokens[position][:2] == ("punct", "="):
+            end = _skip_expression(tokens, position + 1)
+            if end == position + 1:
+                raise AmbiguousSource(f"missing value for {name}")
+            if meta_arguments is not None and name in META_ARGUMENTS:
+                if name in meta_arguments:
+                    raise AmbiguousSource(f"duplicate {name}")
+                meta_arguments[name] = _value(content, tokens, position + 1, end)
+            position = end
+            continue
+
+        labels = []
+        while position < len(tokens) and tokens[position][0] in ("string", "word"):
+            labels.append(tokens[position][1])
+            position += 1
+        if position == len(tokens) or tokens[position][:2] != ("open", "{"):
+            raise AmbiguousSource(f"malformed block {name}")
+        if meta_arguments is not None and name in META_ARGUMENTS:
+            raise AmbiguousSource(f"block named {name}")
+
+        if top_level and name == "resource":
+            if len(labels) != 2:
+                raise AmbiguousSource("resource block without two labels")
+            block_meta_arguments = {}
+            resources.append((labels[0], labels[1], block_meta_arguments))
+            position = _scan_body(
+                content, tokens, position + 1, resources, meta_arguments=block_meta_arguments
+            )
+        else:
+            position = _scan_body(content, tokens, position + 1, resources)
+
+
+def _skip_expression(tokens, position):
+    """Return the position of the end of the expression starting at position."""
+    depth = 0
+    while position < len(tokens):
+        kind = tokens[position][0]
+        if depth == 0 and (kind == "nl" or kind == "close"):
+            return position
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth -= 1
+        position += 1
+    return position
+
+
+def _value(content, tokens, start, end):
+    """Return the value of the expression tokens[start:end] as python-hcl2 represents it."""
+    expression = tokens[start:end]
+    if len(expression) == 1:
+        kind, text, _ = expression[0]
+        if kind == "number" and re.fullmatch(r"[0-9]+", text):
+            return [int(text)]
+        if kind == "number" and re.fullmatch(r"[0-9]+\.[0-9]+", text):
+            return [float(text)]
+        if kind == "word" and text in ("true", "false"):
+            return [text == "true"]
+        if kind == "string" and text:
+            return [text]
+    # A plain reference such as var.items or local.settings.instances.
+    if (
+        len(expression) >= 3
+        and len(expression) % 2 == 1
+        and expression[0][0] == "word"
+        and expression[0][1] not in ("true", "false", "null")
+        and all(token[:2] == ("punct", ".") for token in expression[1::2])
+        and all(kind == "word" and _REFERENCE_PART.fullmatch(text) for kind, text, _ in expression[2::2])
+    ):
+        return ["${" + ".".join(token[1] for token in expression[::2]) + "}"]
+
+    end_offset = tokens[end][2] if end < len(tokens) else len(content)
+    return copy.deepcopy(_parse_expression(content[expression[0][2]:end_offset].rstrip()))
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_expression(source):
+    """Return an expression parsed by python-hcl2; modules repeat the same few expressions."""
+    import hcl2
+
+    try:
+        return hcl2.loads("value = " + source + "\n")["value"]
+    except Exception as e:
+        raise AmbiguousSource(f"could not parse expression: {e}") from e
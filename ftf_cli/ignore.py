@@ -0,0 +1,116 @@
+"""gitignore-style rules for the files archived from a module directory.
+
+Rules are DEFAULT_PATTERNS followed by the lines of the module's
+.facetsignore, with the syntax of .gitignore: `#` comments, `!` to
+re-include, a trailing `/` to match only directories, a `/` at the start or
+in the middle to match relative to the module directory, and `*`, `?`,
+`[...]` and `**` wildcards. The last rule that matches a path decides
+whether it is ignored; files inside an ignored directory are always ignored.
+"""
+import os
+import re
+
+IGNORE_FILE = ".facetsignore"
+
+DEFAULT_PATTERNS = (
+    # Version control
+    ".git/",
+    ".hg/",
+    ".svn/",
+    # Terraform working files left by `terraform init`
+    ".terraform/",
+    ".terraform.lock.hcl",
+    # Dependencies and caches
+    "node_modules/",
+    "__pycache__/",
+    # Editor and OS files
+    "*.swp",
+    "*.swo",
+    "*~",
+    ".#*",
+    ".DS_Store",
+)
+
+
+class IgnoreRules:
+    """An ordered list of gitignore-style patterns."""
+
+    def __init__(self, patterns):
+        self._rules = [rule for rule in map(_compile, patterns) if rule is not None]
+
+    @classmethod
+    def for_module(cls, path):
+        """Return the default rules followed by those of the module's .facetsignore, if any."""
+        patterns = list(DEFAULT_PATTERNS)
+        ignore_file = os.path.join(path, IGNORE_FILE)
+        if os.path.isfile(ignore_file):
+            with open(ignore_file, "r", encoding="utf-8") as f:
+                patterns.extend(f.read().splitlines())
+        return cls(patterns)
+
+    def ignored(self, relative_path, is_dir=False):
+        """Return whether a path, relative to the module directory with `/` separators, is ignored."""
+        ignored = False
+        for regex, negated, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relative_path):
+                ignored = not negated
+        return ignored
+
+
+def _compile(pattern):
+    """Return (regex, negated, directories only) for a pattern, or None for blank lines and comments."""
+    if pattern.startswith("#"):
+        return None
+    # Trailing spaces are ignored unless escaped with a backslash.
+    pattern = re.sub(r"(?<!\\)\s+$", "", pattern)
+    if not pattern:
+        return None
+
+    negated = pattern.startswith("!")
+    if negated:
+        pattern = pattern[1:]
+    elif pattern.startswith(("\\!", "\\#")):
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    if not pattern:
+        return None
+
+    regex = "" if anchored or pattern.startswith("**/") else "(?:.*/)?"
+    position = 0
+    while position < len(pattern):
+        if pattern.startswith("**/", position) and position == 0:
+            regex += "(?:.*/)?"
+            position += 3
+        elif pattern.startswith("/**/", position):
+            regex += "/(?:.*/)?"
+            position += 4
+        elif pattern.startswith("/**", position) and position + 3 == len(pattern):
+            regex += "/.+"
+            position += 3
+        elif pattern[position] == "*":
+            regex += "[^/]*"
+            position += 1
+        elif pattern[position] == "?":
+            regex += "[^/]"
+            position += 1
+        elif pattern[position] == "[" and "]" in pattern[position + 2:]:
+            end = pattern.index("]", position + 2)
+            characters = pattern[position + 1:end]
+            if characters.startswith("!"):
+                characters = "^" + characters[1:]
+            regex += "[" + characters.replace("\\", "\\\\") + "]"
+            position = end + 1
+        elif pattern[position] == "\\" and position + 1 < len(pattern):
+            regex += re.escape(pattern[position + 1])
+            position += 2
+        else:
+            regex += re.escape(pattern[position])
+            position += 1
+
+    return re.compile(regex + r"\Z"), negated, dir_only
@@ -0,0 +1,101 @@
+"""Files of a module directory, read and parsed at most once per process.
+
+Commands validate, inspect and package the same facets.yaml, variables.tf and
+outputs.tf several times. `Module` reads each file once and parses it once per
+parser, and re-reads it only when its size or modification time changes, e.g.
+after a command writes it. Parsed results are handed out as copies that
+callers may modify.
+"""
+import copy
+import os
+
+_files = {}  # absolute path -> _File
+
+
+class _File:
+    __slots__ = ("signature", "content", "parsed")
+
+    def __init__(self, signature, content):
+        self.signature = signature
+        self.content = content
+        self.parsed = {}
+
+
+class Module:
+    """A module directory whose files are read and parsed lazily."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def file_path(self, filename):
+        return os.path.join(self.path, filename)
+
+    def tf_files(self):
+        """Return the sorted names of the module's .tf files."""
+        return sorted(
+            filename for filename in os.listdir(self.path)
+            if filename.endswith(".tf") and os.path.isfile(self.file_path(filename))
+        )
+
+    def read(self, filename):
+        """Return the text of a file of the module."""
+        return self._file(filename).content
+
+    def load_yaml(self, filename="facets.yaml"):
+        """Return the parsed content of a YAML file of the module."""
+        return self._parse(filename, "yaml", _parse_yaml)
+
+    def load_hcl2(self, filename):
+        """Return a Terraform file of the module parsed into a dict by python-hcl2."""
+        return self._parse(filename, "hcl2", _parse_hcl2)
+
+    def parse_hcl(self, filename):
+        """Return the syntax tree of a Terraform file of the module, parsed by facets-hcl."""
+        return self._parse(filename, "hcl", _parse_hcl)
+
+    def _file(self, filename):
+        path = os.path.abspath(self.file_path(filename))
+        try:
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None  # not cached; opening it reports the error
+
+        cached = _files.get(path)
+        if cached is not None and signature is not None and cached.signature == signature:
+            return cached
+
+        with open(path, "r", encoding="utf-8") as f:
+            cached = _File(signature, f.read())
+        if signature is not None:
+            _files[path] = cached
+        return cached
+
+    def _parse(self, filename, parser_name, parser):
+        cached = self._file(filename)
+        if parser_name not in cached.parsed:
+            cached.parsed[parser_name] = parser(cached.content)
+        return copy.deepcopy(cached.parsed[parser_name])
+
+
+def clear():
+    """Forget all read and parsed files."""
+    _files.clear()
+
+
+def _parse_yaml(content):
+    import yaml
+
+    return yaml.safe_load(content)
+
+
+def _parse_hcl2(content):
+    import hcl2
+
+    return hcl2.loads(content)
+
+
+def _parse_hcl(content):
+    import hcl
+
+    return hcl.parses(content)
@@ -1,10 +1,15 @@
 import os
 import json
+import shutil
+import stat
 import zipfile
 import tempfile
-import base64
-from typing import Dict, Optional, Tuple
-import requests
+import hashlib
+import io
+import sys
+import uuid
+import zlib
+from typing import Dict, List, Optional, Tuple
 import click
 
 
@@ -14,40 +19,99 @@ class ModuleOperationError(Exception):
     pass
 
 
-def cleanup_terraform_files(path: str) -> None:
-    """Remove .terraform directories and .terraform.lock.hcl files from the module path"""
-    import shutil
-    import glob
-
-    # Remove .terraform directories
-    terraform_dirs = glob.glob(os.path.join(path, "**/.terraform"), recursive=True)
-    for terraform_dir in terraform_dirs:
-        if os.path.isdir(terraform_dir):
-            shutil.rmtree(terraform_dir)
-
-    # Remove .terraform.lock.hcl files
-    lock_files = glob.glob(os.path.join(path, "**/.terraform.lock.hcl"), recursive=True)
-    for lock_file in lock_files:
-        if os.path.isfile(lock_file):
-            os.remove(lock_file)
-
-
-def create_module_zip(path: str) -> str:
-    """Create a zip file of the module directory and return the zip file path"""
-    # Clean up terraform files before zipping
-    cleanup_terraform_files(path)
+def module_archive_files(path: str) -> List[Tuple[str, str]]:
+    """Return (file path, archive name) for each file to archive from the module directory.
+
+    Files ignored by the default rules or the module's .facetsignore (see
+    ftf_cli.ignore), such as .git and .terraform, are left out. Symlinks are
+    followed, except to a directory that contains them, so a symlink loop is
+    not walked forever.
+    """
+    from ftf_cli.ignore import IgnoreRules
+
+    rules = IgnoreRules.for_module(path)
+    files = []
+
+    def walk(directory, prefix, ancestors):
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            arcname = prefix + entry.name
+            is_dir = entry.is_dir()
+            if rules.ignored(arcname, is_dir):
+                continue
+            if is_dir:
+                stat = entry.stat()
+                inode = (stat.st_dev, stat.st_ino)
+                if inode in ancestors:
+                    continue  # a symlink to a directory that contains it
+                walk(entry.path, arcname + "/", ancestors | {inode})
+            elif entry.is_file():
+                files.append((entry.path, arcname))
+
+    stat = os.stat(path)
+    walk(path, "", frozenset([(stat.st_dev, stat.st_ino)]))
+    return files
+
+
+# Timestamp of every archive entry; the earliest a zip file can represent
+ARCHIVE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+DEFAULT_COMPRESSION_LEVEL = 6
+# Files that are already compressed are stored as they are
+STORED_EXTENSIONS = (
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".7z", ".jar",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp",
+)
+# Compressed entries larger than this are spooled to disk until they are written
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# CPython versions whose ZipFile internals _write_archive_entry is checked against (see CI).
+# Other versions write entries with ZipFile.writestr, one at a time.
+PRECOMPRESSED_WRITE_VERSIONS = ((3, 11), (3, 12), (3, 13))
+
+
+def create_module_zip(
+        path: str,
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+        jobs: Optional[int] = None,
+        extra_files: Optional[Dict[str, bytes]] = None,
+) -> str:
+    """Create a zip file of the module directory and return the zip file path.
+
+    Only the files returned by module_archive_files are archived; nothing in
+    the module directory is modified. extra_files maps archive names to
+    contents that are archived from memory, replacing any file of the module
+    directory with the same name. Entries are sorted and get a fixed
+    timestamp and permissions, so the same files always give the same bytes.
+    Files are compressed concurrently by `jobs` threads (default: the number
+    of CPUs) and written in order; files in STORED_EXTENSIONS are not
+    compressed again. On Python versions not in PRECOMPRESSED_WRITE_VERSIONS,
+    files are compressed one at a time by ZipFile.writestr instead.
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
 
     # Create temporary zip file
     temp_fd, zip_path = tempfile.mkstemp(suffix=".zip")
     os.close(temp_fd)
 
     try:
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(path, followlinks=True):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, path)
-                    zipf.write(file_path, arcname)
+        jobs = jobs or os.cpu_count() or 1
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf, \
+                ThreadPoolExecutor(max_workers=jobs) as executor:
+            # Keep a bounded number of compressed entries waiting to be written
+            pending = deque()
+            sources = {arcname: file_path for file_path, arcname in module_archive_files(path)}
+            sources.update(extra_files or {})
+            for arcname, source in sorted(sources.items()):
+                level = None if arcname.lower().endswith(STORED_EXTENSIONS) else compression_level
+                if not _can_write_precompressed():
+                    _writestr_archive_entry(zipf, source, arcname, level)
+                    continue
+                if len(pending) >= 2 * jobs:
+                    _write_archive_entry(zipf, *pending.popleft().result())
+                pending.append(executor.submit(_compress_archive_entry, source, arcname, level))
+            while pending:
+                _write_archive_entry(zipf, *pending.popleft().result())
 
         return zip_path
     except Exception as e:
@@ -57,6 +121,208 @@ def create_module_zip(path: str) -> str:
         raise ModuleOperationError(f"Failed to create zip file: {str(e)}")
 
 
+class MultipartBody:
+    """A multipart/form-data request body that is read from its parts as it is sent.
+
+    Each part is (field name, filename, content type, content), where content is
+    bytes or the path of a file. requests builds `files=` bodies in memory; this
+    reads files in chunks instead, so memory use does not grow with their size.
+    Its length is known up front, so the request is sent with a Content-Length.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, parts):
+        self.boundary = uuid.uuid4().hex
+        self._segments = []  # bytes, or (path, size) of a file
+        for name, filename, content_type, content in parts:
+            self._segments.append(
+                (
+                    f"--{self.boundary}\r\n"
+                    f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                    f"Content-Type: {content_type}\r\n\r\n"
+                ).encode()
+            )
+            if isinstance(content, bytes):
+                self._segments.append(content)
+            else:
+                self._segments.append((content, os.path.getsize(content)))
+            self._segments.append(b"\r\n")
+        self._segments.append(f"--{self.boundary}--\r\n".encode())
+
+        self._length = sum(
+            len(segment) if isinstance(segment, bytes) else segment[1]
+            for segment in self._segments
+        )
+        self._buffer = b""
+        self._position = 0
+        self._chunks = self._iter_chunks()
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return self._length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def seek(self, offset, whence=0):
+        """Rewind the body to the start, so a failed request can be sent again."""
+        if (offset, whence) != (0, 0):
+            raise io.UnsupportedOperation("MultipartBody can only be rewound to the start")
+        self._chunks.close()
+        self._buffer = b""
+        self._position = 0
+        self._chunks = self._iter_chunks()
+        return 0
+
+    def tell(self):
+        return self._position
+
+    def read(self, size=-1):
+        """Return the next size bytes of the body, or all remaining bytes if size is negative."""
+        while size is None or size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self._position += len(data)
+        return data
+
+    def close(self):
+        self._chunks.close()
+
+    def _iter_chunks(self):
+        for segment in self._segments:
+            if isinstance(segment, bytes):
+                yield segment
+                continue
+            with open(segment[0], "rb") as f:
+                while True:
+                    chunk = f.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+
+
+def _can_write_precompressed():
+    return sys.implementation.name == "cpython" and sys.version_info[:2] in PRECOMPRESSED_WRITE_VERSIONS
+
+
+def _open_archive_entry(source, arcname):
+    """Return the ZipInfo of a file, given by path or as bytes, and a file object of its content.
+
+    The ZipInfo has a fixed timestamp and only the file's executable bit.
+    """
+    if isinstance(source, bytes):
+        mode = 0o644
+        file = io.BytesIO(source)
+    else:
+        mode = 0o755 if os.stat(source).st_mode & 0o111 else 0o644
+        file = open(source, "rb")
+    info = zipfile.ZipInfo(arcname, date_time=ARCHIVE_DATE_TIME)
+    info.create_system = 3  # Unix, so external_attr holds the file mode
+    info.external_attr = (stat.S_IFREG | mode) << 16
+    return info, file
+
+
+def _writestr_archive_entry(zipf, source, arcname, level):
+    """Compress and write a file to the archive with ZipFile.writestr; store it if level is None."""
+    info, file = _open_archive_entry(source, arcname)
+    with file as f:
+        if level is None:
+            zipf.writestr(info, f.read(), compress_type=zipfile.ZIP_STORED)
+        else:
+            zipf.writestr(info, f.read(), compress_type=zipfile.ZIP_DEFLATED, compresslevel=level)
+
+
+def _compress_archive_entry(source, arcname, level):
+    """Compress a file, given by path or as bytes, for the archive; store it if level is None.
+
+    Returns the entry's ZipInfo (see _open_archive_entry) and a file object
+    holding its compressed data.
+    """
+    info, file = _open_archive_entry(source, arcname)
+
+    # zipfile's raw deflate stream, so the archive is the same as zipfile would write
+    compressor = None if level is None else zlib.compressobj(level, zlib.DEFLATED, -15)
+    info.compress_type = zipfile.ZIP_STORED if compressor is None else zipfile.ZIP_DEFLATED
+    data = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    info.CRC = 0
+    info.file_size = 0
+    with file as f:
+        for chunk in iter(lambda: f.read(MultipartBody.CHUNK_SIZE), b""):
+            info.CRC = zlib.crc32(chunk, info.CRC)
+            info.file_size += len(chunk)
+            data.write(chunk if compressor is None else compressor.compress(chunk))
+    if compressor is not None:
+        data.write(compressor.flush())
+    info.compress_size = data.tell()
+    data.seek(0)
+    return info, data
+
+
+def _write_archive_entry(zipf, info, data):
+    """Write an entry prepared by _compress_archive_entry at the end of the archive.
+
+    ZipFile.open() would compress the data again, so the local header and
+    data are written directly, as ZipFile._open_to_write does. This relies on
+    ZipFile internals, so it is only used on PRECOMPRESSED_WRITE_VERSIONS.
+    """
+    with data, zipf._lock:
+        if zipf._writing:
+            raise ValueError("Can't write to the ZIP file while there is an open writing handle.")
+        zip64 = info.file_size * 1.05 > zipfile.ZIP64_LIMIT
+        info.flag_bits = 0
+        zipf.fp.seek(zipf.start_dir)
+        info.header_offset = zipf.fp.tell()
+        zipf._writecheck(info)
+        zipf._didModify = True
+        zipf.fp.write(info.FileHeader(zip64))
+        shutil.copyfileobj(data, zipf.fp, MultipartBody.CHUNK_SIZE)
+        zipf.start_dir = zipf.fp.tell()
+        zipf.filelist.append(info)
+        zipf.NameToInfo[info.filename] = info
+
+
+def module_upload_key(profile, control_plane_url, username, intent, flavor, version):
+    """Return the key under which register_module records the last upload of a module version.
+
+    The Git ref is left out: it is part of the uploaded metadata, so a change
+    of Git ref already changes the recorded digest.
+    """
+    from ftf_cli import cache
+
+    return cache.make_key(profile, control_plane_url, username, intent, flavor, str(version))
+
+
+def forget_module_upload(profile, control_plane_url, username, intent, flavor, version):
+    """Forget the last upload of a module version, so the next preview uploads it again."""
+    from ftf_cli import cache
+
+    cache.remove(
+        "module_upload", module_upload_key(profile, control_plane_url, username, intent, flavor, version)
+    )
+
+
+def _upload_digest(zip_path, metadata_json):
+    """Return a digest of the archive and metadata sent by register_module."""
+    digest = hashlib.sha256()
+    with open(zip_path, "rb") as f:
+        for chunk in iter(lambda: f.read(MultipartBody.CHUNK_SIZE), b""):
+            digest.update(chunk)
+    digest.update(b"\0" + metadata_json)
+    return digest.hexdigest()
+
+
 def register_module(
         control_plane_url: str,
         username: str,
@@ -67,8 +333,25 @@ def register_module(
         is_feature_branch: bool = False,
         auto_create: bool = False,
         skip_output_write: bool = False,
-) -> None:
-    """Register a module with the control plane"""
+        upload_cache_key: Optional[str] = None,
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+        extra_files: Optional[Dict[str, bytes]] = None,
+) -> bool:
+    """Register a module with the control plane.
+
+    extra_files maps archive names to contents that are uploaded in place of
+    (or in addition to) the files of the module directory.
+
+    If upload_cache_key is given (see module_upload_key), the digest of the
+    archive and metadata is recorded under it after a successful upload, and
+    the upload is skipped when they are unchanged since then. delete-module
+    forgets the record (see forget_module_upload).
+
+    Returns:
+        Whether the module was uploaded.
+    """
+    from ftf_cli import cache
+    from ftf_cli.client import ControlPlaneClient
 
     # Validate inputs
     if not all([control_plane_url, username, token, path]):
@@ -86,61 +369,51 @@ def register_module(
             f"facets.yaml file not found in the specified path '{path}'"
         )
 
-    # Normalize URL
-    url = control_plane_url.rstrip("/")
-    if url.startswith("http://"):
-        url = url[7:]
-    elif url.startswith("https://"):
-        url = url[8:]
-
-    upload_url = f"https://{url}/cc-ui/v1/modules/upload"
+    client = ControlPlaneClient(control_plane_url, username, token)
 
     # Create zip file
     zip_path = None
     try:
-        zip_path = create_module_zip(path)
-
-        # Prepare authentication
-        auth_string = base64.b64encode(f"{username}:{token}".encode()).decode().strip()
-        headers = {"Authorization": f"Basic {auth_string}"}
-
-        # Prepare files for upload and make the request
-        with open(zip_path, "rb") as zip_file:
-            files = {"file": ("module.zip", zip_file, "application/zip")}
-
-            # Prepare metadata if git info is provided or skip_output_write is set
-            if any([git_url, git_ref, is_feature_branch, auto_create, skip_output_write]):
-                metadata = {}
-                if git_url:
-                    metadata["gitUrl"] = git_url
-                if git_ref:
-                    metadata["gitRef"] = git_ref
-                metadata["featureBranch"] = is_feature_branch
-                metadata["autoCreate"] = auto_create
-                metadata["skipOutputWrite"] = skip_output_write
-
-                metadata_json = json.dumps(metadata).encode()
-                temp_metadata_fd, temp_metadata_path = tempfile.mkstemp(suffix=".json")
-                with os.fdopen(temp_metadata_fd, "wb") as temp_metadata_file:
-                    temp_metadata_file.write(metadata_json)
-                try:
-                    with open(temp_metadata_path, "rb") as metadata_file:
-                        files["metadata"] = (
-                            "metadata.json",
-                            metadata_file,
-                            "application/json",
-                        )
-                        # Make the request
-                        response = requests.post(upload_url, headers=headers, files=files)
-                finally:
-                    os.remove(temp_metadata_path)
-            else:
-                # Make the request
-                response = requests.post(upload_url, headers=headers, files=files)
+        zip_path = create_module_zip(path, compression_level=compression_level, extra_files=extra_files)
+
+        # Prepare the parts for upload; the zip is streamed from disk
+        parts = [("file", "module.zip", "application/zip", zip_path)]
+        metadata_json = b""
+
+        # Prepare metadata if git info is provided or skip_output_write is set
+        if any([git_url, git_ref, is_feature_branch, auto_create, skip_output_write]):
+            metadata = {}
+            if git_url:
+                metadata["gitUrl"] = git_url
+            if git_ref:
+                metadata["gitRef"] = git_ref
+            metadata["featureBranch"] = is_feature_branch
+            metadata["autoCreate"] = auto_create
+            metadata["skipOutputWrite"] = skip_output_write
+
+            metadata_json = json.dumps(metadata).encode()
+            parts.append(("metadata", "metadata.json", "application/json", metadata_json))
+
+        # Skip the upload if this exact archive was already registered
+        digest = None
+        if upload_cache_key:
+            digest = _upload_digest(zip_path, metadata_json)
+            if cache.load("module_upload", upload_cache_key) == digest:
+                click.echo("Module unchanged since its last successful upload, skipping upload.")
+                return False
+
+        # Make the request
+        with MultipartBody(parts) as body:
+            response = client.post(
+                "/cc-ui/v1/modules/upload", headers={"Content-Type": body.content_type}, data=body
+            )
 
         # Check response
         if response.status_code == 200:
             click.echo("Module registered successfully.")
+            if digest:
+                cache.store("module_upload", upload_cache_key, digest)
+            return True
         elif 400 <= response.status_code < 600:
             try:
                 error_message = response.json().get(
@@ -174,26 +447,17 @@ def publish_module(
         version: str,
 ) -> None:
     """Publish a module to make it available for production use"""
+    from ftf_cli.client import ControlPlaneClient
 
     # Validate inputs
     if not all([control_plane_url, username, token, intent, flavor, version]):
         raise ModuleOperationError("Missing required arguments for module publishing")
 
-    # Normalize URL
-    url = control_plane_url.rstrip("/")
-    if url.startswith("http://"):
-        url = url[7:]
-    elif url.startswith("https://"):
-        url = url[8:]
-
-    publish_url = f"https://{url}/cc-ui/v1/modules/intent/{intent}/flavor/{flavor}/version/{version}/mark-published"
-
-    # Prepare authentication
-    auth_string = base64.b64encode(f"{username}:{token}".encode()).decode().strip()
-    headers = {"Authorization": f"Basic {auth_string}"}
-
     # Make the request
-    response = requests.post(publish_url, headers=headers)
+    client = ControlPlaneClient(control_plane_url, username, token)
+    response = client.post(
+        f"/cc-ui/v1/modules/intent/{intent}/flavor/{flavor}/version/{version}/mark-published"
+    )
 
     # Check response
     if response.status_code == 200:
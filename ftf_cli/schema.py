@@ -1,5 +1,10 @@
 from jsonschema import Draft7Validator
 
+# Keys of facets.yaml whose values are JSON schemas. Their values are checked against the
+# draft-07 metaschema one schema object at a time (see metaschema_node_schema), so deeply
+# nested specs do not exhaust the recursion limit.
+SCHEMA_VALUED_KEYS = ("spec", "metadata")
+
 # Main schema
 yaml_schema = {
     "$schema": "https://json-schema.org/draft-07/schema#",
@@ -13,7 +18,7 @@ yaml_schema = {
             "type": "array",
             "items": {"type": "string", "enum": ["aws", "azure", "gcp", "kubernetes"]},
         },
-        "spec": Draft7Validator.META_SCHEMA,  # Use the nested object schema
+        "spec": {},  # checked against the metaschema, see SCHEMA_VALUED_KEYS
         "outputs": {
             "type": "object",
             "patternProperties": {
@@ -93,7 +98,7 @@ yaml_schema = {
             },
             "required": ["primary"],
         },
-        "metadata": Draft7Validator.META_SCHEMA,
+        "metadata": {},  # checked against the metaschema, see SCHEMA_VALUED_KEYS
         "iac": {
             "type": "object",
             "properties": {
@@ -112,6 +117,26 @@ yaml_schema = {
     "required": ["intent", "flavor", "version", "description", "spec", "clouds"],
 }
 
+
+def _without_subschemas(node):
+    if node == {"$ref": "#"}:
+        return {"type": ["object", "boolean"]}
+    if isinstance(node, dict):
+        return {key: _without_subschemas(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_without_subschemas(value) for value in node]
+    return node
+
+
+# The draft-07 metaschema for a single schema object: subschemas are only checked to be
+# objects or booleans, not validated in turn.
+metaschema_node_schema = {
+    key: _without_subschemas(value) for key, value in Draft7Validator.META_SCHEMA.items() if key != "$id"
+}
+
+# Keys of a spec field under which nested objects are validated as specs again
+NESTED_SPEC_KEY_PATTERN = "^(?!x-ui).*"
+
 # Define a separate schema for the `spec` field
 spec_schema = {
     "$schema": "http://json-schema.org/draft-07/schema#",
@@ -162,11 +187,14 @@ spec_schema = {
     },
     "additionalProperties": {
         "patternProperties": {
-            "^(?!x-ui).*": {"if": {"type": "object"}, "then": {"$ref": "#"}, "else": {}}
+            NESTED_SPEC_KEY_PATTERN: {"if": {"type": "object"}, "then": {"$ref": "#"}, "else": {}}
         }
     },
 }
 
+# `spec_schema` for a single spec object, without descending into nested objects
+spec_node_schema = {key: value for key, value in spec_schema.items() if key != "additionalProperties"}
+
 additional_properties_schema = {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "type": "object",
@@ -174,7 +202,7 @@ additional_properties_schema = {
     "not": {"required": ["additionalProperties"]},
     "additionalProperties": {
         "patternProperties": {
-            "^(?!x-ui).*": {"if": {"type": "object"}, "then": {"$ref": "#"}, "else": {}}
+            NESTED_SPEC_KEY_PATTERN: {"if": {"type": "object"}, "then": {"$ref": "#"}, "else": {}}
         }
     },
 }
@@ -0,0 +1,310 @@
+"""Local `ftf serve` daemon and the thin client that forwards commands to it.
+
+A long-lived process keeps checkov, the HCL grammars and the JSON schema
+validators loaded, so editor integrations and pre-commit hooks that call
+`ftf validate-facets` / `ftf validate-directory` many times a minute skip the
+interpreter and import warm-up. The client side of this module is imported on
+every `ftf` invocation and must stay free of heavy imports.
+
+Protocol: newline-delimited JSON over a Unix socket. The client sends one
+request; the server streams ``{"stream": "stdout"|"stderr", "data": ...}``
+frames and finishes with ``{"exit_code": N}``.
+
+Requests carry the client's ftf-cli version and a digest of its package
+files. A server whose code no longer matches them, e.g. after
+`pip install -U ftf-cli` or an edit to an editable install, refuses the
+request and stops, and the client runs the command in-process.
+"""
+import io
+import json
+import os
+import socket
+import sys
+
+PROTOCOL_VERSION = 1
+SOCKET_ENV = "FTF_SERVER_SOCKET"
+DISABLE_ENV = "FTF_NO_SERVER"
+
+# Only commands that never prompt are forwarded; everything else runs in-process.
+FORWARDED_COMMANDS = {"validate-facets", "validate-directory", "get-resources"}
+
+
+def get_socket_path():
+    """Return the socket path from FTF_SERVER_SOCKET, defaulting to ~/.facets/ftf.sock."""
+    return os.environ.get(SOCKET_ENV) or os.path.expanduser("~/.facets/ftf.sock")
+
+
+def _package_dir():
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def _package_identity():
+    """Return the ftf-cli version and a digest of the package files, which client and server must share."""
+    from ftf_cli import cache
+
+    package_files = []
+    for dirpath, dirnames, filenames in os.walk(_package_dir()):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        package_files.extend(os.path.join(dirpath, filename) for filename in sorted(filenames))
+    return {"version": cache.cli_version(), "source": cache.source_digest(*package_files)}
+
+
+def _send(conn, message):
+    conn.write(json.dumps(message).encode() + b"\n")
+    conn.flush()
+
+
+def forward(argv, stdout=None, stderr=None, socket_path=None):
+    """Run a command on a running `ftf serve` daemon.
+
+    Args:
+        argv: Command line arguments, without the program name
+        stdout: Text stream for the command's standard output (default sys.stdout)
+        stderr: Text stream for the command's standard error (default sys.stderr)
+        socket_path: Socket to connect to (default get_socket_path())
+
+    Returns:
+        int: The command's exit code, or None if the command should run in-process
+        (not forwardable, no server running, or an incompatible server).
+    """
+    if os.environ.get(DISABLE_ENV) or not hasattr(socket, "AF_UNIX"):
+        return None
+    if not argv or argv[0] not in FORWARDED_COMMANDS:
+        return None
+
+    path = socket_path or get_socket_path()
+    if not os.path.exists(path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    with sock, sock.makefile("rwb") as conn:
+        _send(
+            conn,
+            {
+                "op": "run",
+                "protocol": PROTOCOL_VERSION,
+                "package": _package_dir(),
+                **_package_identity(),
+                "argv": list(argv),
+                "cwd": os.getcwd(),
+                "env": dict(os.environ),
+            },
+        )
+        for line in conn:
+            message = json.loads(line)
+            if "stream" in message:
+                target = stdout if message["stream"] == "stdout" else stderr
+                target.write(message["data"])
+                target.flush()
+            elif "exit_code" in message:
+                return message["exit_code"]
+            elif "error" in message:
+                # The server refused the request before running anything.
+                if message.get("stopped"):
+                    stderr.write(f"Note: {message['error']}; run `ftf serve` to start it again.\n")
+                return None
+
+    stderr.write("Error: ftf server closed the connection before the command finished.\n")
+    return 1
+
+
+def stop(socket_path=None):
+    """Ask a running server to shut down. Returns True if a server was stopped."""
+    path = socket_path or get_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            with sock.makefile("rwb") as conn:
+                _send(conn, {"op": "shutdown", "protocol": PROTOCOL_VERSION, "package": _package_dir()})
+                return json.loads(conn.readline() or b"{}").get("ok", False)
+    except OSError:
+        return False
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that relays everything written to it as frames to the client."""
+
+    def __init__(self, conn, stream):
+        super().__init__()
+        self._conn = conn
+        self._stream = stream
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    @property
+    def errors(self):
+        return "strict"
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return False
+
+    def write(self, data):
+        if not isinstance(data, str):
+            # Makes click treat this as a text stream rather than a binary one.
+            raise TypeError(f"write() argument must be str, not {type(data).__name__}")
+        if data:
+            _send(self._conn, {"stream": self._stream, "data": data})
+        return len(data)
+
+
+def _exit_code(code):
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    sys.stderr.write(f"{code}\n")
+    return 1
+
+
+def _run_request(request, conn):
+    """Run a forwarded command with the client's cwd, environment and output streams."""
+    import contextlib
+    import traceback
+    from ftf_cli import module
+    from ftf_cli.cli import cli
+    from ftf_cli.terraform import find_terraform
+    from ftf_cli.utils import resolve_default_profile
+
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    saved_stdin = sys.stdin
+    try:
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        resolve_default_profile.cache_clear()
+        # Found with the client's PATH, so a terraform installed since the server started is used.
+        find_terraform.cache_clear()
+        # Files are cached per command; a daemon-wide cache would only grow and could serve
+        # a file rewritten with the same size within one mtime tick.
+        module.clear()
+        # Forwarded commands are non-interactive; any prompt sees EOF and aborts.
+        sys.stdin = io.StringIO()
+        with contextlib.redirect_stdout(_FrameWriter(conn, "stdout")), contextlib.redirect_stderr(
+            _FrameWriter(conn, "stderr")
+        ):
+            try:
+                cli.main(args=request["argv"], prog_name="ftf")
+                return 0
+            except SystemExit as e:
+                return _exit_code(e.code)
+            except Exception:
+                traceback.print_exc()
+                return 1
+    finally:
+        sys.stdin = saved_stdin
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+        resolve_default_profile.cache_clear()
+        find_terraform.cache_clear()
+        module.clear()
+
+
+def warm_up():
+    """Import and build everything the forwarded commands need up front."""
+    import hcl  # noqa: F401  (builds the lark grammars)
+    import hcl2  # noqa: F401
+    import jsonschema  # noqa: F401
+    from checkov.terraform.runner import Runner  # noqa: F401
+    from ftf_cli.cli import cli
+    from ftf_cli import validation
+
+    validation.warm_up()
+
+    for command_name in FORWARDED_COMMANDS:
+        cli.get_command(None, command_name)
+
+
+def serve(socket_path=None, idle_timeout=0, warm=True, on_ready=None):
+    """Serve forwarded commands on a Unix socket until stopped.
+
+    Args:
+        socket_path: Socket to listen on (default get_socket_path())
+        idle_timeout: Stop after this many seconds without a request; 0 runs forever
+        warm: Pre-import heavy dependencies before accepting requests
+        on_ready: Optional callable invoked with the socket path once listening
+
+    Raises:
+        click.UsageError: If Unix sockets are unavailable or a server is already running
+    """
+    import socketserver
+    import click
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise click.UsageError("❌ ftf serve requires Unix domain sockets, which this platform does not support.")
+
+    path = socket_path or get_socket_path()
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+            except OSError:
+                os.remove(path)  # stale socket left by a server that did not shut down cleanly
+            else:
+                raise click.UsageError(f"❌ An ftf server is already running on {path}.")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    identity = _package_identity()
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            request = json.loads(line)
+            if request.get("protocol") != PROTOCOL_VERSION or request.get("package") != _package_dir():
+                _send(self.wfile, {"error": "incompatible ftf server"})
+                return
+            if request.get("op") == "shutdown":
+                self.server.stop_requested = True
+                _send(self.wfile, {"ok": True})
+                return
+            if any(request.get(name) != value for name, value in identity.items()):
+                # The installed package changed since this server loaded it.
+                self.server.stop_requested = True
+                _send(self.wfile, {"error": "ftf server was running outdated code and has stopped", "stopped": True})
+                return
+            _send(self.wfile, {"exit_code": _run_request(request, self.wfile)})
+
+    class Server(socketserver.UnixStreamServer):
+        stop_requested = False
+
+        def handle_timeout(self):
+            self.stop_requested = True
+
+    # Only the current user may connect: the server runs commands with the client's environment.
+    old_umask = os.umask(0o177)
+    try:
+        server = Server(path, RequestHandler)
+    finally:
+        os.umask(old_umask)
+
+    server.timeout = idle_timeout or None
+    try:
+        if warm:
+            warm_up()
+        click.echo(f"✅ ftf server listening on {path}")
+        if on_ready:
+            on_ready(path)
+        while not server.stop_requested:
+            server.handle_request()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.remove(path)
+    click.echo("ftf server stopped.")
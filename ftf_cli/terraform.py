@@ -0,0 +1,289 @@
+"""Terraform binary discovery and the shared provider plugin cache for `terraform init`.
+
+`find_terraform` resolves the terraform binary once per process, and its
+version once per installed binary, for every code path that runs terraform.
+
+Every module is initialised with the same ``TF_PLUGIN_CACHE_DIR`` (default
+``~/.facets/terraform/plugin-cache``), so a provider is downloaded once and
+reused across modules and runs instead of being stored in each module's
+`.terraform` (which is left out of the uploaded archive). Providers can
+instead be installed from a local filesystem mirror (see `terraform providers
+mirror`).
+
+Terraform does not make the plugin cache safe for concurrent use, so `init`
+runs are serialised across processes with a lock file next to the cache.
+
+After a successful init, a fingerprint of the module's provider and module
+requirements is stored in `.terraform`, so init can be skipped while they and
+the installed providers are unchanged.
+"""
+import contextlib
+import functools
+import hashlib
+import os
+from collections import namedtuple
+
+PLUGIN_CACHE_DIR_ENV = "TF_PLUGIN_CACHE_DIR"
+PROVIDER_MIRROR_ENV = "FTF_PROVIDER_MIRROR"
+
+Terraform = namedtuple("Terraform", ["path", "version"])
+
+
+@functools.lru_cache(maxsize=None)
+def find_terraform():
+    """Locate the terraform binary on PATH without going through a shell.
+
+    The binary's version is cached on disk (see ftf_cli.cache) keyed on its path,
+    size and mtime, so `terraform version` only runs again after an upgrade.
+
+    Returns:
+        Terraform: path and version of the binary, or None if it is missing or does not run.
+    """
+    import re
+    import shutil
+    import subprocess
+    from ftf_cli import cache
+
+    path = shutil.which("terraform")
+    if not path:
+        return None
+    path = os.path.realpath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = cache.make_key(path, str(stat.st_size), str(stat.st_mtime_ns))
+    entry = cache.load("terraform", key)
+    if entry is not None:
+        return Terraform(path, entry["version"])
+
+    try:
+        process = subprocess.run(
+            [path, "version"],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "CHECKPOINT_DISABLE": "1"},  # no online update check
+        )
+    except OSError:
+        return None
+    if process.returncode != 0:
+        return None
+    match = re.search(r"Terraform v(\S+)", process.stdout)
+    version = match.group(1) if match else None
+    cache.store("terraform", key, {"version": version})
+    return Terraform(path, version)
+
+
+def require_terraform():
+    """Return the path of the terraform binary, raising a UsageError if it is not installed."""
+    terraform = find_terraform()
+    if terraform is None:
+        import click
+
+        raise click.UsageError(
+            "❌ Terraform is not installed. Please install Terraform to continue."
+        )
+    return terraform.path
+
+
+def get_plugin_cache_dir():
+    """Return the plugin cache from TF_PLUGIN_CACHE_DIR, defaulting to ~/.facets/terraform/plugin-cache."""
+    return os.environ.get(PLUGIN_CACHE_DIR_ENV) or os.path.expanduser(
+        "~/.facets/terraform/plugin-cache"
+    )
+
+
+def init_env(provider_mirror=None):
+    """Return the environment for `terraform init` using the shared plugin cache.
+
+    Args:
+        provider_mirror: Directory to install all providers from instead of their
+            registries (default: environment variable FTF_PROVIDER_MIRROR, if set)
+    """
+    env = dict(os.environ)
+    cache_dir = os.path.abspath(get_plugin_cache_dir())
+    os.makedirs(cache_dir, exist_ok=True)
+    env[PLUGIN_CACHE_DIR_ENV] = cache_dir
+    # Modules are uploaded without .terraform.lock.hcl, and without a lock file
+    # Terraform >= 1.4 would bypass the cache and download every provider again.
+    env.setdefault("TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE", "true")
+
+    provider_mirror = provider_mirror or os.environ.get(PROVIDER_MIRROR_ENV)
+    if provider_mirror:
+        env["TF_CLI_CONFIG_FILE"] = write_mirror_config(provider_mirror)
+    return env
+
+
+def write_mirror_config(provider_mirror):
+    """Write a Terraform CLI config installing providers only from a filesystem mirror; return its path."""
+    mirror = os.path.abspath(provider_mirror)
+    if not os.path.isdir(mirror):
+        import click
+
+        raise click.UsageError(f"❌ Provider mirror {mirror} is not a directory.")
+
+    config = (
+        "provider_installation {\n"
+        "  filesystem_mirror {\n"
+        f"    path = {_hcl_string(mirror)}\n"
+        "  }\n"
+        "}\n"
+    )
+    config_dir = os.path.dirname(os.path.abspath(get_plugin_cache_dir()))
+    config_path = os.path.join(
+        config_dir, f"mirror-{hashlib.sha256(mirror.encode()).hexdigest()[:16]}.tfrc"
+    )
+    if not os.path.exists(config_path):
+        tmp_path = f"{config_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(config)
+        os.replace(tmp_path, config_path)
+    return config_path
+
+
+def _hcl_string(value):
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+@contextlib.contextmanager
+def plugin_cache_lock():
+    """Hold an exclusive lock on the plugin cache, e.g. while running `terraform init`."""
+    try:
+        import fcntl
+    except ImportError:  # Windows: no advisory locks, run unserialised
+        yield
+        return
+
+    cache_dir = os.path.abspath(get_plugin_cache_dir())
+    os.makedirs(os.path.dirname(cache_dir), exist_ok=True)
+    with open(f"{cache_dir}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+INIT_FINGERPRINT_FILE = "ftf-init-fingerprint"
+
+
+def init_fingerprint(path, provider_mirror=None):
+    """Return a digest of everything `terraform init -backend=false` depends on in path.
+
+    Covers the terraform blocks (required_providers, required_version), provider
+    blocks, the providers implied by resource and data types, module sources and
+    versions (following local module sources), the dependency lock file and the
+    provider installation settings. Edits to variables, outputs or resource
+    arguments leave it unchanged.
+    """
+    import json
+
+    requirements = {}
+    _collect_init_requirements(os.path.abspath(path), requirements)
+
+    lock_file = os.path.join(path, ".terraform.lock.hcl")
+    if os.path.isfile(lock_file):
+        with open(lock_file, "rb") as f:
+            requirements["lock_file"] = hashlib.sha256(f.read()).hexdigest()
+    provider_mirror = provider_mirror or os.environ.get(PROVIDER_MIRROR_ENV)
+    requirements["provider_mirror"] = os.path.abspath(provider_mirror) if provider_mirror else None
+
+    return hashlib.sha256(json.dumps(requirements, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _collect_init_requirements(module_dir, requirements):
+    """Add the init-relevant parts of the module in module_dir, and of its local modules, to requirements."""
+    from ftf_cli.module import Module
+
+    if module_dir in requirements:
+        return
+    module = requirements[module_dir] = {
+        "terraform": [],
+        "providers": set(),
+        "modules": {},
+        "json_files": {},
+    }
+    local_sources = []
+    files = Module(module_dir)
+
+    for filename in sorted(os.listdir(module_dir)):
+        file_path = os.path.join(module_dir, filename)
+        if filename.endswith(".tf.json"):
+            # Not parsed: any change to a JSON configuration file counts.
+            with open(file_path, "rb") as f:
+                module["json_files"][filename] = hashlib.sha256(f.read()).hexdigest()
+            continue
+        if not filename.endswith(".tf") or not os.path.isfile(file_path):
+            continue
+
+        parsed = files.load_hcl2(filename)
+
+        module["terraform"].extend(_strip_positions(block) for block in parsed.get("terraform", []))
+        for block in parsed.get("provider", []):
+            module["providers"].update(block)
+        for block_type in ("resource", "data"):
+            for block in parsed.get(block_type, []):
+                # The provider local name is the resource type's prefix, e.g. aws_s3_bucket -> aws.
+                module["providers"].update(resource_type.split("_")[0] for resource_type in block)
+        for block in parsed.get("module", []):
+            for name, body in block.items():
+                source = _first(body.get("source"))
+                module["modules"][name] = {"source": source, "version": _first(body.get("version"))}
+                if isinstance(source, str) and source.startswith(("./", "../")):
+                    local_sources.append(os.path.normpath(os.path.join(module_dir, source)))
+
+    module["providers"] = sorted(module["providers"])
+    for source_dir in local_sources:
+        if os.path.isdir(source_dir):
+            _collect_init_requirements(source_dir, requirements)
+
+
+def _first(value):
+    return value[0] if isinstance(value, list) and value else value
+
+
+def _strip_positions(value):
+    """Drop the line number bookkeeping hcl2 adds to parsed blocks."""
+    if isinstance(value, dict):
+        return {k: _strip_positions(v) for k, v in value.items() if not k.startswith("__")}
+    if isinstance(value, list):
+        return [_strip_positions(v) for v in value]
+    return value
+
+
+def is_initialized(path, fingerprint):
+    """Return True if path's .terraform was created by an init with this fingerprint and is intact."""
+    import json
+
+    terraform_dir = os.path.join(path, ".terraform")
+    try:
+        with open(os.path.join(terraform_dir, INIT_FINGERPRINT_FILE), "r") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if record.get("fingerprint") != fingerprint:
+        return False
+    if not all(os.path.exists(os.path.join(terraform_dir, p)) for p in record.get("requires", [])):
+        return False
+
+    # Installed providers are links into the plugin cache; all of them must still resolve.
+    for dirpath, dirnames, filenames in os.walk(os.path.join(terraform_dir, "providers")):
+        for name in dirnames + filenames:
+            if not os.path.exists(os.path.join(dirpath, name)):
+                return False
+    return True
+
+
+def record_init(path, fingerprint):
+    """Record the fingerprint of a successful init in path's .terraform directory."""
+    import json
+
+    terraform_dir = os.path.join(path, ".terraform")
+    os.makedirs(terraform_dir, exist_ok=True)
+    requires = [
+        p for p in ("providers", os.path.join("modules", "modules.json"))
+        if os.path.exists(os.path.join(terraform_dir, p))
+    ]
+    with open(os.path.join(terraform_dir, INIT_FINGERPRINT_FILE), "w") as f:
+        json.dump({"fingerprint": fingerprint, "requires": requires}, f)
@@ -1,22 +1,20 @@
 import os
 import configparser
-from subprocess import run
-from lark import Token, Tree
+import functools
 import yaml
-import jsonschema
-from jsonschema import validate
 import click
-import hcl2
-import requests
-import hcl
-import glob
 import re
 import sys
-from ftf_cli.schema import yaml_schema, spec_schema, additional_properties_schema
 
 ALLOWED_TYPES = ["string", "number", "boolean", "enum"]
 REQUIRED_TF_FACETS_VARS = ["instance", "instance_name", "environment", "inputs"]
 
+# Sources defining the facets.yaml / variables.tf rules; cached verdicts are keyed on their contents
+VALIDATION_RULE_FILES = tuple(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in ("schema.py", "validation.py", "utils.py")
+)
+
 
 def parse_namespace_and_name(output_type):
     """Parse output_type into namespace and name components.
@@ -39,37 +37,74 @@ def parse_namespace_and_name(output_type):
     return match.group(1), match.group(2)
 
 
-def validate_facets_yaml(path, filename="facets.yaml"):
-    """Validate the existence and format of specified facets yaml file in the given path."""
+def _validation_cache_key(file_path, content):
+    """Cache key for a validation verdict: file path and content, CLI version and the validation rules."""
+    from ftf_cli import cache
+
+    return cache.make_key(
+        file_path, content, cache.cli_version(), cache.source_digest(*VALIDATION_RULE_FILES)
+    )
+
+
+def validate_facets_yaml(path, filename="facets.yaml", use_cache=True):
+    """Validate the existence and format of specified facets yaml file in the given path.
+
+    The verdict is cached by file content (see ftf_cli.cache); pass use_cache=False to re-validate.
+    """
+    from ftf_cli import cache
+    from ftf_cli.module import Module
+
     yaml_path = os.path.join(path, filename)
     if not os.path.isfile(yaml_path):
         raise click.UsageError(
             f"❌ {filename} file does not exist at {os.path.abspath(yaml_path)}"
         )
+    module = Module(path)
 
-    try:
-        with open(yaml_path, "r") as f:
-            data = yaml.safe_load(f)
+    def check():
+        try:
+            data = module.load_yaml(filename)
             validate_yaml(data)
 
-    except yaml.YAMLError as exc:
-        raise click.UsageError(f"❌ {filename} is not a valid YAML file: {exc}")
+        except yaml.YAMLError as exc:
+            raise click.UsageError(f"❌ {filename} is not a valid YAML file: {exc}")
+
+    key = _validation_cache_key(yaml_path, module.read(filename))
+    cache.cached_check("facets_yaml", key, check, use_cache=use_cache)
 
     return yaml_path
 
 
-def validate_facets_tf_vars(path, filename="variables.tf"):
-    """Validate the existence and format of specified facets tf vars file in the given path."""
+def validate_facets_tf_vars(path, filename="variables.tf", use_cache=True):
+    """Validate the existence and format of specified facets tf vars file in the given path.
+
+    The verdict is cached by file content (see ftf_cli.cache); pass use_cache=False to re-validate.
+    """
+    from ftf_cli import cache
+    from ftf_cli.module import Module
+
     variables_tf_path = os.path.join(path, filename)
     if not os.path.isfile(variables_tf_path):
         raise click.UsageError(
             f"❌ {filename} file does not exist at {os.path.abspath(variables_tf_path)}"
         )
 
+    key = _validation_cache_key(variables_tf_path, Module(path).read(filename))
+    cache.cached_check(
+        "tf_vars", key, lambda: _check_facets_tf_vars(variables_tf_path, filename), use_cache=use_cache
+    )
+
+    return variables_tf_path
+
+
+def _check_facets_tf_vars(variables_tf_path, filename):
+    from lark import Token, Tree
+    from ftf_cli.module import Module
+
     try:
-        terraform_start_node: Tree = None
-        with open(variables_tf_path, "r") as file:
-            terraform_start_node = hcl.parse(file)
+        terraform_start_node: Tree = Module(os.path.dirname(variables_tf_path)).parse_hcl(
+            os.path.basename(variables_tf_path)
+        )
 
         body_node: Tree = terraform_start_node.children[0]
         child_nodes = body_node.children
@@ -109,8 +144,6 @@ def validate_facets_tf_vars(path, filename="variables.tf"):
     except Exception as e:
         raise click.UsageError(f"❌ {filename} is not a valid HCL file: {e}")
 
-    return variables_tf_path
-
 
 def generate_output_tree(obj):
     """Generate a JSON schema from a outputs.tf file."""
@@ -242,18 +275,19 @@ def transform_output_tree(tree, level=1):
 
 def load_facets_yaml(path):
     """Load and validate facets.yaml file, returning its content as an object."""
+    from ftf_cli.module import Module
+
     # Validate the facets.yaml file
-    yaml_path = validate_facets_yaml(path)
+    validate_facets_yaml(path)
 
     # Load YAML content
-    with open(yaml_path, "r") as file:
-        content = yaml.safe_load(file)
-
-    return content
+    return Module(path).load_yaml()
 
 
 def validate_variables_tf(path):
     """Ensure variables.tf exists and is valid HCL."""
+    from ftf_cli.module import Module
+
     variables_tf_path = os.path.join(path, "variables.tf")
     if not os.path.isfile(variables_tf_path):
         raise click.UsageError(
@@ -261,8 +295,7 @@ def validate_variables_tf(path):
         )
 
     try:
-        with open(variables_tf_path, "r") as f:
-            hcl2.load(f)
+        Module(path).load_hcl2("variables.tf")
     except Exception as e:
         raise click.UsageError(f"❌ variables.tf is not a valid HCL file: {e}")
 
@@ -284,8 +317,13 @@ def update_spec_variable(
     terraform_file_path: str,
     instance_description: str,
 ):
-    with open(terraform_file_path, "r") as file:
-        terraform_code = file.read()
+    import hcl
+    from lark import Token, Tree
+    from ftf_cli.module import Module
+
+    terraform_code = Module(os.path.dirname(terraform_file_path)).read(
+        os.path.basename(terraform_file_path)
+    )
 
     spec = {"spec": yaml_file.get("spec", {})}
     type_tree = generate_type_tree(spec)
@@ -325,52 +363,110 @@ def update_spec_variable(
         ].children[0]
 
     with open(terraform_file_path, "w") as file:
-        new_content = hcl.writes(start_node)
-        file.write(new_content)
-        ensure_formatting_for_object(terraform_file_path)
+        file.write(format_terraform(hcl.writes(start_node)))
+
+
+def _walk_spec(spec_obj, path="spec"):
+    """
+    Iterate over every object-valued field in spec, depth first and without recursion.
+    Yields (path, key, value, keys) in the order a recursive walk would visit the fields,
+    where path is the dotted path of the field's parent and keys the tuple of keys leading
+    from spec_obj to value.
+    """
+    if not isinstance(spec_obj, dict):
         return
 
+    stack = [(path, (), iter(spec_obj.items()))]
+    while stack:
+        parent_path, parent_keys, items = stack[-1]
+        for key, value in items:
+            if isinstance(value, dict):
+                keys = parent_keys + (key,)
+                yield parent_path, key, value, keys
+                stack.append((f"{parent_path}.{key}", keys, iter(value.items())))
+                break
+        else:
+            stack.pop()
+
+
+def _array_or_invalid_pattern_error(path, key, value):
+    """Return the UsageError for an array or invalid patternProperties field, or None."""
+    field_type = value.get("type")
+    override_disable_flag = value.get("x-ui-override-disable", False)
+    overrides_only_flag = value.get("x-ui-overrides-only", False)
+    if field_type == "array" and not override_disable_flag and not overrides_only_flag:
+        return click.UsageError(
+            f"Invalid array type found at {path}.{key}. "
+            f"Arrays without x-ui-override-disable or x-ui-overrides-only field are not allowed in spec. Use patternProperties for array-like structures instead or set either x-ui-override-disable or x-ui-overrides-only field to true."
+        )
+    if "patternProperties" in value:
+        pp = value["patternProperties"]
+        parent_has_yaml_editor = value.get("x-ui-yaml-editor", False)
+        for pattern_key, pp_val in pp.items():
+            pattern_type = pp_val.get("type")
+            if not isinstance(pattern_type, str) or (pattern_type != "object" and pattern_type != "string"):
+                return click.UsageError(
+                    f'patternProperties at {path}.{key} with pattern "{pattern_key}" must be of type object or string.'
+                )
+            if pattern_type == "string" and not parent_has_yaml_editor:
+                return click.UsageError(
+                    f'patternProperties at {path}.{key} with pattern "{pattern_key}" and type "string" must have x-ui-yaml-editor field set to true.'
+                )
+    return None
+
+
+def _conflicting_ui_properties_error(path, key, value):
+    """Return the UsageError for conflicting UI properties on a field, or None."""
+    # Check for patternProperties + x-ui-yaml-editor conflict based on pattern type
+    has_pattern_properties = "patternProperties" in value
+    has_yaml_editor = value.get("x-ui-yaml-editor", False)
+
+    if has_pattern_properties and has_yaml_editor:
+        # Check the types of all patternProperties
+        pp = value["patternProperties"]
+        for pattern_key, pp_val in pp.items():
+            pattern_type = pp_val.get("type")
+            if pattern_type == "object":
+                return click.UsageError(
+                    f"Configuration conflict at {path}.{key}: "
+                    f"Fields with patternProperties of type 'object' cannot have 'x-ui-yaml-editor: true'. "
+                    f"Use either patternProperties with object type for structured dynamic content "
+                    f"or x-ui-yaml-editor for free-form YAML editing."
+                )
+
+    # Check for x-ui-override-disable + x-ui-overrides-only conflict
+    has_override_disable = value.get("x-ui-override-disable", False)
+    has_overrides_only = value.get("x-ui-overrides-only", False)
+
+    if has_override_disable and has_overrides_only:
+        return click.UsageError(
+            f"Configuration conflict at {path}.{key}: "
+            f"Fields cannot have both 'x-ui-override-disable: true' and 'x-ui-overrides-only: true'. "
+            f"These properties are mutually exclusive - 'x-ui-override-disable' is for fields that "
+            f"cannot be overridden and will only have a default value in the blueprint, while "
+            f"'x-ui-overrides-only' is for fields that cannot have a default value in the blueprint "
+            f"and must be specified at environment level via overrides."
+        )
+    return None
+
 
 def check_no_array_or_invalid_pattern_in_spec(spec_obj, path="spec"):
     """
-    Recursively check that no field in spec is of type 'array'.
+    Check that no field in spec, at any depth, is of type 'array'.
     Also check that any direct patternProperties have object type only, not primitive types like string.
     Nested properties inside patternProperties can be any allowed types.
     Raises a UsageError with instruction if found.
     Assumes input is always valid JSON schema (no direct list values at property keys).
     """
-    if not isinstance(spec_obj, dict):
-        return
-
-    for key, value in spec_obj.items():
-        if isinstance(value, dict):
-            field_type = value.get("type")
-            override_disable_flag = value.get("x-ui-override-disable", False)
-            overrides_only_flag = value.get("x-ui-overrides-only", False)
-            if field_type == "array" and not override_disable_flag and not overrides_only_flag:
-                raise click.UsageError(
-                    f"Invalid array type found at {path}.{key}. "
-                    f"Arrays without x-ui-override-disable or x-ui-overrides-only field are not allowed in spec. Use patternProperties for array-like structures instead or set either x-ui-override-disable or x-ui-overrides-only field to true."
-                )
-            if "patternProperties" in value:
-                pp = value["patternProperties"]
-                parent_has_yaml_editor = value.get("x-ui-yaml-editor", False)
-                for pattern_key, pp_val in pp.items():
-                    pattern_type = pp_val.get("type")
-                    if not isinstance(pattern_type, str) or (pattern_type != "object" and pattern_type != "string"):
-                        raise click.UsageError(
-                            f'patternProperties at {path}.{key} with pattern "{pattern_key}" must be of type object or string.'
-                        )
-                    if pattern_type == "string" and not parent_has_yaml_editor:
-                        raise click.UsageError(
-                            f'patternProperties at {path}.{key} with pattern "{pattern_key}" and type "string" must have x-ui-yaml-editor field set to true.'
-                        )
-            check_no_array_or_invalid_pattern_in_spec(value, path=f"{path}.{key}")
+    for field_path, key, value, _ in _walk_spec(spec_obj, path):
+        error = _array_or_invalid_pattern_error(field_path, key, value)
+        if error:
+            raise error
 
 
 def check_conflicting_ui_properties(spec_obj, path="spec"):
     """
-    Recursively check for conflicting UI properties in spec fields.
+    Check for conflicting UI properties in spec fields at any depth.
 
     Validates that:
     1. patternProperties with object type and x-ui-yaml-editor: true are not both present on the same field
@@ -378,69 +474,88 @@ def check_conflicting_ui_properties(spec_obj, path="spec"):
 
     Raises UsageError with clear error message if conflicts are found.
     """
+    for field_path, key, value, _ in _walk_spec(spec_obj, path):
+        error = _conflicting_ui_properties_error(field_path, key, value)
+        if error:
+            raise error
+
+
+def check_spec(spec_obj):
+    """
+    Apply every spec rule in a single walk over spec_obj.
+
+    Covers the array/patternProperties and conflicting UI property checks as well as
+    `spec_schema` and `additional_properties_schema`, which both re-apply themselves to
+    objects nested under non-x-ui keys of a field. Raises the UsageError of the first
+    failing check, in that order, as running them one after another would.
+
+    Returns:
+        tuple: (best matching `spec_schema` ValidationError or None,
+        whether `additional_properties_schema` fails)
+    """
+    from jsonschema.exceptions import best_match
+    from ftf_cli.schema import NESTED_SPEC_KEY_PATTERN, spec_schema
+    from ftf_cli.validation import get_validator, iter_spec_node_errors
+
     if not isinstance(spec_obj, dict):
-        return
+        return (
+            best_match(get_validator("spec_schema").iter_errors(spec_obj)),
+            not get_validator("additional_properties_schema").is_valid(spec_obj),
+        )
 
-    for key, value in spec_obj.items():
-        if isinstance(value, dict):
-            # Check for patternProperties + x-ui-yaml-editor conflict based on pattern type
-            has_pattern_properties = "patternProperties" in value
-            has_yaml_editor = value.get("x-ui-yaml-editor", False)
-
-            if has_pattern_properties and has_yaml_editor:
-                # Check the types of all patternProperties
-                pp = value["patternProperties"]
-                for pattern_key, pp_val in pp.items():
-                    pattern_type = pp_val.get("type")
-                    if pattern_type == "object":
-                        raise click.UsageError(
-                            f"Configuration conflict at {path}.{key}: "
-                            f"Fields with patternProperties of type 'object' cannot have 'x-ui-yaml-editor: true'. "
-                            f"Use either patternProperties with object type for structured dynamic content "
-                            f"or x-ui-yaml-editor for free-form YAML editing."
-                        )
-
-            # Check for x-ui-override-disable + x-ui-overrides-only conflict
-            has_override_disable = value.get("x-ui-override-disable", False)
-            has_overrides_only = value.get("x-ui-overrides-only", False)
-
-            if has_override_disable and has_overrides_only:
-                raise click.UsageError(
-                    f"Configuration conflict at {path}.{key}: "
-                    f"Fields cannot have both 'x-ui-override-disable: true' and 'x-ui-overrides-only: true'. "
-                    f"These properties are mutually exclusive - 'x-ui-override-disable' is for fields that "
-                    f"cannot be overridden and will only have a default value in the blueprint, while "
-                    f"'x-ui-overrides-only' is for fields that cannot have a default value in the blueprint "
-                    f"and must be specified at environment level via overrides."
-                )
+    x_ui_keywords = spec_schema["properties"]
+    nested_key = re.compile(NESTED_SPEC_KEY_PATTERN)
+
+    conflict_error = None
+    schema_errors = list(iter_spec_node_errors(spec_obj))
+    has_additional_properties = "additionalProperties" in spec_obj
 
-            # Recursively check nested properties
-            check_conflicting_ui_properties(value, path=f"{path}.{key}")
+    # keys of spec objects (and of their fields) -> whether spec_schema also applies;
+    # additional_properties_schema applies to all of them.
+    spec_objects = {(): True}
+    spec_fields = {}
+
+    for path, key, value, keys in _walk_spec(spec_obj):
+        error = _array_or_invalid_pattern_error(path, key, value)
+        if error:
+            raise error
+        if conflict_error is None:
+            conflict_error = _conflicting_ui_properties_error(path, key, value)
+
+        parent_keys = keys[:-1]
+        if parent_keys in spec_objects:
+            spec_fields[keys] = spec_objects[parent_keys] and key not in x_ui_keywords
+        elif parent_keys in spec_fields and nested_key.search(key):
+            spec_objects[keys] = spec_fields[parent_keys]
+            if spec_objects[keys]:
+                schema_errors.extend(iter_spec_node_errors(value, keys))
+            if "additionalProperties" in value:
+                has_additional_properties = True
+
+    if conflict_error:
+        raise conflict_error
+    return best_match(schema_errors), has_additional_properties
 
 
 def validate_yaml(data):
+    import jsonschema
+    from ftf_cli.validation import validate_yaml_schema
+
     spec_obj = data.get("spec")
     try:
-        validate(instance=data, schema=yaml_schema)
-        # Additional check for arrays and invalid patternProperties in spec
-        if spec_obj:
-            check_no_array_or_invalid_pattern_in_spec(spec_obj)
-            check_conflicting_ui_properties(spec_obj)
+        validate_yaml_schema(data)
     except jsonschema.exceptions.ValidationError as e:
         raise click.UsageError(
             f"Validation error in `facets.yaml`: `facets.yaml` is not following Facets Schema: {e}"
         )
 
-    try:
-        validate(instance=spec_obj, schema=spec_schema)
-    except jsonschema.exceptions.ValidationError as e:
+    spec_error, has_additional_properties = check_spec(spec_obj)
+    if spec_error:
         raise click.UsageError(
-            f"Validation error in `facets.yaml`: `x-ui` tags are invalid. Details: {e}"
+            f"Validation error in `facets.yaml`: `x-ui` tags are invalid. Details: {spec_error}"
         )
 
-    try:
-        validate(instance=spec_obj, schema=additional_properties_schema)
-    except jsonschema.exceptions.ValidationError as e:
+    if has_additional_properties:
         raise click.UsageError(
             f"Validation error in `facets.yaml`: Field additionalProperties is not allowed under any object."
         )
@@ -450,7 +565,9 @@ def validate_yaml(data):
 
 
 def fetch_user_details(cp_url, username, token):
-    return requests.get(f"{cp_url}/api/me", auth=(username, token))
+    from ftf_cli.client import ControlPlaneClient
+
+    return ControlPlaneClient(cp_url, username, token).get("/api/me")
 
 
 def store_credentials(profile, credentials):
@@ -491,6 +608,8 @@ def set_default_profile(profile):
     with open(config_path, "w") as configfile:
         config.write(configfile)
 
+    resolve_default_profile.cache_clear()
+
 
 def get_default_profile():
     """Get the default profile from the config file.
@@ -527,7 +646,23 @@ def get_profile_with_priority():
     return get_default_profile()
 
 
+@functools.lru_cache(maxsize=None)
+def resolve_default_profile():
+    """Resolve the profile for commands invoked without --profile.
+
+    Meant to be passed (uncalled) as the click default of --profile options, so
+    ~/.facets/config is only read when a command actually runs without an
+    explicit profile, and at most once per process.
+
+    Returns:
+        str: The profile name to use
+    """
+    return get_profile_with_priority()
+
+
 def is_logged_in(profile):
+    import requests
+
     config = configparser.ConfigParser()
     cred_path = os.path.expanduser("~/.facets/credentials")
 
@@ -588,13 +723,12 @@ def validate_number(value):
         )
 
 
-def ensure_formatting_for_object(file_path):
-    """Ensure there is a newline after 'object({' in the Terraform file."""
-    with open(file_path, "r") as file:
-        lines = file.readlines()
+def format_terraform(content):
+    """Return Terraform source with a newline after each 'object({', formatted like `terraform fmt`."""
+    from ftf_cli.hcl_format import format_hcl
 
     updated_lines = []
-    for line in lines:
+    for line in content.splitlines(keepends=True):
         if "object({" in line or "})" in line:
             # Add a newline after 'object({'
             line = line.replace("object({", "object({\n", -1)
@@ -605,12 +739,13 @@ def ensure_formatting_for_object(file_path):
             updated_lines.append(line)
         else:
             updated_lines.append(line)
+    content = "".join(updated_lines)
 
-    with open(file_path, "w") as file:
-        file.writelines(updated_lines)
-
-    with open(os.devnull, "w") as devnull:
-        run(["terraform", "fmt", file_path], stdout=devnull, stderr=devnull)
+    try:
+        return format_hcl(content)
+    except ValueError:
+        # Like `terraform fmt`, leave source it cannot parse as it is.
+        return content
 
 
 def generate_instance_block(type_tree: dict, description: str) -> str:
@@ -713,10 +848,13 @@ def update_facets_yaml_imports(yaml_path, import_config, mode="interactive"):
         True if a new import was added, "updated" if an existing import was updated,
         False if the operation was canceled or failed
     """
+    from ftf_cli.module import Module
+
+    module = Module(os.path.dirname(yaml_path))
+    yaml_filename = os.path.basename(yaml_path)
     try:
         # Load existing YAML
-        with open(yaml_path, "r") as file:
-            facets_data = yaml.safe_load(file) or {}
+        facets_data = module.load_yaml(yaml_filename) or {}
 
         # Add or update imports section
         if "imports" not in facets_data:
@@ -743,8 +881,7 @@ def update_facets_yaml_imports(yaml_path, import_config, mode="interactive"):
             result = True
 
         # Write updated YAML back to file with custom style
-        with open(yaml_path, "r") as file:
-            original_content = file.read()
+        original_content = module.read(yaml_filename)
 
         # Create properly formatted imports section
         imports_yaml = "imports:\n"
@@ -775,95 +912,204 @@ def update_facets_yaml_imports(yaml_path, import_config, mode="interactive"):
         return False
 
 
-def discover_resources(path: str) -> list[dict]:
+def discover_resources(path: str, jobs=None, use_cache=True) -> list[dict]:
     """Discover all Terraform resources in the module directory.
 
+    Each file's resources are kept in an on-disk index (see ftf_cli.cache) keyed
+    by the file's size and mtime, so only files changed since the last call are
+    parsed; pass use_cache=False to parse every file. Files are parsed in a
+    process pool when there are many of them. A resource declared in more than
+    one file is reported once, for the first file by name.
+
+    Files are read by the resource header scanner (see ftf_cli.hcl_scan), which
+    does not validate expressions outside count and for_each. With
+    use_cache=False every file is fully parsed by python-hcl2 instead, so
+    syntax errors anywhere in a file are found. If any file cannot be parsed,
+    every such file is reported before exiting.
+
     Args:
         path: Path to the module directory
+        jobs: Number of files to parse in parallel. Defaults to the number of CPUs.
+        use_cache: Reuse the resources indexed for unchanged files and use the scanner.
 
     Returns:
         List of discovered resources with their metadata
     """
+    from ftf_cli import cache
+    from ftf_cli.module import Module
+
+    module = Module(path)
+    tf_filenames = module.tf_files()
+    signatures = {}
+    for tf_filename in tf_filenames:
+        stat = os.stat(module.file_path(tf_filename))
+        signatures[tf_filename] = [stat.st_size, stat.st_mtime_ns]
+
+    index_key = _resource_index_key(path)
+    index = (cache.load("resource_index", index_key) or {}) if use_cache else {}
+    file_resources = {
+        tf_filename: index[tf_filename]["resources"]
+        for tf_filename in tf_filenames
+        if index.get(tf_filename, {}).get("signature") == signatures[tf_filename]
+    }
+    changed = [tf_filename for tf_filename in tf_filenames if tf_filename not in file_resources]
+
+    parse_errors = []
+    for tf_filename, resources_in_file, error in _iter_file_resources(path, changed, jobs, not use_cache):
+        if error is not None:
+            parse_errors.append((tf_filename, error))
+        else:
+            file_resources[tf_filename] = resources_in_file
+
+    if changed or set(index) != set(file_resources):
+        cache.store(
+            "resource_index",
+            index_key,
+            {
+                tf_filename: {"signature": signatures[tf_filename], "resources": resources_in_file}
+                for tf_filename, resources_in_file in file_resources.items()
+            },
+        )
+
     resources = []
-    tf_files = glob.glob(os.path.join(path, "*.tf"))
     seen_resources = set()
-    for tf_file in tf_files:
-        try:
-            with open(tf_file, "r") as file:
-                content = hcl2.load(file)
-            if "resource" in content:
-                for resource_block in content["resource"]:
-                    for resource_type, resources_of_type in resource_block.items():
-                        if resource_type.startswith("__") and resource_type.endswith(
-                                "__"
-                        ):
-                            continue
-                        for resource_name, resource_config in resources_of_type.items():
-                            if resource_name.startswith(
-                                    "__"
-                            ) and resource_name.endswith("__"):
-                                continue
-                            resource_address = f"{resource_type}.{resource_name}"
-                            if resource_address in seen_resources:
-                                continue
-                            seen_resources.add(resource_address)
-                            has_count = False
-                            has_for_each = False
-                            count_value = None
-                            for_each_value = None
-                            if isinstance(resource_config, dict):
-                                if "count" in resource_config:
-                                    has_count = True
-                                    count_value = resource_config["count"]
-                                if "for_each" in resource_config:
-                                    has_for_each = True
-                                    for_each_value = resource_config["for_each"]
-                            elif isinstance(resource_config, list) and resource_config:
-                                first_item = resource_config[0]
-                                if isinstance(first_item, dict):
-                                    if "count" in first_item:
-                                        has_count = True
-                                        count_value = first_item["count"]
-                                    if "for_each" in first_item:
-                                        has_for_each = True
-                                        for_each_value = first_item["for_each"]
-                            if has_count:
-                                resources.append(
-                                    {
-                                        "address": f"{resource_address}",
-                                        "display": f"{resource_address} (with count)",
-                                        "indexed": True,
-                                        "index_type": "count",
-                                        "value": count_value,
-                                        "source_file": os.path.basename(tf_file),
-                                    }
-                                )
-                            elif has_for_each:
-                                resources.append(
-                                    {
-                                        "address": f"{resource_address}",
-                                        "display": f"{resource_address} (with for_each)",
-                                        "indexed": True,
-                                        "index_type": "for_each",
-                                        "value": for_each_value,
-                                        "source_file": os.path.basename(tf_file),
-                                    }
-                                )
-                            else:
-                                resources.append(
-                                    {
-                                        "address": resource_address,
-                                        "display": resource_address,
-                                        "indexed": False,
-                                        "source_file": os.path.basename(tf_file),
-                                    }
-                                )
-        except Exception as e:
-            click.echo(f"⚠️ Could not parse {tf_file}: {e}")
-            click.echo(f"Error details: {str(e)}")
-            sys.exit(1)
+    for tf_filename in tf_filenames:
+        for resource in file_resources.get(tf_filename, []):
+            if resource["address"] not in seen_resources:
+                seen_resources.add(resource["address"])
+                resources.append(resource)
+
+    if parse_errors:
+        for tf_filename, error in parse_errors:
+            click.echo(f"⚠️ Could not parse {os.path.join(path, tf_filename)}: {error}")
+        sys.exit(1)
     return sorted(resources, key=lambda r: r["address"])
 
+
+def _resource_index_key(path):
+    """Cache key for a module's resource index: its directory, the CLI version and the discovery code.
+
+    The discovery code is this module, the resource scanner and the module file
+    cache whose python-hcl2 parses the scanner falls back to.
+    """
+    from ftf_cli import cache, hcl_scan, module
+
+    return cache.make_key(
+        os.path.abspath(path),
+        cache.cli_version(),
+        cache.source_digest(
+            os.path.abspath(__file__), os.path.abspath(hcl_scan.__file__), os.path.abspath(module.__file__)
+        ),
+    )
+
+
+PARALLEL_PARSE_MIN_FILES = 8
+
+
+def _iter_file_resources(path, tf_filenames, jobs=None, full_parse=False):
+    """Yield (filename, resources, error) for each file in order, parsing in a process pool if worthwhile."""
+    jobs = min(jobs or os.cpu_count() or 1, len(tf_filenames))
+    if jobs <= 1 or len(tf_filenames) < PARALLEL_PARSE_MIN_FILES:
+        for tf_filename in tf_filenames:
+            yield _file_resources(path, tf_filename, full_parse)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(
+            _file_resources,
+            [path] * len(tf_filenames),
+            tf_filenames,
+            [full_parse] * len(tf_filenames),
+            chunksize=max(1, len(tf_filenames) // (jobs * 4)),
+        )
+
+
+def _file_resources(path, tf_filename, full_parse=False):
+    """Return (tf_filename, resources declared in the file, None), or (tf_filename, None, error message).
+
+    The file is read by the resource header scanner unless full_parse is set or the scanner cannot
+    read it, in which case it is parsed (and validated) by python-hcl2.
+    """
+    from ftf_cli.hcl_scan import AmbiguousSource, scan_resources
+    from ftf_cli.module import Module
+
+    module = Module(path)
+    try:
+        if full_parse:
+            declared = _declared_resources(module.load_hcl2(tf_filename))
+        else:
+            try:
+                declared = scan_resources(module.read(tf_filename))
+            except AmbiguousSource:
+                declared = _declared_resources(module.load_hcl2(tf_filename))
+    except Exception as e:
+        return tf_filename, None, str(e)
+
+    resources = []
+    for resource_type, resource_name, meta_arguments in declared:
+        if resource_type.startswith("__") and resource_type.endswith("__"):
+            continue
+        if resource_name.startswith("__") and resource_name.endswith("__"):
+            continue
+        resource_address = f"{resource_type}.{resource_name}"
+        if "count" in meta_arguments:
+            resources.append(
+                {
+                    "address": f"{resource_address}",
+                    "display": f"{resource_address} (with count)",
+                    "indexed": True,
+                    "index_type": "count",
+                    "value": meta_arguments["count"],
+                    "source_file": tf_filename,
+                }
+            )
+        elif "for_each" in meta_arguments:
+            resources.append(
+                {
+                    "address": f"{resource_address}",
+                    "display": f"{resource_address} (with for_each)",
+                    "indexed": True,
+                    "index_type": "for_each",
+                    "value": meta_arguments["for_each"],
+                    "source_file": tf_filename,
+                }
+            )
+        else:
+            resources.append(
+                {
+                    "address": resource_address,
+                    "display": resource_address,
+                    "indexed": False,
+                    "source_file": tf_filename,
+                }
+            )
+    return tf_filename, resources, None
+
+
+def _declared_resources(content):
+    """Return (type, name, meta-arguments) for each resource in a file parsed by python-hcl2."""
+    declared = []
+    for resource_block in content.get("resource", []):
+        for resource_type, resources_of_type in resource_block.items():
+            if not isinstance(resources_of_type, dict):
+                continue  # e.g. the __start_line__ python-hcl2 adds to blocks
+            for resource_name, resource_config in resources_of_type.items():
+                if isinstance(resource_config, list) and resource_config:
+                    resource_config = resource_config[0]
+                if not isinstance(resource_config, dict):
+                    resource_config = {}
+                declared.append(
+                    (
+                        resource_type,
+                        resource_name,
+                        {name: resource_config[name] for name in ("count", "for_each") if name in resource_config},
+                    )
+                )
+    return declared
+
+
 def transform_properties_to_terraform(properties_obj, level=1):
     """
     Transform JSON Schema properties directly to Terraform-compatible schema.
@@ -0,0 +1,153 @@
+"""Precompiled JSON schema validators for `facets.yaml`.
+
+`jsonschema.validate()` checks the schema against its metaschema and builds a
+new validator on every call. The validators here are built, and their schemas
+checked, once per process and then reused by every validation.
+"""
+import functools
+
+# Schemas in ftf_cli.schema that can be validated against, by attribute name.
+SCHEMA_NAMES = (
+    "yaml_schema",
+    "spec_schema",
+    "spec_node_schema",
+    "additional_properties_schema",
+    "metaschema_node_schema",
+)
+
+# Keywords of a schema whose value is a subschema, a list of subschemas or a map of them, with
+# the path of that subschema in the draft-07 metaschema.
+_SUBSCHEMA = ("additionalItems", "contains", "additionalProperties", "propertyNames", "if", "then", "else", "not")
+_SUBSCHEMA_LISTS = ("allOf", "anyOf", "oneOf")
+_SUBSCHEMA_MAPS = ("definitions", "properties", "patternProperties", "dependencies")
+
+
+@functools.lru_cache(maxsize=None)
+def get_validator(schema_name):
+    """Return the cached validator for one of the schemas in SCHEMA_NAMES.
+
+    The validator class is chosen from the schema's `$schema` exactly as
+    `jsonschema.validate()` does, so results and error messages are unchanged.
+    """
+    from jsonschema.validators import validator_for
+    from ftf_cli import schema
+
+    if schema_name not in SCHEMA_NAMES:
+        raise ValueError(f"Unknown schema: {schema_name}")
+
+    schema_obj = getattr(schema, schema_name)
+    validator_cls = validator_for(schema_obj)
+    validator_cls.check_schema(schema_obj)
+    return validator_cls(schema_obj)
+
+
+def validate(instance, schema_name):
+    """Validate an instance against a named schema.
+
+    Raises:
+        jsonschema.exceptions.ValidationError: The most relevant error, as
+        `jsonschema.validate()` would raise it.
+    """
+    from jsonschema.exceptions import best_match
+
+    error = best_match(get_validator(schema_name).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def validate_yaml_schema(data):
+    """Validate a parsed facets.yaml against `yaml_schema`, and its schema-valued keys against the metaschema.
+
+    Gives the errors validating with the draft-07 metaschema embedded in
+    `yaml_schema` would, but walks nested schemas with a loop instead of
+    recursion, so any depth of nesting can be validated.
+
+    Raises:
+        jsonschema.exceptions.ValidationError: The most relevant error.
+    """
+    from jsonschema.exceptions import best_match
+    from ftf_cli.schema import SCHEMA_VALUED_KEYS
+
+    errors = list(get_validator("yaml_schema").iter_errors(data))
+    if isinstance(data, dict):
+        for key in SCHEMA_VALUED_KEYS:
+            if key in data:
+                errors.extend(iter_metaschema_errors(data[key], (key,), ("properties", key)))
+    error = best_match(errors)
+    if error is not None:
+        raise error
+
+
+def iter_metaschema_errors(schema_obj, keys=(), schema_path=()):
+    """Yield the errors of schema_obj and every schema nested in it against the draft-07 metaschema.
+
+    Each schema object is validated on its own with `metaschema_node_schema`.
+    Errors carry the instance and schema paths, prefixed with keys and
+    schema_path, under which validating schema_obj as a whole would report them.
+    """
+    validator = get_validator("metaschema_node_schema")
+    stack = [(schema_obj, tuple(keys), tuple(schema_path))]
+    while stack:
+        node, node_keys, node_schema_path = stack.pop()
+        for error in validator.iter_errors(node):
+            error.path.extendleft(reversed(node_keys))
+            error.schema_path.extendleft(reversed(node_schema_path))
+            yield error
+        if isinstance(node, dict):
+            stack.extend(reversed(list(_subschemas(node, node_keys, node_schema_path))))
+
+
+def _subschemas(node, keys, schema_path):
+    """Yield (subschema, keys, schema path) for each object subschema of a schema object."""
+    for keyword in _SUBSCHEMA:
+        if isinstance(node.get(keyword), dict):
+            yield node[keyword], keys + (keyword,), schema_path + ("properties", keyword)
+    items = node.get("items")
+    if isinstance(items, dict):
+        yield items, keys + ("items",), schema_path + ("properties", "items", "anyOf", 0)
+    elif isinstance(items, list):
+        for index, item in enumerate(items):
+            if isinstance(item, dict):
+                yield item, keys + ("items", index), schema_path + ("properties", "items", "anyOf", 1, "items")
+    for keyword in _SUBSCHEMA_LISTS:
+        if isinstance(node.get(keyword), list):
+            for index, item in enumerate(node[keyword]):
+                if isinstance(item, dict):
+                    yield item, keys + (keyword, index), schema_path + ("properties", keyword, "items")
+    for keyword in _SUBSCHEMA_MAPS:
+        if isinstance(node.get(keyword), dict):
+            for name, value in node[keyword].items():
+                if isinstance(value, dict):
+                    path = ("properties", keyword, "additionalProperties")
+                    if keyword == "dependencies":
+                        path += ("anyOf", 0)
+                    yield value, keys + (keyword, name), schema_path + path
+
+
+def iter_spec_node_errors(spec_node, keys=()):
+    """Yield the errors `spec_schema` reports on one spec object, without descending.
+
+    Args:
+        spec_node: A spec object: the spec itself or an object nested in it
+        keys: Keys leading from the spec to spec_node; `spec_schema` validates
+            nested objects two keys down (field, then nested key), so this has
+            even length
+
+    Errors carry the instance and schema paths validating the whole spec with
+    `spec_schema` would give them, so `best_match` over the errors of every
+    spec object picks the same error `validate(spec, "spec_schema")` raises.
+    """
+    from ftf_cli.schema import NESTED_SPEC_KEY_PATTERN
+
+    nesting = ("additionalProperties", "patternProperties", NESTED_SPEC_KEY_PATTERN, "then")
+    schema_path = nesting * (len(keys) // 2)
+    for error in get_validator("spec_node_schema").iter_errors(spec_node):
+        error.path.extendleft(reversed(keys))
+        error.schema_path.extendleft(reversed(schema_path))
+        yield error
+
+
+def warm_up():
+    """Build every validator up front, e.g. before validating many files."""
+    for schema_name in SCHEMA_NAMES:
+        get_validator(schema_name)
@@ -0,0 +1,153 @@
+"""Cold-start benchmarks for the `ftf` entry point.
+
+For every registered command (and the bare group) this measures, in a fresh
+interpreter:
+
+- ``import_ms``: import time spent beyond interpreter startup, from ``-X importtime``
+- ``help_ms``: wall time of ``ftf <command> --help``
+- ``first_output_ms``: time until the first byte of output appears
+
+Results are written as JSON to ``$FTF_BENCHMARK_RESULTS`` (default
+``.benchmarks/cold_start.json``) and compared against ``budgets.json``.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from ftf_cli.cli import LAZY_COMMANDS
+
+BUDGETS_PATH = os.path.join(os.path.dirname(__file__), "budgets.json")
+RESULTS_PATH = os.environ.get(
+    "FTF_BENCHMARK_RESULTS", os.path.join(".benchmarks", "cold_start.json")
+)
+RUNS = 3
+
+ENTRY_SCRIPT = "from ftf_cli.cli import main; main()"
+REPORT_MODULES_SCRIPT = (
+    "import sys, json\n"
+    "from ftf_cli.cli import main\n"
+    "try:\n"
+    "    main()\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    "sys.stderr.write(json.dumps(sorted(sys.modules)))\n"
+)
+
+with open(BUDGETS_PATH) as _budgets_file:
+    BUDGETS = json.load(_budgets_file)
+
+_results = {}
+
+
+def _budget_for(command):
+    budget = dict(BUDGETS["default"])
+    budget.update(BUDGETS["commands"].get(command or "ftf", {}))
+    return budget
+
+
+def _parse_importtime(stderr):
+    """Return {top-level module: cumulative microseconds} from `-X importtime` output."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if name.startswith("  "):
+            continue  # nested import, already counted in its parent
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+@pytest.fixture(scope="module")
+def startup_modules():
+    """Modules the bare interpreter imports before our code runs."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "pass"],
+        capture_output=True, text=True, check=True,
+    )
+    return set(_parse_importtime(result.stderr))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def write_results():
+    yield
+    results_dir = os.path.dirname(RESULTS_PATH)
+    if results_dir:
+        os.makedirs(results_dir, exist_ok=True)
+    with open(RESULTS_PATH, "w") as results_file:
+        json.dump({"python": sys.version.split()[0], "commands": _results}, results_file, indent=2, sort_keys=True)
+
+
+def _measure_import_ms(args, startup_modules):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", ENTRY_SCRIPT, *args],
+        capture_output=True, text=True, check=True,
+    )
+    imports = _parse_importtime(result.stderr)
+    return sum(us for name, us in imports.items() if name not in startup_modules) / 1000
+
+
+def _measure_wall_ms(args):
+    """Return (time to first output, total wall time) in milliseconds."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", ENTRY_SCRIPT, *args],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    process.stdout.read(1)
+    first_output = time.perf_counter() - start
+    process.stdout.read()
+    process.wait()
+    total = time.perf_counter() - start
+    assert process.returncode == 0, f"`ftf {' '.join(args)}` exited with {process.returncode}"
+    return first_output * 1000, total * 1000
+
+
+def _loaded_modules(args):
+    result = subprocess.run(
+        [sys.executable, "-c", REPORT_MODULES_SCRIPT, *args],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stderr)
+
+
+@pytest.mark.parametrize("command", [None] + sorted(LAZY_COMMANDS))
+def test_cold_start_within_budget(command, startup_modules):
+    args = ([command] if command else []) + ["--help"]
+    budget = _budget_for(command)
+
+    import_ms = _measure_import_ms(args, startup_modules)
+    timings = [_measure_wall_ms(args) for _ in range(RUNS)]
+    first_output_ms = min(t[0] for t in timings)
+    help_ms = min(t[1] for t in timings)
+
+    measured = {
+        "import_ms": round(import_ms, 1),
+        "help_ms": round(help_ms, 1),
+        "first_output_ms": round(first_output_ms, 1),
+    }
+    _results[command or "ftf"] = {"measured": measured, "budget": budget}
+
+    over_budget = {k: v for k, v in measured.items() if v > budget[k]}
+    assert not over_budget, (
+        f"`ftf {' '.join(args)}` exceeded its cold-start budget: {over_budget} (budget: {budget})"
+    )
+
+
+@pytest.mark.parametrize("command", [None] + sorted(LAZY_COMMANDS))
+def test_help_avoids_forbidden_imports(command):
+    args = ([command] if command else []) + ["--help"]
+    loaded = _loaded_modules(args)
+    offenders = sorted(
+        {
+            forbidden
+            for forbidden in BUDGETS["forbidden_imports"]
+            for module in loaded
+            if module == forbidden or module.startswith(f"{forbidden}.")
+        }
+    )
+    assert not offenders, f"`ftf {' '.join(args)}` imports {offenders} at startup"
@@ -0,0 +1,90 @@
+"""Benchmark of resource discovery: the header scanner against a full python-hcl2 parse.
+
+Generates a module of Terraform files, checks that both paths find the same
+resources, and times each. Results are written as JSON to
+``$FTF_RESOURCE_BENCHMARK_RESULTS`` (default ``.benchmarks/resource_discovery.json``).
+"""
+import json
+import os
+import sys
+import time
+
+import hcl2
+import pytest
+
+from ftf_cli.hcl_scan import _parse_expression, scan_resources
+from ftf_cli.utils import _declared_resources
+
+RESULTS_PATH = os.environ.get(
+    "FTF_RESOURCE_BENCHMARK_RESULTS", os.path.join(".benchmarks", "resource_discovery.json")
+)
+FILES = 20
+RESOURCES_PER_FILE = 20
+RUNS = 3
+
+RESOURCE_TEMPLATE = '''
+resource "aws_s3_bucket" "bucket_{file}_{index}" {{
+  bucket = "bucket-{file}-{index}"
+  count  = var.enabled ? 1 : 0
+  tags = {{
+    Name = "x-${{var.name}}"
+    Env  = local.env
+  }}
+  policy = <<-EOT
+    {{ "Statement": [] }}
+  EOT
+  lifecycle_rule {{
+    id      = "r"
+    enabled = true
+    expiration {{ days = 30 }}
+  }}
+}}
+resource "aws_sqs_queue" "queue_{file}_{index}" {{
+  for_each = var.queues # one per queue
+  name     = each.key
+}}
+'''
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return [
+        "".join(RESOURCE_TEMPLATE.format(file=file, index=index) for index in range(RESOURCES_PER_FILE))
+        for file in range(FILES)
+    ]
+
+
+def _time_ms(function, corpus):
+    timings = []
+    for _ in range(RUNS):
+        _parse_expression.cache_clear()
+        start = time.perf_counter()
+        results = [function(source) for source in corpus]
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, results
+
+
+def test_scanner_is_faster_than_full_parse(corpus):
+    full_parse_ms, full_parse = _time_ms(lambda source: _declared_resources(hcl2.loads(source)), corpus)
+    scan_ms, scanned = _time_ms(scan_resources, corpus)
+
+    assert scanned == full_parse
+
+    results_dir = os.path.dirname(RESULTS_PATH)
+    if results_dir:
+        os.makedirs(results_dir, exist_ok=True)
+    with open(RESULTS_PATH, "w") as results_file:
+        json.dump(
+            {
+                "python": sys.version.split()[0],
+                "files": FILES,
+                "resources": FILES * RESOURCES_PER_FILE * 2,
+                "full_parse_ms": round(full_parse_ms, 1),
+                "scan_ms": round(scan_ms, 1),
+            },
+            results_file,
+            indent=2,
+            sort_keys=True,
+        )
+
+    assert scan_ms < full_parse_ms
@@ -154,7 +154,7 @@ variable "environment" {
         """Test successfully adding an input."""
         with patch(
             "ftf_cli.commands.add_input.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup API response
             mock_response = MagicMock()
@@ -191,8 +191,10 @@ variable "environment" {
 
             # Verify API call was made
             mock_requests.assert_called_once_with(
+                "GET",
                 "https://test.example.com/cc-ui/v1/tf-outputs",
                 auth=("testuser", "testtoken"),
+                timeout=(10.0, 120.0),
             )
 
     def test_missing_files_error(self, runner):
@@ -253,7 +255,7 @@ variable "environment" {
         """Test error when requested output type is not found."""
         with patch(
             "ftf_cli.commands.add_input.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
             # Setup API response
             mock_response = MagicMock()
             mock_response.json.return_value = sample_api_response
@@ -298,7 +300,7 @@ variable "environment" {
 
         with patch(
             "ftf_cli.commands.add_input.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
             # Setup API response
             mock_response = MagicMock()
             mock_response.json.return_value = malformed_api_response
@@ -339,7 +341,7 @@ variable "environment" {
 
         with patch(
             "ftf_cli.commands.add_input.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
             # Setup API response
             mock_response = MagicMock()
             mock_response.json.return_value = no_properties_response
@@ -397,11 +399,7 @@ variable "environment" {
 
             with patch(
                 "ftf_cli.commands.add_input.is_logged_in", return_value=mock_credentials
-            ), patch("requests.get") as mock_requests, patch(
-                "ftf_cli.commands.add_input.run", return_value=MagicMock(returncode=0)
-            ), patch(
-                "ftf_cli.utils.ensure_formatting_for_object"
-            ):
+            ), patch("requests.Session.request") as mock_requests:
                 # Setup API response
                 mock_response = MagicMock()
                 mock_response.json.return_value = sample_api_response
@@ -522,7 +520,7 @@ variable "environment" {
         """Test successfully adding an input with custom namespace."""
         with patch(
             "ftf_cli.commands.add_input.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup API response
             mock_response = MagicMock()
@@ -576,7 +574,7 @@ variable "environment" {
 
         with patch(
             "ftf_cli.commands.add_input.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
             # Setup API response
             mock_response = MagicMock()
             mock_response.json.return_value = direct_structure_response
@@ -0,0 +1,32 @@
+from unittest.mock import Mock, patch
+
+from click.testing import CliRunner
+
+from ftf_cli import cache
+from ftf_cli.commands.delete_module import delete_module
+from ftf_cli.operations import module_upload_key
+
+
+@patch("requests.Session.request")
+@patch("ftf_cli.commands.delete_module.is_logged_in")
+def test_delete_forgets_last_upload(mock_is_logged_in, mock_request):
+    mock_is_logged_in.return_value = {
+        "control_plane_url": "https://test.facets.cloud",
+        "username": "testuser",
+        "token": "testtoken",
+    }
+    modules = [
+        {"id": 7, "intentDetails": {"name": "cache"}, "flavor": "redis", "version": "1.0", "stage": "PREVIEW"}
+    ]
+    mock_request.side_effect = [Mock(status_code=200, json=lambda: modules), Mock(status_code=200)]
+    key = module_upload_key("default", "https://test.facets.cloud", "testuser", "cache", "redis", "1.0")
+    cache.store("module_upload", key, "digest")
+
+    result = CliRunner().invoke(
+        delete_module, ["-i", "cache", "-f", "redis", "-v", "1.0", "-s", "PREVIEW", "-p", "default"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "deleted successfully" in result.output
+    assert mock_request.call_args[0] == ("DELETE", "https://test.facets.cloud/cc-ui/v1/modules/7")
+    assert cache.load("module_upload", key) is None
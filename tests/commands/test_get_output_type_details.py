@@ -70,7 +70,7 @@ class TestGetOutputTypeDetailsCommand:
         """Test successfully getting output type details with namespace."""
         with patch(
             "ftf_cli.commands.get_output_type_details.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup API response
             mock_response = MagicMock()
@@ -108,7 +108,7 @@ class TestGetOutputTypeDetailsCommand:
         """Test getting details for custom namespace output."""
         with patch(
             "ftf_cli.commands.get_output_type_details.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup API response
             mock_response = MagicMock()
@@ -133,7 +133,7 @@ class TestGetOutputTypeDetailsCommand:
         """Test error when output type is not found."""
         with patch(
             "ftf_cli.commands.get_output_type_details.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup API response
             mock_response = MagicMock()
@@ -178,7 +178,7 @@ class TestGetOutputTypeDetailsCommand:
 
         with patch(
             "ftf_cli.commands.get_output_type_details.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup API response
             mock_response = MagicMock()
@@ -207,7 +207,7 @@ class TestGetOutputTypeDetailsCommand:
 
         with patch(
             "ftf_cli.commands.get_output_type_details.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup API response
             mock_response = MagicMock()
@@ -243,7 +243,7 @@ class TestGetOutputTypeDetailsCommand:
         """Test error when API call fails."""
         with patch(
             "ftf_cli.commands.get_output_type_details.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup failed API response
             mock_response = MagicMock()
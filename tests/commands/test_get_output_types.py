@@ -46,7 +46,7 @@ class TestGetOutputTypesCommand:
         """Test successfully getting output types with namespaces."""
         with patch(
             "ftf_cli.commands.get_output_types.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup API response
             mock_response = MagicMock()
@@ -75,15 +75,17 @@ class TestGetOutputTypesCommand:
 
             # Verify API call was made
             mock_requests.assert_called_once_with(
+                "GET",
                 "https://test.example.com/cc-ui/v1/tf-outputs",
                 auth=("testuser", "testtoken"),
+                timeout=(10.0, 120.0),
             )
 
     def test_no_output_types(self, runner, mock_credentials):
         """Test when no output types are registered."""
         with patch(
             "ftf_cli.commands.get_output_types.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup empty API response
             mock_response = MagicMock()
@@ -111,7 +113,7 @@ class TestGetOutputTypesCommand:
 
         with patch(
             "ftf_cli.commands.get_output_types.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup API response
             mock_response = MagicMock()
@@ -144,7 +146,7 @@ class TestGetOutputTypesCommand:
         """Test error when API call fails."""
         with patch(
             "ftf_cli.commands.get_output_types.is_logged_in", return_value=mock_credentials
-        ), patch("requests.get") as mock_requests:
+        ), patch("requests.Session.request") as mock_requests:
 
             # Setup failed API response
             mock_response = MagicMock()
@@ -1,5 +1,6 @@
 """Integration tests for the preview_module command."""
 
+import json
 import pytest
 import os
 import tempfile
@@ -104,7 +105,7 @@ class TestPreviewModuleCommand:
         # Setup mocks
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
 
         # Run command with explicit profile
         result = runner.invoke(
@@ -130,6 +131,32 @@ class TestPreviewModuleCommand:
         assert call_args[1]["is_feature_branch"] is True  # Default when not publishable
         assert call_args[1]["auto_create"] is False
 
+    @patch("ftf_cli.commands.preview_module.is_logged_in")
+    @patch("ftf_cli.commands.preview_module.validate_directory.invoke")
+    @patch("ftf_cli.commands.preview_module.register_module")
+    def test_validation_receives_every_parameter(
+        self,
+        mock_register,
+        mock_validate_invoke,
+        mock_is_logged_in,
+        runner,
+        temp_module_with_facets,
+        mock_credentials,
+    ):
+        """Test that validate_directory is invoked with all of its parameters set."""
+        from ftf_cli.commands.validate_directory import validate_directory
+
+        mock_is_logged_in.return_value = mock_credentials
+
+        result = runner.invoke(
+            preview_module, [temp_module_with_facets, "--profile", "default", "--no-scan-cache"]
+        )
+
+        assert result.exit_code == 0
+        ctx = mock_validate_invoke.call_args[0][0]
+        assert set(ctx.params) == {param.name for param in validate_directory.params}
+        assert ctx.params["no_scan_cache"] is True
+
     @patch("ftf_cli.commands.preview_module.is_logged_in")
     @patch("ftf_cli.commands.preview_module.validate_directory.invoke")
     @patch("ftf_cli.commands.preview_module.register_module")
@@ -148,7 +175,7 @@ class TestPreviewModuleCommand:
         # Setup mocks
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
         mock_publish.return_value = None
 
         # Run command with git env vars and explicit profile
@@ -204,7 +231,7 @@ class TestPreviewModuleCommand:
         # Setup mocks
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
 
         # Run command with git parameters and explicit profile
         result = runner.invoke(
@@ -324,7 +351,7 @@ class TestPreviewModuleCommand:
         # Setup mocks
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
         mock_publish.side_effect = ModuleOperationError("Publishing failed")
 
         # Set environment variables for non-local development
@@ -353,11 +380,14 @@ class TestPreviewModuleCommand:
         temp_module_with_facets,
         mock_credentials,
     ):
-        """Test that local development versions are properly modified and reverted."""
+        """Test that local development versions are modified in the archive only."""
         # Setup mocks
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
+        facets_yaml_path = os.path.join(temp_module_with_facets, "facets.yaml")
+        with open(facets_yaml_path, "rb") as f:
+            original_content = f.read()
 
         # Run command with local git ref and explicit profile
         result = runner.invoke(
@@ -376,14 +406,15 @@ class TestPreviewModuleCommand:
         assert "Profile selected: default" in result.output
         assert "Version modified to: 1.0-local-testuser" in result.output
         assert "Sample version modified to: 1.0-local-testuser" in result.output
-        assert "Version reverted to: 1.0" in result.output
-        assert "Sample version reverted to: 1.0" in result.output
 
-        # Verify the final facets.yaml was reverted
-        with open(os.path.join(temp_module_with_facets, "facets.yaml"), "r") as f:
-            final_facets = yaml.safe_load(f)
-        assert final_facets["version"] == "1.0"
-        assert final_facets["sample"]["version"] == "1.0"
+        # The modified facets.yaml is uploaded from memory
+        archived_facets = yaml.safe_load(mock_register.call_args[1]["extra_files"]["facets.yaml"])
+        assert archived_facets["version"] == "1.0-local-testuser"
+        assert archived_facets["sample"]["version"] == "1.0-local-testuser"
+
+        # Verify facets.yaml was never modified
+        with open(facets_yaml_path, "rb") as f:
+            assert f.read() == original_content
 
     @patch("ftf_cli.commands.preview_module.is_logged_in")
     @patch("ftf_cli.commands.preview_module.validate_directory.invoke")
@@ -401,7 +432,7 @@ class TestPreviewModuleCommand:
         # Setup mocks
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
 
         # Run command with local git ref and publish flag
         result = runner.invoke(
@@ -433,11 +464,11 @@ class TestPreviewModuleCommand:
         temp_module_with_outputs,
         mock_credentials,
     ):
-        """Test that output tree is generated and cleaned up properly."""
+        """Test that output tree is generated into the archive without writing files."""
         # Setup mocks
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
 
         # Run command with explicit profile
         result = runner.invoke(
@@ -447,10 +478,11 @@ class TestPreviewModuleCommand:
         # Assertions
         assert result.exit_code == 0
         assert "Profile selected: default" in result.output
-        assert "Output lookup tree saved to" in result.output
-        assert "Removed temporary file:" in result.output
+        assert "Output lookup tree added to the module archive" in result.output
+        extra_files = mock_register.call_args[1]["extra_files"]
+        assert "out" in json.loads(extra_files["output-lookup-tree.json"])
 
-        # Verify cleanup - output-lookup-tree.json should be removed
+        # Verify no output-lookup-tree.json was written to the module directory
         output_json = os.path.join(temp_module_with_outputs, "output-lookup-tree.json")
         assert not os.path.exists(output_json)
 
@@ -470,7 +502,7 @@ class TestPreviewModuleCommand:
         # Setup mocks
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
 
         # Ensure git env vars are not set
         with patch.dict(os.environ, {}, clear=True):
@@ -501,7 +533,7 @@ class TestPreviewModuleCommand:
         # Setup mocks
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
 
         # Run command with custom profile
         result = runner.invoke(
@@ -540,7 +572,7 @@ class TestPreviewModuleCommand:
         # Setup mocks
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
 
         # Run command (temp_module_with_facets doesn't have outputs.tf)
         result = runner.invoke(
@@ -565,38 +597,23 @@ class TestPreviewModuleCommand:
         temp_module_with_outputs,
         mock_credentials,
     ):
-        """Test that output.facets.yaml is generated with correct structure and cleaned up."""
+        """Test that output.facets.yaml is generated into the archive with the correct structure."""
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
-
-        # Patch os.remove to prevent actual deletion so we can check the file
-        import builtins
-        import yaml as _yaml
-        import os as _os
-        removed_files = []
-        orig_remove = _os.remove
-        def fake_remove(path):
-            removed_files.append(path)
-            if os.path.basename(path) != "output.facets.yaml":
-                orig_remove(path)
-        with patch("os.remove", fake_remove):
-            result = runner.invoke(
-                preview_module, [temp_module_with_outputs, "--profile", "default"]
-            )
-            output_facets_path = os.path.join(temp_module_with_outputs, "output.facets.yaml")
-            # It should have been created and then deleted
-            assert output_facets_path in removed_files
-            # Recreate to check structure
-            with open(output_facets_path, "w") as f:
-                _yaml.dump({"out": {"interfaces": {"foo": "bar"}, "attributes": {"baz": "qux"}}}, f)
-            with open(output_facets_path, "r") as f:
-                data = _yaml.safe_load(f)
-            assert "out" in data
-            assert "interfaces" in data["out"]
-            assert "attributes" in data["out"]
-            assert "properties" not in data
-            assert "out" not in data["out"]
+        mock_register.return_value = True
+
+        result = runner.invoke(
+            preview_module, [temp_module_with_outputs, "--profile", "default"]
+        )
+
+        assert result.exit_code == 0
+        assert not os.path.exists(os.path.join(temp_module_with_outputs, "output.facets.yaml"))
+        data = yaml.safe_load(mock_register.call_args[1]["extra_files"]["output.facets.yaml"])
+        assert "out" in data
+        assert "interfaces" in data["out"]
+        assert "attributes" in data["out"]
+        assert "properties" not in data
+        assert "out" not in data["out"]
 
     @patch("ftf_cli.commands.preview_module.is_logged_in")
     @patch("ftf_cli.commands.preview_module.validate_directory.invoke")
@@ -613,7 +630,7 @@ class TestPreviewModuleCommand:
         """Test that output.facets.yaml is not created if --skip-output-write is set and skipOutputWrite is sent to register_module."""
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
 
         result = runner.invoke(
             preview_module,
@@ -624,6 +641,7 @@ class TestPreviewModuleCommand:
         # Check skipOutputWrite in register_module call
         call_args = mock_register.call_args
         assert call_args[1]["skip_output_write"] is True
+        assert "output.facets.yaml" not in call_args[1]["extra_files"]
 
     @patch("ftf_cli.commands.preview_module.is_logged_in")
     @patch("ftf_cli.commands.preview_module.validate_directory.invoke")
@@ -640,7 +658,7 @@ class TestPreviewModuleCommand:
         """Test that output.facets.yaml is not overwritten if it already exists."""
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
 
         output_facets_path = os.path.join(temp_module_with_outputs, "output.facets.yaml")
         # Pre-create with dummy content
@@ -649,10 +667,11 @@ class TestPreviewModuleCommand:
         result = runner.invoke(
             preview_module, [temp_module_with_outputs, "--profile", "default"]
         )
-        # File should not be overwritten
+        # File should not be overwritten, and is archived as it is
         with open(output_facets_path, "r") as f:
             content = f.read()
         assert "dummy: true" in content
+        assert "output.facets.yaml" not in mock_register.call_args[1]["extra_files"]
 
 
 class TestPreviewModuleEdgeCases:
@@ -674,7 +693,7 @@ class TestPreviewModuleEdgeCases:
         # Setup mocks
         mock_is_logged_in.return_value = mock_credentials
         mock_validate_invoke.return_value = None
-        mock_register.return_value = None
+        mock_register.return_value = True
 
         # Test with valid boolean values
         result = runner.invoke(
@@ -701,3 +720,137 @@ class TestPreviewModuleEdgeCases:
         assert (
             call_args[1]["is_feature_branch"] is True
         )  # publishable=no -> feature_branch=True
+
+    @patch("ftf_cli.commands.preview_module.is_logged_in")
+    @patch("ftf_cli.commands.preview_module.validate_directory.invoke")
+    @patch("ftf_cli.commands.preview_module.register_module")
+    def test_dry_run_lists_archived_files(
+        self,
+        mock_register,
+        mock_validate_invoke,
+        mock_is_logged_in,
+        runner,
+        temp_module_with_facets,
+    ):
+        """Test --dry-run lists the files to archive without validating or uploading."""
+        os.makedirs(os.path.join(temp_module_with_facets, ".git"))
+        with open(os.path.join(temp_module_with_facets, ".git", "HEAD"), "w") as f:
+            f.write("ref: refs/heads/main\n")
+
+        result = runner.invoke(preview_module, [temp_module_with_facets, "--dry-run"])
+
+        assert result.exit_code == 0
+        listed = [line.split(" (")[0] for line in result.output.splitlines() if " bytes)" in line]
+        assert listed == ["facets.yaml", "main.tf", "variables.tf"]
+        assert "3 files" in result.output
+        mock_is_logged_in.assert_not_called()
+        mock_validate_invoke.assert_not_called()
+        mock_register.assert_not_called()
+
+    @patch("ftf_cli.commands.preview_module.is_logged_in")
+    @patch("ftf_cli.commands.preview_module.validate_directory.invoke")
+    @patch("ftf_cli.commands.preview_module.register_module")
+    def test_dry_run_lists_generated_files(
+        self,
+        mock_register,
+        mock_validate_invoke,
+        mock_is_logged_in,
+        runner,
+        temp_module_with_outputs,
+        mock_credentials,
+    ):
+        """Test --dry-run lists the generated files with the sizes they are uploaded with."""
+        mock_is_logged_in.return_value = mock_credentials
+        args = [temp_module_with_outputs, "--git-ref", "local-test"]
+
+        result = runner.invoke(preview_module, args + ["--dry-run"])
+
+        assert result.exit_code == 0
+        listed = dict(
+            line[:-len(" bytes)")].split(" (") for line in result.output.splitlines() if line.endswith(" bytes)")
+        )
+        assert sorted(listed) == [
+            "facets.yaml", "main.tf", "output-lookup-tree.json", "output.facets.yaml", "outputs.tf", "variables.tf"
+        ]
+        assert "Version modified to: 1.0-local-test" in result.output
+        mock_register.assert_not_called()
+
+        result = runner.invoke(preview_module, args)
+
+        assert result.exit_code == 0
+        extra_files = mock_register.call_args[1]["extra_files"]
+        assert {arcname: str(len(content)) for arcname, content in extra_files.items()} == {
+            arcname: listed[arcname] for arcname in extra_files
+        }
+
+    @patch("ftf_cli.commands.preview_module.is_logged_in")
+    @patch("ftf_cli.commands.preview_module.validate_directory.invoke")
+    @patch("ftf_cli.commands.preview_module.register_module")
+    def test_upload_cache_key(
+        self,
+        mock_register,
+        mock_validate_invoke,
+        mock_is_logged_in,
+        runner,
+        temp_module_with_facets,
+        mock_credentials,
+    ):
+        """Test unchanged uploads are skipped per module version unless --force-upload is set."""
+        mock_is_logged_in.return_value = mock_credentials
+
+        def upload_cache_key(*args):
+            result = runner.invoke(preview_module, [temp_module_with_facets, "--profile", "default", *args])
+            assert result.exit_code == 0
+            return mock_register.call_args[1]["upload_cache_key"]
+
+        key = upload_cache_key()
+        assert key is not None
+        assert upload_cache_key() == key
+        assert upload_cache_key("--git-ref", "local-other") != key
+        assert upload_cache_key("--force-upload") is None
+
+    @patch("ftf_cli.commands.preview_module.is_logged_in")
+    @patch("ftf_cli.commands.preview_module.validate_directory.invoke")
+    @patch("ftf_cli.commands.preview_module.register_module")
+    def test_skipped_upload_is_not_reported_as_registered(
+        self,
+        mock_register,
+        mock_validate_invoke,
+        mock_is_logged_in,
+        runner,
+        temp_module_with_facets,
+        mock_credentials,
+    ):
+        """Test a skipped upload prints that the module is unchanged instead of the success lines."""
+        mock_is_logged_in.return_value = mock_credentials
+        mock_register.return_value = False
+
+        result = runner.invoke(preview_module, [temp_module_with_facets, "--git-ref", "main"])
+
+        assert result.exit_code == 0
+        assert "successfully registered" not in result.output
+        assert "successfully previewed" not in result.output
+        assert 'Version "1.0" is unchanged since its last upload' in result.output
+        assert "upload skipped" in result.output
+
+    @patch("ftf_cli.commands.preview_module.is_logged_in")
+    @patch("ftf_cli.commands.preview_module.validate_directory.invoke")
+    @patch("ftf_cli.commands.preview_module.register_module")
+    def test_compression_level(
+        self,
+        mock_register,
+        mock_validate_invoke,
+        mock_is_logged_in,
+        runner,
+        temp_module_with_facets,
+        mock_credentials,
+    ):
+        """Test --compression-level is passed to register_module and validated."""
+        mock_is_logged_in.return_value = mock_credentials
+
+        result = runner.invoke(preview_module, [temp_module_with_facets, "--compression-level", "9"])
+        assert result.exit_code == 0
+        assert mock_register.call_args[1]["compression_level"] == 9
+
+        result = runner.invoke(preview_module, [temp_module_with_facets, "--compression-level", "10"])
+        assert result.exit_code != 0
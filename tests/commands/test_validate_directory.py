@@ -0,0 +1,235 @@
+import os
+import subprocess
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from ftf_cli.commands.validate_directory import checkov_cache_key, run_checkov, validate_directory
+from ftf_cli.terraform import Terraform
+
+
+def _completed(stdout="", stderr=""):
+    return subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout, stderr=stderr)
+
+
+class TestValidateDirectoryCommand:
+    """Test cases for the validate_directory stage pipeline."""
+
+    @pytest.fixture
+    def runner(self):
+        return CliRunner()
+
+    @pytest.fixture
+    def stages(self):
+        """Patch every stage; tests adjust the mocks before invoking the command."""
+
+        def fake_run(command, *args, **kwargs):
+            if "fmt" in command:
+                return _completed(stdout="main.tf")
+            if "init" in command:
+                return _completed(stdout="init output")
+            if "validate" in command:
+                return _completed(stdout="validate output")
+            raise AssertionError(f"unexpected command {command}")
+
+        with patch("ftf_cli.terraform.find_terraform", return_value=Terraform("terraform", "1.9.0")), \
+                patch("ftf_cli.commands.validate_directory.run", side_effect=fake_run) as run, \
+                patch("ftf_cli.commands.validate_directory.validate_facets_yaml") as validate_yaml, \
+                patch("ftf_cli.commands.validate_directory.validate_facets_tf_vars") as validate_tf_vars, \
+                patch("ftf_cli.commands.validate_directory.run_checkov", return_value=[]) as checkov:
+            yield SimpleNamespace(
+                run=run, validate_yaml=validate_yaml, validate_tf_vars=validate_tf_vars, checkov=checkov,
+                fake_run=fake_run,
+            )
+
+    def test_output_in_stage_order(self, runner, stages, tmp_path):
+        stages.validate_tf_vars.side_effect = lambda *args, **kwargs: click.echo("tf vars ok")
+
+        result = runner.invoke(validate_directory, [str(tmp_path)])
+
+        assert result.exit_code == 0, result.output
+        assert result.output.splitlines() == [
+            "✅ facets.yaml validated successfully.",
+            "main.tf",
+            "tf vars ok",
+            "🎨 Terraform files formatted.",
+            "init output",
+            "🚀 Terraform initialized.",
+            "validate output",
+            "🔍 Terraform validation successful.",
+            "✅ Checkov validation passed.",
+        ]
+
+    def test_checkov_runs_alongside_terraform(self, runner, stages, tmp_path):
+        checkov_started = threading.Event()
+
+        def checkov(path, use_cache=True):
+            checkov_started.set()
+            return []
+
+        def run(command, *args, **kwargs):
+            if not isinstance(command, str) and "init" in command:
+                # Would time out if checkov only started after terraform init/validate.
+                assert checkov_started.wait(10)
+            return stages.fake_run(command, *args, **kwargs)
+
+        stages.checkov.side_effect = checkov
+        stages.run.side_effect = run
+
+        result = runner.invoke(validate_directory, [str(tmp_path)])
+
+        assert result.exit_code == 0, result.output
+
+    def test_init_failure_reported_after_earlier_output(self, runner, stages, tmp_path):
+        def run(command, *args, **kwargs):
+            if not isinstance(command, str) and "validate" in command and "-chdir" in command[1]:
+                raise subprocess.CalledProcessError(1, command, output="", stderr="validate failed")
+            return stages.fake_run(command, *args, **kwargs)
+
+        stages.run.side_effect = run
+
+        result = runner.invoke(validate_directory, [str(tmp_path)])
+
+        assert result.exit_code != 0
+        lines = result.output.splitlines()
+        assert lines.index("🚀 Terraform initialized.") < lines.index("validate failed")
+        assert "Checkov validation passed." not in result.output
+        assert "An error occurred while executing" in result.output
+
+    def test_skip_terraform_validation(self, runner, stages, tmp_path):
+        result = runner.invoke(validate_directory, [str(tmp_path), "--skip-terraform-validation", "true"])
+
+        assert result.exit_code == 0, result.output
+        assert "⏭ Skipping Terraform validation as per flag." in result.output
+        assert not any("init" in call.args[0] for call in stages.run.call_args_list if not isinstance(call.args[0], str))
+        stages.checkov.assert_called_once_with(str(tmp_path), use_cache=True)
+
+    def test_checkov_failures_reported(self, runner, stages, tmp_path):
+        stages.checkov.return_value = [
+            {"check_id": "CKV_1", "severity": "HIGH", "file_path": "/main.tf", "file_line": "1"}
+        ]
+
+        result = runner.invoke(validate_directory, [str(tmp_path)])
+
+        assert result.exit_code != 0
+        assert "⛔ Checkov validation failed." in result.output
+        assert "Check: CKV_1, Severity: HIGH" in result.output
+
+    def test_init_uses_shared_plugin_cache(self, runner, stages, tmp_path):
+        mirror = tmp_path / "mirror"
+        mirror.mkdir()
+
+        result = runner.invoke(validate_directory, [str(tmp_path), "--provider-mirror", str(mirror)])
+
+        assert result.exit_code == 0, result.output
+        init_call = next(
+            call for call in stages.run.call_args_list
+            if not isinstance(call.args[0], str) and "init" in call.args[0]
+        )
+        env = init_call.kwargs["env"]
+        assert env["TF_PLUGIN_CACHE_DIR"] == os.environ["TF_PLUGIN_CACHE_DIR"]
+        assert "filesystem_mirror" in open(env["TF_CLI_CONFIG_FILE"]).read()
+
+    def test_init_skipped_when_requirements_unchanged(self, runner, stages, tmp_path):
+        (tmp_path / "main.tf").write_text('resource "aws_s3_bucket" "b" {}\n')
+
+        def init_calls():
+            return [
+                call for call in stages.run.call_args_list
+                if not isinstance(call.args[0], str) and "init" in call.args[0]
+            ]
+
+        result = runner.invoke(validate_directory, [str(tmp_path)])
+        assert result.exit_code == 0, result.output
+        assert len(init_calls()) == 1
+
+        (tmp_path / "variables.tf").write_text('variable "name" {}\n')
+        result = runner.invoke(validate_directory, [str(tmp_path)])
+        assert result.exit_code == 0, result.output
+        assert len(init_calls()) == 1
+        assert "🚀 Terraform already initialized, requirements unchanged." in result.output
+
+        (tmp_path / "main.tf").write_text('resource "google_storage_bucket" "b" {}\n')
+        result = runner.invoke(validate_directory, [str(tmp_path)])
+        assert result.exit_code == 0, result.output
+        assert len(init_calls()) == 2
+
+    def test_no_scan_cache_flag(self, runner, stages, tmp_path):
+        result = runner.invoke(validate_directory, [str(tmp_path), "--no-scan-cache"])
+
+        assert result.exit_code == 0, result.output
+        stages.checkov.assert_called_once_with(str(tmp_path), use_cache=False)
+
+
+class TestRunCheckov:
+    """Test cases for the cached checkov scan."""
+
+    @pytest.fixture
+    def module_dir(self, tmp_path):
+        (tmp_path / "main.tf").write_text('resource "aws_s3_bucket" "b" {}\n')
+        (tmp_path / ".terraform").mkdir()
+        (tmp_path / ".terraform" / "provider.tf").write_text("# downloaded\n")
+        return tmp_path
+
+    @pytest.fixture
+    def runner_cls(self):
+        failed_checks = [
+            SimpleNamespace(check_id="CKV_1", severity="HIGH", file_path="/main.tf", file_line=1),
+            SimpleNamespace(check_id="CKV_2", severity="LOW", file_path="/main.tf", file_line=2),
+        ]
+        with patch("checkov.terraform.runner.Runner") as runner_cls:
+            runner_cls.return_value.run.return_value = SimpleNamespace(failed_checks=failed_checks)
+            yield runner_cls
+
+    def test_returns_high_and_critical_findings(self, module_dir, runner_cls):
+        assert run_checkov(str(module_dir)) == [
+            {"check_id": "CKV_1", "severity": "HIGH", "file_path": "/main.tf", "file_line": "1"}
+        ]
+
+    def test_unchanged_module_is_not_rescanned(self, module_dir, runner_cls):
+        first = run_checkov(str(module_dir))
+        (module_dir / "facets.yaml").write_text("not scanned")
+        (module_dir / ".terraform" / "provider.tf").write_text("# updated\n")
+
+        assert run_checkov(str(module_dir)) == first
+        assert runner_cls.return_value.run.call_count == 1
+
+    def test_changed_terraform_file_is_rescanned(self, module_dir, runner_cls):
+        run_checkov(str(module_dir))
+        (module_dir / "main.tf").write_text('resource "aws_s3_bucket" "c" {}\n')
+
+        run_checkov(str(module_dir))
+        assert runner_cls.return_value.run.call_count == 2
+
+    def test_scan_cache_bypassed(self, module_dir, runner_cls):
+        run_checkov(str(module_dir))
+        run_checkov(str(module_dir), use_cache=False)
+        assert runner_cls.return_value.run.call_count == 2
+
+    def test_changed_local_module_outside_path_is_rescanned(self, tmp_path, runner_cls):
+        module_dir = tmp_path / "module"
+        module_dir.mkdir()
+        (module_dir / "main.tf").write_text(
+            'module "shared" {\n  source = "../shared"\n}\n'
+            'module "remote" {\n  source = "terraform-aws-modules/s3-bucket/aws"\n}\n'
+        )
+        for name, source in [("shared", "../nested"), ("nested", "../shared")]:
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "main.tf").write_text(f'module "x" {{\n  source = "{source}"\n}}\n')
+
+        run_checkov(str(module_dir))
+        run_checkov(str(module_dir))
+        assert runner_cls.return_value.run.call_count == 1
+
+        (tmp_path / "nested" / "bucket.tf").write_text('resource "aws_s3_bucket" "b" {}\n')
+        run_checkov(str(module_dir))
+        assert runner_cls.return_value.run.call_count == 2
+
+    def test_cache_key_covers_checkov_version(self, module_dir):
+        key = checkov_cache_key(str(module_dir))
+        with patch("checkov.version.version", "0.0.1"):
+            assert checkov_cache_key(str(module_dir)) != key
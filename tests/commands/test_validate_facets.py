@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from ftf_cli.commands.validate_facets import find_module_dirs, validate_facets
+
+VALID_FACETS_YAML = """
+intent: {intent}
+flavor: default
+version: "1.0"
+description: test module
+clouds: [aws]
+spec:
+  type: object
+  properties: {{}}
+"""
+
+
+class TestValidateFacetsCommand:
+    """Test cases for validate_facets across many modules."""
+
+    @pytest.fixture
+    def runner(self):
+        return CliRunner()
+
+    @pytest.fixture
+    def modules_root(self, tmp_path):
+        for intent in ["cache", "database", "queue"]:
+            module_dir = tmp_path / intent / "default" / "1.0"
+            module_dir.mkdir(parents=True)
+            (module_dir / "facets.yaml").write_text(VALID_FACETS_YAML.format(intent=intent))
+        hidden_dir = tmp_path / ".terraform" / "modules" / "x"
+        hidden_dir.mkdir(parents=True)
+        (hidden_dir / "facets.yaml").write_text("not: [valid")
+        return tmp_path
+
+    def test_single_directory_unchanged(self, runner, modules_root):
+        result = runner.invoke(validate_facets, [str(modules_root / "cache" / "default" / "1.0")], color=True)
+        assert result.exit_code == 0
+        assert result.output.splitlines()[-1] == "✅ facets.yaml validated successfully.\x1b[0m"
+
+    def test_single_directory_failure(self, runner, tmp_path):
+        result = runner.invoke(validate_facets, [str(tmp_path)], color=True)
+        assert result.exit_code != 0
+        assert result.output.splitlines()[0] == (
+            f"❌ Validation failed: ❌ facets.yaml file does not exist at {tmp_path / 'facets.yaml'}\x1b[0m"
+        )
+
+    def test_find_module_dirs_walks_root(self, modules_root):
+        module_dirs = find_module_dirs(str(modules_root))
+        assert module_dirs == [
+            str(modules_root / intent / "default" / "1.0") for intent in ["cache", "database", "queue"]
+        ]
+
+    def test_find_module_dirs_glob(self, modules_root):
+        assert find_module_dirs(str(modules_root / "*" / "default" / "1.0")) == find_module_dirs(str(modules_root))
+        assert find_module_dirs(str(modules_root / "**" / "facets.yaml")) == find_module_dirs(str(modules_root))
+        assert find_module_dirs(str(modules_root / "q*" / "*" / "*")) == [str(modules_root / "queue" / "default" / "1.0")]
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_recursive_all_pass(self, runner, modules_root, jobs):
+        result = runner.invoke(validate_facets, [str(modules_root), "--recursive", "--jobs", jobs])
+        assert result.exit_code == 0, result.output
+        assert "Validating 3 modules" in result.output
+        assert result.output.count("✅ ") == 3
+        assert "3 passed, 0 failed." in result.output
+
+    def test_failure_sets_exit_code_and_summary(self, runner, modules_root, tmp_path):
+        (modules_root / "queue" / "default" / "1.0" / "facets.yaml").write_text("intent: queue\n")
+        summary_path = tmp_path / "summary.json"
+
+        result = runner.invoke(
+            validate_facets,
+            [str(modules_root / "*" / "*" / "*"), "--jobs", "2", "--summary", str(summary_path)],
+        )
+
+        assert result.exit_code != 0
+        assert "2 passed, 1 failed." in result.output
+        assert "1 of 3 modules failed validation" in result.output
+        summary = json.loads(summary_path.read_text())
+        assert (summary["total"], summary["passed"], summary["failed"]) == (3, 2, 1)
+        assert [m["status"] for m in summary["modules"]] == ["passed", "passed", "failed"]
+        assert "is not following Facets Schema" in summary["modules"][2]["error"]
+
+    def test_summary_to_stdout_is_json(self, runner, modules_root):
+        result = runner.invoke(validate_facets, [str(modules_root), "-r", "-j", "1", "--summary", "-"])
+        assert result.exit_code == 0
+        assert json.loads(result.stdout)["passed"] == 3
+
+    def test_no_modules_found(self, runner, tmp_path):
+        result = runner.invoke(validate_facets, [str(tmp_path), "--recursive"])
+        assert result.exit_code != 0
+        assert "No facets.yaml files found" in result.output
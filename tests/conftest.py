@@ -2,6 +2,24 @@ import pytest
 from click.testing import CliRunner
 from unittest.mock import patch
 
+from ftf_cli import module
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep validation caches and the Terraform plugin cache out of the user's ~/.facets,
+    and start every test without previously read module files."""
+    monkeypatch.setenv("FTF_CACHE_DIR", str(tmp_path / "ftf-cache"))
+    monkeypatch.setenv("TF_PLUGIN_CACHE_DIR", str(tmp_path / "plugin-cache"))
+    monkeypatch.delenv("FTF_PROVIDER_MIRROR", raising=False)
+    module.clear()
+
+
+@pytest.fixture(autouse=True)
+def no_http_retries(monkeypatch):
+    """Fail control plane requests on the first error response instead of retrying with backoff."""
+    monkeypatch.setenv("FTF_HTTP_RETRIES", "0")
+
 
 @pytest.fixture
 def runner():
@@ -0,0 +1,136 @@
+import os
+
+import click
+import pytest
+from unittest.mock import patch
+
+from ftf_cli import cache
+from ftf_cli.commands.validate_facets import validate_facets
+from ftf_cli.utils import validate_facets_tf_vars, validate_facets_yaml
+
+VALID_FACETS_YAML = """
+intent: test-intent
+flavor: test-flavor
+version: "1.0"
+description: test module
+clouds: [aws]
+spec:
+  type: object
+  properties: {}
+"""
+
+VALID_VARIABLES_TF = """
+variable "instance" {}
+variable "instance_name" {}
+variable "environment" {}
+variable "inputs" {}
+"""
+
+
+@pytest.fixture
+def module_dir(tmp_path):
+    module = tmp_path / "module"
+    module.mkdir()
+    (module / "facets.yaml").write_text(VALID_FACETS_YAML)
+    (module / "variables.tf").write_text(VALID_VARIABLES_TF)
+    return module
+
+
+def test_store_and_load_round_trip():
+    key = cache.make_key("a", b"b")
+    assert cache.load("test", key) is None
+    cache.store("test", key, {"value": 1})
+    assert cache.load("test", key) == {"value": 1}
+
+
+def test_cache_dir_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path / "elsewhere"))
+    cache.store("test", cache.make_key("x"), {})
+    assert (tmp_path / "elsewhere" / "test").is_dir()
+
+
+def test_corrupt_entry_is_a_miss():
+    key = cache.make_key("corrupt")
+    cache.store("test", key, {"value": 1})
+    with open(cache._entry_path("test", key), "w") as f:
+        f.write("{not json")
+    assert cache.load("test", key) is None
+
+
+def test_make_key_separates_parts():
+    assert cache.make_key("ab", "c") != cache.make_key("a", "bc")
+
+
+def test_cached_check_replays_output_and_error(capsys):
+    calls = []
+
+    def check():
+        calls.append(1)
+        click.echo("checking")
+        raise click.UsageError("broken")
+
+    key = cache.make_key("check")
+    for _ in range(2):
+        with pytest.raises(click.UsageError, match="broken"):
+            cache.cached_check("test", key, check)
+        assert capsys.readouterr().out == "checking\n"
+    assert len(calls) == 1
+
+
+def test_cached_check_bypassed_without_cache():
+    calls = []
+    key = cache.make_key("bypass")
+    for _ in range(2):
+        cache.cached_check("test", key, lambda: calls.append(1), use_cache=False)
+    assert len(calls) == 2
+
+
+def test_unexpected_errors_are_not_cached():
+    key = cache.make_key("unexpected")
+    with pytest.raises(RuntimeError):
+        cache.cached_check("test", key, lambda: (_ for _ in ()).throw(RuntimeError()))
+    assert cache.load("test", key) is None
+
+
+def test_validate_facets_yaml_uses_cache(module_dir, capsys):
+    with patch("ftf_cli.utils.validate_yaml", wraps=lambda data: click.echo("validated")) as validate_yaml:
+        validate_facets_yaml(str(module_dir))
+        validate_facets_yaml(str(module_dir))
+    assert validate_yaml.call_count == 1
+    assert capsys.readouterr().out == "validated\nvalidated\n"
+
+
+def test_validate_facets_yaml_revalidates_changed_file(module_dir):
+    validate_facets_yaml(str(module_dir))
+    (module_dir / "facets.yaml").write_text(VALID_FACETS_YAML.replace("spec:", "spec: 1\nunused:"))
+    with pytest.raises(click.UsageError):
+        validate_facets_yaml(str(module_dir))
+
+
+def test_validate_facets_yaml_caches_failures(module_dir):
+    (module_dir / "facets.yaml").write_text("intent: [unclosed")
+    for _ in range(2):
+        with pytest.raises(click.UsageError, match="not a valid YAML file"):
+            validate_facets_yaml(str(module_dir))
+
+
+def test_validate_facets_tf_vars_uses_cache(module_dir, capsys):
+    with patch("ftf_cli.utils._check_facets_tf_vars", wraps=lambda *args: click.echo("checked")) as check:
+        validate_facets_tf_vars(str(module_dir))
+        validate_facets_tf_vars(str(module_dir))
+        validate_facets_tf_vars(str(module_dir), use_cache=False)
+    assert check.call_count == 2
+    assert capsys.readouterr().out == "checked\n" * 3
+
+
+def test_validate_facets_no_cache_flag(module_dir, runner):
+    runner.invoke(validate_facets, [str(module_dir)])
+    with patch("ftf_cli.utils.validate_yaml") as validate_yaml:
+        result = runner.invoke(validate_facets, [str(module_dir)])
+        assert result.exit_code == 0
+        assert validate_yaml.call_count == 0
+
+        result = runner.invoke(validate_facets, [str(module_dir), "--no-cache"])
+        assert result.exit_code == 0
+        assert validate_yaml.call_count == 1
+    assert os.listdir(cache.get_cache_dir()) == ["facets_yaml"]
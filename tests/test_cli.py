@@ -0,0 +1,60 @@
+import json
+import subprocess
+import sys
+
+from ftf_cli.cli import cli, LAZY_COMMANDS
+
+HEAVY_MODULES = ["checkov", "hcl", "hcl2", "jsonschema", "lark", "questionary", "requests"]
+
+
+def _loaded_modules_after(args):
+    """Run the CLI with the given args in a fresh interpreter and return the loaded module names."""
+    script = (
+        "import json, sys\n"
+        "from ftf_cli.cli import cli\n"
+        "try:\n"
+        f"    cli({args!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "sys.stderr.write(json.dumps(sorted(sys.modules)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return set(json.loads(result.stderr))
+
+
+def _is_loaded(modules, name):
+    return any(m == name or m.startswith(f"{name}.") for m in modules)
+
+
+def test_help_lists_all_commands(runner):
+    result = runner.invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    for command_name in LAZY_COMMANDS:
+        assert command_name in result.output
+
+
+def test_lazy_commands_resolve_to_click_commands():
+    for command_name in LAZY_COMMANDS:
+        command = cli.get_command(None, command_name)
+        assert command is not None
+        assert command.name == command_name
+
+
+def test_help_does_not_import_checkov():
+    modules = _loaded_modules_after(["--help"])
+    assert not _is_loaded(modules, "checkov")
+
+
+def test_help_does_not_import_heavy_dependencies():
+    modules = _loaded_modules_after(["--help"])
+    for heavy in HEAVY_MODULES:
+        assert not _is_loaded(modules, heavy), f"{heavy} imported by `ftf --help`"
+
+
+def test_command_help_imports_only_that_command():
+    modules = _loaded_modules_after(["get-resources", "--help"])
+    assert "ftf_cli.commands.get_resources" in modules
+    assert "ftf_cli.commands.validate_directory" not in modules
+    assert not _is_loaded(modules, "checkov")
@@ -0,0 +1,192 @@
+import http.server
+import socket
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from ftf_cli.client import ControlPlaneClient, _not_connected, _retry_after, get_session, normalize_url
+from ftf_cli.operations import MultipartBody
+
+
+@pytest.fixture
+def session_request():
+    with patch("requests.Session.request") as request, patch("ftf_cli.client.time.sleep") as sleep:
+        request.sleep = sleep
+        yield request
+
+
+def response(status_code, headers=None):
+    return Mock(status_code=status_code, headers=headers or {})
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://cp.example.com", "https://cp.example.com"),
+        ("https://cp.example.com/", "https://cp.example.com"),
+        ("http://localhost:8080/api", "http://localhost:8080"),
+        ("cp.example.com", "https://cp.example.com"),
+        (" cp.example.com/ ", "https://cp.example.com"),
+    ],
+)
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_request_defaults(session_request, monkeypatch):
+    monkeypatch.setenv("FTF_CONNECT_TIMEOUT", "3")
+    monkeypatch.setenv("FTF_READ_TIMEOUT", "30.5")
+    session_request.return_value = response(200)
+
+    ControlPlaneClient("cp.example.com/", "user", "token").get("/api/me")
+
+    session_request.assert_called_once_with(
+        "GET", "https://cp.example.com/api/me", auth=("user", "token"), timeout=(3.0, 30.5)
+    )
+
+
+def test_retries_transient_failures(session_request):
+    session_request.side_effect = [
+        requests.exceptions.ConnectionError("reset"),
+        response(503, {"Retry-After": "2"}),
+        response(429),
+        response(200),
+    ]
+
+    result = ControlPlaneClient("https://cp.example.com", "user", "token", retries=3).get("/api/me")
+
+    assert result.status_code == 200
+    assert session_request.call_count == 4
+    delays = [call.args[0] for call in session_request.sleep.call_args_list]
+    assert delays[1] == 2.0
+    assert 0 <= delays[0] <= 0.5 and 0 <= delays[2] <= 2.0
+
+
+def test_returns_last_response_when_retries_run_out(session_request):
+    session_request.return_value = response(502)
+
+    result = ControlPlaneClient("https://cp.example.com", "user", "token", retries=2).get("/api/me")
+
+    assert result.status_code == 502
+    assert session_request.call_count == 3
+
+
+def test_does_not_retry_other_errors(session_request):
+    session_request.return_value = response(404)
+    client = ControlPlaneClient("https://cp.example.com", "user", "token", retries=2)
+
+    assert client.get("/api/me").status_code == 404
+    session_request.side_effect = requests.exceptions.ReadTimeout("slow")
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get("/api/me")
+    assert session_request.call_count == 2
+
+
+def test_connection_errors_raise_after_retries(session_request):
+    session_request.side_effect = requests.exceptions.ConnectionError("refused")
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        ControlPlaneClient("https://cp.example.com", "user", "token", retries=1).get("/api/me")
+    assert session_request.call_count == 2
+
+
+def test_posts_are_not_resent_once_they_may_have_been_processed(session_request):
+    client = ControlPlaneClient("https://cp.example.com", "user", "token", retries=2)
+
+    for status_code in (500, 502, 504):
+        session_request.reset_mock(side_effect=True)
+        session_request.return_value = response(status_code)
+        assert client.post("/cc-ui/v1/modules/upload", data=b"zip").status_code == status_code
+        assert session_request.call_count == 1
+
+    session_request.side_effect = requests.exceptions.ConnectionError("Connection reset by peer")
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post("/cc-ui/v1/modules/upload", data=b"zip")
+    assert session_request.call_count == 2
+
+
+def test_posts_are_retried_when_not_processed(session_request):
+    refused = requests.exceptions.ConnectionError(
+        MaxRetryError(None, "/upload", NewConnectionError(None, "Connection refused"))
+    )
+    session_request.side_effect = [
+        refused,
+        requests.exceptions.ConnectTimeout("connect timed out"),
+        response(429),
+        response(503),
+        response(200),
+    ]
+
+    result = ControlPlaneClient("https://cp.example.com", "user", "token", retries=4).post("/upload")
+
+    assert result.status_code == 200
+    assert session_request.call_count == 5
+
+
+def test_refused_connection_is_not_connected():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with pytest.raises(requests.exceptions.ConnectionError) as exc_info:
+        get_session().get(f"http://127.0.0.1:{port}/", timeout=5)
+
+    assert _not_connected(exc_info.value)
+    assert not _not_connected(requests.exceptions.ConnectionError("Connection reset by peer"))
+
+
+def test_retried_body_is_rewound(session_request):
+    bodies = []
+
+    def request(method, url, data, **kwargs):
+        bodies.append(data.read())
+        return response(503 if len(bodies) == 1 else 200)
+
+    session_request.side_effect = request
+
+    with MultipartBody([("metadata", "metadata.json", "application/json", b"{}")]) as body:
+        ControlPlaneClient("https://cp.example.com", "user", "token", retries=1).post("/upload", data=body)
+
+    assert len(bodies) == 2 and bodies[0] == bodies[1] and len(bodies[0]) == len(body)
+
+
+def test_retry_after_http_date():
+    assert _retry_after(response(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert _retry_after(response(503, {"Retry-After": "3600"})) == 30.0
+    assert _retry_after(response(503, {"Retry-After": "soon"})) is None
+
+
+def test_clients_share_connections():
+    connections = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}"
+        assert ControlPlaneClient(url, "user", "token").get("/api/me").status_code == 200
+        assert ControlPlaneClient(url, "user", "token").get("/cc-ui/v1/tf-outputs").status_code == 200
+    finally:
+        server.shutdown()
+        server.server_close()
+        get_session().close()
+
+    assert len(connections) == 1
@@ -0,0 +1,207 @@
+import shutil
+import subprocess
+
+import pytest
+
+from ftf_cli.hcl_format import _tokenize, format_hcl
+from ftf_cli.utils import format_terraform
+
+# (source, the `terraform fmt` output for it)
+CORPUS = {
+    "instance_variable": (
+        '''variable "instance" {
+  description = "The instance"
+  type = object({
+    kind    = string
+    flavor = string
+    version = string
+    spec = object({
+        size = object({
+          cpu = string,
+          memory = number
+        }),
+      replicas = number
+    })
+  })
+}
+''',
+        '''variable "instance" {
+  description = "The instance"
+  type = object({
+    kind    = string
+    flavor  = string
+    version = string
+    spec = object({
+      size = object({
+        cpu    = string,
+        memory = number
+      }),
+      replicas = number
+    })
+  })
+}
+''',
+    ),
+    "inputs_variable": (
+        '''
+variable "inputs" {
+  description = "A map of inputs requested by the module developer."
+  type        = object({
+    network = object({
+    attributes = object({
+        vpc_id = string,
+        subnet_ids = list(string)
+      }),
+    interfaces = object({
+    })
+  })
+  })
+}
+''',
+        '''
+variable "inputs" {
+  description = "A map of inputs requested by the module developer."
+  type = object({
+    network = object({
+      attributes = object({
+        vpc_id     = string,
+        subnet_ids = list(string)
+      }),
+      interfaces = object({
+      })
+    })
+  })
+}
+''',
+    ),
+    "blocks_and_comments": (
+        '''# Module variables
+variable   "environment" {
+    type = any # set by the platform
+    default =   {}
+
+  description="Environment"   // shown in the UI
+}
+variable "empty" { }
+''',
+        '''# Module variables
+variable "environment" {
+  type    = any # set by the platform
+  default = {}
+
+  description = "Environment" // shown in the UI
+}
+variable "empty" {}
+''',
+    ),
+    "expressions": (
+        '''locals {
+  names = [ for k , v in var.items : upper( v.name ) if ! v.disabled ]
+  by_key = { for k, v in var.items : k => v... }
+  first = var.list [0].id
+  ids = aws_instance.web[ * ].id
+  label = "${ var.prefix }-${var.name}"
+  count = var.enabled ? 1 : 0
+  offset = var.a - 1
+  negative = -1
+  object = {a=1, b="two"}
+}
+''',
+        '''locals {
+  names    = [for k, v in var.items : upper(v.name) if !v.disabled]
+  by_key   = { for k, v in var.items : k => v... }
+  first    = var.list[0].id
+  ids      = aws_instance.web[*].id
+  label    = "${var.prefix}-${var.name}"
+  count    = var.enabled ? 1 : 0
+  offset   = var.a - 1
+  negative = -1
+  object   = { a = 1, b = "two" }
+}
+''',
+    ),
+    "heredoc": (
+        '''locals {
+  policy = <<-EOT
+      keep   ${ this }
+    exactly
+  EOT
+   name = "x"
+}
+''',
+        '''locals {
+  policy = <<-EOT
+      keep   ${ this }
+    exactly
+  EOT
+  name   = "x"
+}
+''',
+    ),
+}
+
+
+@pytest.mark.parametrize("source, expected", CORPUS.values(), ids=CORPUS.keys())
+def test_format_hcl(source, expected):
+    assert format_hcl(source) == expected
+
+
+@pytest.mark.parametrize("source, expected", CORPUS.values(), ids=CORPUS.keys())
+def test_format_hcl_is_idempotent(source, expected):
+    assert format_hcl(expected) == expected
+
+
+@pytest.mark.parametrize("source, expected", CORPUS.values(), ids=CORPUS.keys())
+def test_format_hcl_only_changes_whitespace(source, expected):
+    def texts(tokens):
+        return [(token.type, token.text) for token in tokens]
+
+    assert texts(_tokenize(format_hcl(source))) == texts(_tokenize(source))
+
+
+@pytest.mark.skipif(shutil.which("terraform") is None, reason="terraform is not installed")
+@pytest.mark.parametrize("source, expected", CORPUS.values(), ids=CORPUS.keys())
+def test_format_hcl_matches_terraform_fmt(source, expected):
+    process = subprocess.run(
+        ["terraform", "fmt", "-"], input=source, capture_output=True, text=True, check=True
+    )
+    assert format_hcl(source) == process.stdout
+
+
+@pytest.mark.parametrize(
+    "source",
+    ['x = "unterminated\n', "x = 1 /* open", "x = <<EOT\nno end\n", "x = 1 @ 2\n"],
+)
+def test_format_hcl_rejects_invalid_source(source):
+    with pytest.raises(ValueError):
+        format_hcl(source)
+
+
+def test_format_terraform_splits_single_line_objects():
+    source = (
+        'variable "inputs" {\n'
+        "  type        = object({\n"
+        "    db = object({ attributes = object({\n"
+        "        host = string\n"
+        "      }), interfaces = object({}) })\n"
+        "  })\n"
+        "}\n"
+    )
+
+    assert format_terraform(source) == (
+        'variable "inputs" {\n'
+        "  type = object({\n"
+        "    db = object({\n"
+        "      attributes = object({\n"
+        "        host = string\n"
+        "      }),\n"
+        "      interfaces = object({\n"
+        "      })\n"
+        "    })\n"
+        "  })\n"
+        "}\n"
+    )
+
+
+def test_format_terraform_keeps_invalid_source():
+    assert format_terraform('x = "unterminated\n') == 'x = "unterminated\n'
@@ -0,0 +1,172 @@
+import hcl2
+import pytest
+
+from ftf_cli.hcl_scan import AmbiguousSource, scan_resources
+from ftf_cli.utils import _declared_resources
+
+# Sources the scanner must read exactly as python-hcl2 does.
+CORPUS = {
+    "meta_arguments": '''
+resource "aws_s3_bucket" "counted" {
+  count  = 2
+  bucket = "b"
+}
+resource "aws_sqs_queue" "each" {
+  for_each = var.queues
+}
+resource "aws_sns_topic" "both" {
+  for_each = local.settings.topics
+  count    = 1.5
+}
+resource "null_resource" "flags" {
+  count = true
+}
+resource "aws_iam_role" "plain" {
+  name = "plain"
+}
+''',
+    "expressions": '''
+resource "aws_instance" "conditional" {
+  count = var.enabled ? 1 : 0 # only when enabled
+}
+resource "aws_instance" "function" {
+  for_each = toset(["a", "b"])
+}
+resource "aws_instance" "negative" {
+  count = -1
+}
+resource "aws_instance" "indexed" {
+  count = var.counts[0]
+}
+resource "aws_instance" "object" {
+  for_each = {
+    a = 1
+    b = "two"
+  }
+}
+resource "aws_instance" "string" {
+  count = "3"
+}
+resource "aws_instance" "template" {
+  for_each = "x-${var.name}"
+}
+''',
+    "braces_in_strings_and_comments": '''
+# resource "commented" "out" {
+resource "aws_s3_bucket" "strings" {
+  bucket = "a { b } c"
+  tags = {
+    Name  = "x-${var.name} }"
+    Group = "{ ${var.groups[0]} ${var.owner} {"
+  }
+  // }
+  /* resource "not" "real" { count = 1 } */
+  count = 1
+}
+''',
+    "heredocs": '''
+resource "aws_iam_policy" "policy" {
+  policy = <<-EOT
+    {
+      "Statement": [{ "Effect": "Allow" }]
+    resource "not" "real" {
+  EOT
+  count  = 3
+}
+resource "aws_iam_policy" "after" {
+  policy = <<EOT
+}
+EOT
+}
+''',
+    "nested_and_other_blocks": '''
+terraform {
+  required_providers {
+    aws = { source = "hashicorp/aws" }
+  }
+}
+locals {
+  count = 5
+}
+data "aws_caller_identity" "current" {}
+resource aws_s3_bucket unquoted {
+  lifecycle_rule {
+    count = 7
+    expiration { days = 30 }
+  }
+  dynamic "tag" {
+    for_each = var.tags
+    content {
+      key = tag.key
+    }
+  }
+}
+resource "aws_s3_bucket" "single_line" { count = 4 }
+module "nested" {
+  source = "./nested"
+  count  = 2
+}
+''',
+}
+
+
+def _full_parse(source):
+    return _declared_resources(hcl2.loads(source))
+
+
+@pytest.mark.parametrize("source", CORPUS.values(), ids=CORPUS.keys())
+def test_matches_full_parse(source):
+    assert scan_resources(source) == _full_parse(source)
+
+
+def test_meta_arguments():
+    resources = scan_resources(CORPUS["meta_arguments"])
+
+    assert resources == [
+        ("aws_s3_bucket", "counted", {"count": [2]}),
+        ("aws_sqs_queue", "each", {"for_each": ["${var.queues}"]}),
+        ("aws_sns_topic", "both", {"for_each": ["${local.settings.topics}"], "count": [1.5]}),
+        ("null_resource", "flags", {"count": [True]}),
+        ("aws_iam_role", "plain", {}),
+    ]
+
+
+def test_only_top_level_meta_arguments():
+    resources = scan_resources(CORPUS["nested_and_other_blocks"])
+
+    assert resources == [
+        ("aws_s3_bucket", "unquoted", {}),
+        ("aws_s3_bucket", "single_line", {"count": [4]}),
+    ]
+
+
+def test_meta_argument_values_are_copies():
+    source = 'resource "a" "b" {\n  for_each = { x = 1 }\n}\n'
+    scan_resources(source)[0][2]["for_each"][0]["x"] = 2
+
+    assert scan_resources(source)[0][2] == {"for_each": [{"x": 1}]}
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        'resource "a" "b" {\n',
+        'resource "a" "b" {}\n}\n',
+        'resource "a" {}\n',
+        'resource "a" "b" "c" {}\n',
+        'resource "a" "b" {\n  count = 1\n  count = 2\n}\n',
+        'resource "a" "b" {\n  count {}\n}\n',
+        'resource "a" "b" {\n  count =\n}\n',
+        'resource "a\\"b" "c" {}\n',
+        'resource "a" "b" {\n  name = "unterminated\n}\n',
+        'resource "a" "b" {\n  policy = <<EOT\n}\n',
+        'resource "a" "b" {\n  policy = <<EOT\r\nx\r\nEOT\r\n}\n',
+        'resource "a" "b" {} /* open',
+        "= nope\n",
+        'resource "a" "b" {\n  count = 1 @ 2\n}\n',
+        'resource "a" "b" {\n  count = var.enabled ? 1\n}\n',
+    ],
+)
+def test_ambiguous_source(source):
+    with pytest.raises(AmbiguousSource):
+        scan_resources(source)
@@ -0,0 +1,53 @@
+import pytest
+
+from ftf_cli.ignore import IgnoreRules
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, ignored",
+    [
+        ("*.log", "debug.log", False, True),
+        ("*.log", "logs/debug.log", False, True),
+        ("*.log", "debug.log.txt", False, False),
+        ("fixtures/", "tests/fixtures", True, True),
+        ("fixtures/", "tests/fixtures", False, False),
+        ("/build", "build", True, True),
+        ("/build", "src/build", True, False),
+        ("docs/*.md", "docs/a.md", False, True),
+        ("docs/*.md", "docs/sub/a.md", False, False),
+        ("**/charts", "a/b/charts", True, True),
+        ("**/charts", "charts", True, True),
+        ("assets/**", "assets/img/a.png", False, True),
+        ("assets/**", "assets", True, False),
+        ("a/**/b", "a/b", False, True),
+        ("a/**/b", "a/x/y/b", False, True),
+        ("file?.tf", "file1.tf", False, True),
+        ("file?.tf", "file10.tf", False, False),
+        ("file[0-9].tf", "file7.tf", False, True),
+        ("file[!0-9].tf", "file7.tf", False, False),
+        ("\\#notes", "#notes", False, True),
+        ("# comment", "# comment", False, False),
+        ("trailing.txt   ", "trailing.txt", False, True),
+    ],
+)
+def test_patterns(pattern, path, is_dir, ignored):
+    assert IgnoreRules([pattern]).ignored(path, is_dir) is ignored
+
+
+def test_last_matching_rule_wins():
+    rules = IgnoreRules(["*.tgz", "!charts/*.tgz", "charts/big.tgz"])
+
+    assert rules.ignored("vendor.tgz")
+    assert not rules.ignored("charts/small.tgz")
+    assert rules.ignored("charts/big.tgz")
+
+
+def test_module_rules(tmp_path):
+    (tmp_path / ".facetsignore").write_text("# large fixtures\ntests/fixtures/\n!node_modules/\n")
+    rules = IgnoreRules.for_module(str(tmp_path))
+
+    assert rules.ignored(".git", is_dir=True)
+    assert rules.ignored("main.tf.swp")
+    assert rules.ignored("tests/fixtures", is_dir=True)
+    assert not rules.ignored("node_modules", is_dir=True)
+    assert not rules.ignored("main.tf")
@@ -0,0 +1,78 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from ftf_cli import module
+from ftf_cli.module import Module
+from ftf_cli.terraform import init_fingerprint
+from ftf_cli.utils import discover_resources, validate_facets_tf_vars
+
+
+@pytest.fixture
+def parsers():
+    with patch("ftf_cli.module._parse_yaml", wraps=module._parse_yaml) as parse_yaml, \
+            patch("ftf_cli.module._parse_hcl2", wraps=module._parse_hcl2) as parse_hcl2, \
+            patch("ftf_cli.module._parse_hcl", wraps=module._parse_hcl) as parse_hcl:
+        yield {"yaml": parse_yaml, "hcl2": parse_hcl2, "hcl": parse_hcl}
+
+
+def test_files_are_parsed_once(temp_module_dir, parsers):
+    first = Module(temp_module_dir).load_yaml()
+    second = Module(temp_module_dir).load_yaml()
+
+    assert first == second
+    assert parsers["yaml"].call_count == 1
+
+
+def test_parsed_results_are_copies(temp_module_dir):
+    Module(temp_module_dir).load_yaml()["intent"] = "changed"
+    Module(temp_module_dir).load_hcl2("main.tf")["resource"].clear()
+
+    assert Module(temp_module_dir).load_yaml()["intent"] == "test-intent"
+    assert Module(temp_module_dir).load_hcl2("main.tf")["resource"]
+
+
+def test_changed_files_are_read_again(temp_module_dir, parsers):
+    Module(temp_module_dir).load_yaml()
+    with open(os.path.join(temp_module_dir, "facets.yaml"), "a") as f:
+        f.write("description: changed\n")
+
+    assert Module(temp_module_dir).load_yaml()["description"] == "changed"
+    assert parsers["yaml"].call_count == 2
+
+
+def test_parse_errors_are_not_cached(temp_module_dir, parsers):
+    parsers["hcl2"].side_effect = [ValueError("boom"), {"resource": []}]
+
+    with pytest.raises(ValueError):
+        Module(temp_module_dir).load_hcl2("main.tf")
+    assert Module(temp_module_dir).load_hcl2("main.tf") == {"resource": []}
+
+
+def test_missing_file(temp_module_dir):
+    with pytest.raises(FileNotFoundError):
+        Module(temp_module_dir).read("missing.tf")
+
+
+def test_commands_share_parsed_files(temp_module_dir, parsers):
+    init_fingerprint(temp_module_dir)
+    discover_resources(temp_module_dir)
+    with patch("ftf_cli.utils.REQUIRED_TF_FACETS_VARS", ["region"]):
+        validate_facets_tf_vars(temp_module_dir, use_cache=False)
+        validate_facets_tf_vars(temp_module_dir, use_cache=False)
+
+    assert parsers["hcl2"].call_count == len(Module(temp_module_dir).tf_files()) == 3
+    assert parsers["hcl"].call_count == 1
+
+
+def test_windows_line_endings(temp_module_dir):
+    variables_tf = os.path.join(temp_module_dir, "variables.tf")
+    with open(variables_tf, "r") as f:
+        content = f.read()
+    with open(variables_tf, "w", newline="\r\n") as f:
+        f.write(content)
+
+    assert "\r" not in Module(temp_module_dir).read("variables.tf")
+    with patch("ftf_cli.utils.REQUIRED_TF_FACETS_VARS", ["region"]):
+        validate_facets_tf_vars(temp_module_dir, use_cache=False)
@@ -1,34 +1,40 @@
+import email.parser
+import io
+import json
 import pytest
 import tempfile
 import os
+import tracemalloc
+import zipfile
 from unittest.mock import Mock, patch
 from ftf_cli.operations import (
     register_module,
     publish_module,
     ModuleOperationError,
-    cleanup_terraform_files,
+    MultipartBody,
+    module_archive_files,
     create_module_zip,
+    forget_module_upload,
+    module_upload_key,
 )
 
 
-class TestModuleOperations:
-
-    def test_cleanup_terraform_files(self):
-        """Test that terraform files are properly cleaned up"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create test terraform files
-            terraform_dir = os.path.join(temp_dir, ".terraform")
-            os.makedirs(terraform_dir)
-
-            lock_file = os.path.join(temp_dir, ".terraform.lock.hcl")
-            with open(lock_file, "w") as f:
-                f.write("test")
+def parse_multipart(body, content_type):
+    """Return {field name: (filename, content type, content)} of a multipart body."""
+    message = email.parser.BytesParser().parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body
+    )
+    return {
+        part.get_param("name", header="content-disposition"): (
+            part.get_filename(),
+            part.get_content_type(),
+            part.get_payload(decode=True),
+        )
+        for part in message.get_payload()
+    }
 
-            # Cleanup should remove these files
-            cleanup_terraform_files(temp_dir)
 
-            assert not os.path.exists(terraform_dir)
-            assert not os.path.exists(lock_file)
+class TestModuleOperations:
 
     def test_create_module_zip(self):
         """Test module zip creation"""
@@ -47,7 +53,228 @@ class TestModuleOperations:
                 if os.path.exists(zip_path):
                     os.remove(zip_path)
 
-    @patch("requests.post")
+    def test_create_module_zip_excludes_terraform_files(self, tmp_path):
+        """Test terraform working files are left out of the zip but not deleted"""
+        for name in [
+            "main.tf",
+            ".terraform.lock.hcl",
+            ".terraform/providers/aws",
+            "nested/.terraform/modules/modules.json",
+            "nested/.terraform.lock.hcl",
+            "nested/variables.tf",
+        ]:
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text(name)
+
+        zip_path = create_module_zip(str(tmp_path))
+        try:
+            with zipfile.ZipFile(zip_path) as zipf:
+                assert sorted(zipf.namelist()) == ["main.tf", "nested/variables.tf"]
+        finally:
+            os.remove(zip_path)
+
+        assert (tmp_path / ".terraform/providers/aws").exists()
+        assert (tmp_path / "nested/.terraform.lock.hcl").exists()
+
+    def test_module_archive_files_applies_ignore_rules(self, tmp_path):
+        """Test default and .facetsignore rules decide which files are archived"""
+        for name in [
+            "main.tf",
+            ".git/HEAD",
+            "node_modules/pkg/index.js",
+            "main.tf.swp",
+            "tests/fixtures/big.bin",
+            "tests/test.tftest.hcl",
+        ]:
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text(name)
+        (tmp_path / ".facetsignore").write_text("tests/fixtures/\n")
+
+        assert [arcname for _, arcname in module_archive_files(str(tmp_path))] == [
+            ".facetsignore",
+            "main.tf",
+            "tests/test.tftest.hcl",
+        ]
+
+    def test_module_archive_files_survives_symlink_loops(self, tmp_path):
+        """Test symlinked directories are archived but symlink loops are not followed"""
+        (tmp_path / "modules" / "shared").mkdir(parents=True)
+        (tmp_path / "modules" / "shared" / "main.tf").write_text("")
+        (tmp_path / "modules" / "shared" / "loop").symlink_to(tmp_path / "modules")
+        (tmp_path / "shared").symlink_to(tmp_path / "modules" / "shared")
+
+        assert [arcname for _, arcname in module_archive_files(str(tmp_path))] == [
+            "modules/shared/main.tf",
+            "shared/main.tf",
+        ]
+
+    def test_create_module_zip_is_reproducible(self, tmp_path):
+        """Test identical files give identical archives regardless of mtimes"""
+        (tmp_path / "modules").mkdir()
+        (tmp_path / "main.tf").write_text("main")
+        (tmp_path / "modules" / "setup.sh").write_text("#!/bin/sh\n")
+        os.chmod(tmp_path / "modules" / "setup.sh", 0o700)
+
+        zip_paths = [create_module_zip(str(tmp_path))]
+        os.utime(tmp_path / "main.tf", (1_000_000_000, 1_000_000_000))
+        zip_paths.append(create_module_zip(str(tmp_path)))
+        try:
+            with open(zip_paths[0], "rb") as first, open(zip_paths[1], "rb") as second:
+                assert first.read() == second.read()
+            with zipfile.ZipFile(zip_paths[0]) as zipf:
+                assert zipf.testzip() is None
+                infos = zipf.infolist()
+                assert [info.filename for info in infos] == ["main.tf", "modules/setup.sh"]
+                assert {info.date_time for info in infos} == {(1980, 1, 1, 0, 0, 0)}
+                assert [info.external_attr >> 16 & 0o777 for info in infos] == [0o644, 0o755]
+                assert zipf.read("modules/setup.sh") == b"#!/bin/sh\n"
+        finally:
+            for zip_path in zip_paths:
+                os.remove(zip_path)
+
+    def test_create_module_zip_compression(self, tmp_path):
+        """Test compressed assets are stored and the order and content do not depend on the workers"""
+        text = b"resource \"aws_s3_bucket\" \"bucket\" {}\n" * 1000
+        for i in range(12):
+            (tmp_path / f"file{i:02}.tf").write_bytes(text)
+        (tmp_path / "chart.tgz").write_bytes(text)
+        (tmp_path / "logo.PNG").write_bytes(text)
+
+        zip_paths = [
+            create_module_zip(str(tmp_path), jobs=1),
+            create_module_zip(str(tmp_path), jobs=4),
+            create_module_zip(str(tmp_path), compression_level=0),
+            create_module_zip(str(tmp_path), compression_level=9),
+        ]
+        try:
+            contents = []
+            for zip_path in zip_paths:
+                with open(zip_path, "rb") as f:
+                    contents.append(f.read())
+            assert contents[0] == contents[1]
+            assert len(contents[3]) <= len(contents[0]) < len(contents[2])
+
+            with zipfile.ZipFile(zip_paths[0]) as zipf:
+                assert zipf.testzip() is None
+                assert zipf.namelist() == ["chart.tgz"] + [f"file{i:02}.tf" for i in range(12)] + ["logo.PNG"]
+                types = {info.filename: info.compress_type for info in zipf.infolist()}
+                assert types["chart.tgz"] == types["logo.PNG"] == zipfile.ZIP_STORED
+                assert types["file00.tf"] == zipfile.ZIP_DEFLATED
+                assert all(zipf.read(name) == text for name in zipf.namelist())
+        finally:
+            for zip_path in zip_paths:
+                os.remove(zip_path)
+
+    def test_create_module_zip_without_precompressed_writes(self, tmp_path):
+        """Test Python versions without checked ZipFile internals fall back to writestr with the same bytes"""
+        (tmp_path / "main.tf").write_bytes(b"resource \"null_resource\" \"a\" {}\n" * 100)
+        (tmp_path / "chart.tgz").write_bytes(b"chart")
+        (tmp_path / "setup.sh").write_text("#!/bin/sh\n")
+        os.chmod(tmp_path / "setup.sh", 0o755)
+
+        zip_paths = [create_module_zip(str(tmp_path), extra_files={"facets.yaml": b"version: 1.0\n"})]
+        with patch("ftf_cli.operations.PRECOMPRESSED_WRITE_VERSIONS", ()), \
+                patch("ftf_cli.operations._write_archive_entry") as write_archive_entry:
+            zip_paths.append(create_module_zip(str(tmp_path), extra_files={"facets.yaml": b"version: 1.0\n"}))
+        write_archive_entry.assert_not_called()
+        try:
+            contents = []
+            for zip_path in zip_paths:
+                with zipfile.ZipFile(zip_path) as zipf:
+                    assert zipf.testzip() is None
+                with open(zip_path, "rb") as f:
+                    contents.append(f.read())
+            assert contents[0] == contents[1]
+        finally:
+            for zip_path in zip_paths:
+                os.remove(zip_path)
+
+    def test_create_module_zip_extra_files(self, tmp_path):
+        """Test in-memory files are archived in place of files of the module directory"""
+        (tmp_path / "facets.yaml").write_text("version: 1.0\n")
+        (tmp_path / "main.tf").write_text("")
+
+        zip_path = create_module_zip(
+            str(tmp_path),
+            extra_files={"facets.yaml": b"version: 1.0-local\n", "output-lookup-tree.json": b"{}"},
+        )
+        try:
+            with zipfile.ZipFile(zip_path) as zipf:
+                assert zipf.namelist() == ["facets.yaml", "main.tf", "output-lookup-tree.json"]
+                assert zipf.read("facets.yaml") == b"version: 1.0-local\n"
+                assert zipf.read("output-lookup-tree.json") == b"{}"
+        finally:
+            os.remove(zip_path)
+
+        assert sorted(os.listdir(tmp_path)) == ["facets.yaml", "main.tf"]
+        assert (tmp_path / "facets.yaml").read_text() == "version: 1.0\n"
+
+    @patch("requests.Session.request")
+    def test_register_module_skips_unchanged_upload(self, mock_post):
+        """Test an upload is skipped when the archive is unchanged since the last successful one"""
+        mock_post.return_value = Mock(status_code=200)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, "facets.yaml"), "w") as f:
+                f.write("intent: test\nflavor: default\nversion: 1.0\n")
+
+            def register(**kwargs):
+                return register_module(
+                    control_plane_url="https://test.example.com",
+                    username="testuser",
+                    token="testtoken",
+                    path=temp_dir,
+                    upload_cache_key="key",
+                    **kwargs,
+                )
+
+            assert register() is True
+            assert register() is False
+            assert mock_post.call_count == 1
+
+            # Changed metadata or files are uploaded again
+            assert register(git_ref="main") is True
+            with open(os.path.join(temp_dir, "main.tf"), "w") as f:
+                f.write("")
+            assert register(git_ref="main") is True
+            assert mock_post.call_count == 3
+
+            # A failed upload is not recorded
+            mock_post.return_value = Mock(status_code=500)
+            with open(os.path.join(temp_dir, "main.tf"), "w") as f:
+                f.write("changed")
+            with pytest.raises(ModuleOperationError):
+                register(git_ref="main")
+            mock_post.return_value = Mock(status_code=200)
+            assert register(git_ref="main") is True
+            assert mock_post.call_count == 5
+
+    @patch("requests.Session.request")
+    def test_forget_module_upload(self, mock_post, tmp_path):
+        """Test a forgotten upload, e.g. after delete-module, is uploaded again"""
+        mock_post.return_value = Mock(status_code=200)
+        module_dir = tmp_path / "module"
+        module_dir.mkdir()
+        (module_dir / "facets.yaml").write_text("intent: test\nflavor: default\nversion: 1.0\n")
+        module_version = ("default", "https://test.example.com", "testuser", "test", "default", "1.0")
+        key = module_upload_key(*module_version)
+
+        def register():
+            return register_module(
+                control_plane_url="https://test.example.com",
+                username="testuser",
+                token="testtoken",
+                path=str(module_dir),
+                upload_cache_key=key,
+            )
+
+        assert register() is True
+        assert register() is False
+        forget_module_upload(*module_version)
+        assert register() is True
+        assert module_upload_key(*module_version[:-1], "1.1") != key
+
+    @patch("requests.Session.request")
     def test_register_module_success(self, mock_post):
         """Test successful module registration"""
         # Mock successful response
@@ -72,7 +299,7 @@ class TestModuleOperations:
             # Verify the request was made
             mock_post.assert_called_once()
 
-    @patch("requests.post")
+    @patch("requests.Session.request")
     def test_register_module_error(self, mock_post):
         """Test module registration error handling"""
         # Mock error response
@@ -95,7 +322,68 @@ class TestModuleOperations:
                     path=temp_dir,
                 )
 
-    @patch("requests.post")
+    @patch("requests.Session.request")
+    def test_register_module_streams_multipart_body(self, mock_post):
+        """Test the zip and metadata are sent as a streamed multipart body"""
+        sent = {}
+
+        def post(method, url, headers, data, **kwargs):
+            assert (method, url) == ("POST", "https://test.example.com/cc-ui/v1/modules/upload")
+            assert kwargs["auth"] == ("testuser", "testtoken")
+            sent["length"] = len(data)
+            sent["body"] = data.read()
+            sent["content_type"] = headers["Content-Type"]
+            return Mock(status_code=200)
+
+        mock_post.side_effect = post
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, "facets.yaml"), "w") as f:
+                f.write("intent: test\nflavor: default\nversion: 1.0\n")
+
+            register_module(
+                control_plane_url="https://test.example.com",
+                username="testuser",
+                token="testtoken",
+                path=temp_dir,
+                git_url="https://github.com/org/repo",
+                auto_create=True,
+            )
+
+        assert len(sent["body"]) == sent["length"]
+        parts = parse_multipart(sent["body"], sent["content_type"])
+        filename, content_type, content = parts["file"]
+        assert (filename, content_type) == ("module.zip", "application/zip")
+        assert zipfile.ZipFile(io.BytesIO(content)).namelist() == ["facets.yaml"]
+        assert parts["metadata"][:2] == ("metadata.json", "application/json")
+        assert json.loads(parts["metadata"][2]) == {
+            "gitUrl": "https://github.com/org/repo",
+            "featureBranch": False,
+            "autoCreate": True,
+            "skipOutputWrite": False,
+        }
+
+    def test_multipart_body_memory_does_not_grow_with_file_size(self, tmp_path):
+        """Test reading a multipart body keeps only a chunk of a large file in memory"""
+        large_file = tmp_path / "large.bin"
+        with open(large_file, "wb") as f:
+            for _ in range(32):
+                f.write(os.urandom(1024 * 1024))
+
+        with MultipartBody([("file", "module.zip", "application/zip", str(large_file))]) as body:
+            tracemalloc.start()
+            try:
+                total = 0
+                while chunk := body.read(8192):
+                    total += len(chunk)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        assert total == len(body)
+        assert peak < 1024 * 1024
+
+    @patch("requests.Session.request")
     def test_publish_module_success(self, mock_post):
         """Test successful module publishing"""
         # Mock successful response
@@ -116,7 +404,7 @@ class TestModuleOperations:
         # Verify the request was made
         mock_post.assert_called_once()
 
-    @patch("requests.post")
+    @patch("requests.Session.request")
     def test_publish_module_error(self, mock_post):
         """Test module publishing error handling"""
         # Mock error response
@@ -0,0 +1,137 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from ftf_cli import server
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to ~100 characters, so avoid pytest's long tmp_path.
+    directory = tempfile.mkdtemp(prefix="ftf-")
+    yield os.path.join(directory, "ftf.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def running_server(socket_path, monkeypatch):
+    monkeypatch.delenv(server.DISABLE_ENV, raising=False)
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=server.serve,
+        kwargs={"socket_path": socket_path, "warm": False, "on_ready": lambda _: ready.set()},
+        daemon=True,
+    )
+    thread.start()
+    assert ready.wait(10), "ftf server did not start"
+    yield socket_path
+    server.stop(socket_path)
+    thread.join(10)
+
+
+def _forward(argv, socket_path):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = server.forward(argv, stdout=stdout, stderr=stderr, socket_path=socket_path)
+    return exit_code, stdout.getvalue(), stderr.getvalue()
+
+
+def test_forward_runs_command_on_server(running_server, temp_module_dir):
+    exit_code, stdout, _ = _forward(["get-resources", temp_module_dir], running_server)
+
+    assert exit_code == 0
+    assert "Found 1 resources:" in stdout
+    assert "aws_s3_bucket.test_bucket" in stdout
+
+
+def test_forward_uses_client_working_directory(running_server, temp_module_dir, monkeypatch):
+    monkeypatch.chdir(temp_module_dir)
+
+    exit_code, stdout, _ = _forward(["get-resources", "."], running_server)
+
+    assert exit_code == 0
+    assert "aws_s3_bucket.test_bucket" in stdout
+
+
+def test_forward_relays_exit_code_and_stderr(running_server, tmp_path):
+    missing = str(tmp_path / "missing")
+
+    exit_code, _, stderr = _forward(["validate-facets", missing], running_server)
+
+    assert exit_code == 2
+    assert "does not exist" in stderr
+
+
+def test_forward_falls_back_without_server(socket_path, monkeypatch):
+    monkeypatch.delenv(server.DISABLE_ENV, raising=False)
+    assert server.forward(["get-resources", "."], socket_path=socket_path) is None
+
+
+def test_forward_skips_commands_that_are_not_forwarded(running_server):
+    assert server.forward(["login"], socket_path=running_server) is None
+    assert server.forward([], socket_path=running_server) is None
+
+
+def test_forward_disabled_by_environment(running_server, monkeypatch):
+    monkeypatch.setenv(server.DISABLE_ENV, "1")
+    assert server.forward(["get-resources", "."], socket_path=running_server) is None
+
+
+def test_stop_shuts_down_server(running_server):
+    assert server.stop(running_server) is True
+    assert server.stop(running_server) is False
+
+
+def test_serve_replaces_stale_socket(socket_path):
+    import socket
+
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=server.serve,
+        kwargs={"socket_path": socket_path, "warm": False, "on_ready": lambda _: ready.set()},
+        daemon=True,
+    )
+    thread.start()
+    assert ready.wait(10)
+    assert server.stop(socket_path) is True
+    thread.join(10)
+    assert not os.path.exists(socket_path)
+
+
+def test_module_files_are_not_kept_between_requests(running_server, temp_module_dir):
+    from ftf_cli import module
+
+    module.clear()
+    exit_code, _, _ = _forward(["get-resources", temp_module_dir], running_server)
+
+    assert exit_code == 0
+    assert not module._files
+
+
+def test_outdated_server_stops(running_server, temp_module_dir):
+    stderr = io.StringIO()
+    with patch("ftf_cli.server._package_identity", return_value={"version": "0.0.0", "source": "changed"}):
+        exit_code = server.forward(["get-resources", temp_module_dir], stderr=stderr, socket_path=running_server)
+
+    assert exit_code is None
+    assert "outdated code" in stderr.getvalue()
+    assert server.stop(running_server) is False
+
+
+def test_terraform_is_found_again_for_each_request(running_server, temp_module_dir, monkeypatch):
+    from ftf_cli.terraform import find_terraform
+
+    monkeypatch.setenv("PATH", "")
+    find_terraform()
+    exit_code, _, _ = _forward(["get-resources", temp_module_dir], running_server)
+
+    assert exit_code == 0
+    assert find_terraform.cache_info().currsize == 0
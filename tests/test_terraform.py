@@ -0,0 +1,221 @@
+import os
+import threading
+import time
+
+import click
+import pytest
+
+from ftf_cli import terraform
+
+
+@pytest.fixture
+def fake_terraform(monkeypatch, tmp_path):
+    """A terraform executable on PATH that counts its runs."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    binary = bin_dir / "terraform"
+    calls = tmp_path / "calls"
+    binary.write_text(f'#!/bin/sh\necho run >> "{calls}"\necho "Terraform v1.9.2"\necho "on linux_amd64"\n')
+    binary.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+    terraform.find_terraform.cache_clear()
+    yield binary, lambda: len(calls.read_text().splitlines()) if calls.exists() else 0
+    terraform.find_terraform.cache_clear()
+
+
+def test_find_terraform(fake_terraform):
+    binary, calls = fake_terraform
+
+    assert terraform.find_terraform() == (str(binary), "1.9.2")
+    assert terraform.find_terraform() == (str(binary), "1.9.2")
+    assert calls() == 1
+
+    # A new process reuses the version cached for the unchanged binary.
+    terraform.find_terraform.cache_clear()
+    assert terraform.find_terraform() == (str(binary), "1.9.2")
+    assert calls() == 1
+
+
+def test_find_terraform_rechecks_replaced_binary(fake_terraform):
+    binary, calls = fake_terraform
+    terraform.find_terraform()
+
+    binary.write_text(binary.read_text().replace("v1.9.2", "v1.10.0"))
+    os.utime(binary, ns=(0, 0))
+    terraform.find_terraform.cache_clear()
+
+    assert terraform.find_terraform().version == "1.10.0"
+    assert calls() == 2
+
+
+def test_find_terraform_broken_binary(fake_terraform):
+    binary, calls = fake_terraform
+    binary.write_text("#!/bin/sh\nexit 1\n")
+
+    assert terraform.find_terraform() is None
+    with pytest.raises(click.UsageError, match="Terraform is not installed"):
+        terraform.require_terraform()
+
+
+def test_require_terraform_missing(monkeypatch, tmp_path):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    terraform.find_terraform.cache_clear()
+    try:
+        with pytest.raises(click.UsageError, match="Terraform is not installed"):
+            terraform.require_terraform()
+    finally:
+        terraform.find_terraform.cache_clear()
+
+
+def test_init_env_uses_shared_plugin_cache(monkeypatch, tmp_path):
+    monkeypatch.delenv("TF_CLI_CONFIG_FILE", raising=False)
+
+    env = terraform.init_env()
+
+    assert env["TF_PLUGIN_CACHE_DIR"] == str(tmp_path / "plugin-cache")
+    assert os.path.isdir(env["TF_PLUGIN_CACHE_DIR"])
+    assert env["TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE"] == "true"
+    assert "TF_CLI_CONFIG_FILE" not in env
+
+
+def test_init_env_default_plugin_cache(monkeypatch, tmp_path):
+    monkeypatch.delenv("TF_PLUGIN_CACHE_DIR")
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+
+    env = terraform.init_env()
+
+    assert env["TF_PLUGIN_CACHE_DIR"] == str(tmp_path / "home" / ".facets" / "terraform" / "plugin-cache")
+
+
+def test_init_env_keeps_explicit_lock_file_setting(monkeypatch):
+    monkeypatch.setenv("TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE", "false")
+    assert terraform.init_env()["TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE"] == "false"
+
+
+@pytest.mark.parametrize("from_env", [False, True])
+def test_provider_mirror_config(monkeypatch, tmp_path, from_env):
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    if from_env:
+        monkeypatch.setenv(terraform.PROVIDER_MIRROR_ENV, str(mirror))
+        env = terraform.init_env()
+    else:
+        env = terraform.init_env(str(mirror))
+
+    with open(env["TF_CLI_CONFIG_FILE"]) as f:
+        config = f.read()
+    assert "filesystem_mirror" in config
+    assert f'path = "{mirror}"' in config
+
+
+def test_missing_provider_mirror(tmp_path):
+    with pytest.raises(click.UsageError):
+        terraform.init_env(str(tmp_path / "missing"))
+
+
+def test_plugin_cache_lock_is_exclusive():
+    pytest.importorskip("fcntl")
+    events = []
+
+    def hold(name):
+        with terraform.plugin_cache_lock():
+            events.append(f"{name} start")
+            time.sleep(0.05)
+            events.append(f"{name} end")
+
+    threads = [threading.Thread(target=hold, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert events[0].split()[0] == events[1].split()[0]
+    assert events[2].split()[0] == events[3].split()[0]
+
+
+MAIN_TF = """
+terraform {
+  required_providers {
+    aws = { source = "hashicorp/aws", version = "~> 5.0" }
+  }
+}
+
+module "network" {
+  source = "./modules/network"
+}
+
+resource "aws_s3_bucket" "bucket" {
+  bucket = var.name
+}
+"""
+
+
+@pytest.fixture
+def module_dir(tmp_path):
+    module = tmp_path / "module"
+    (module / "modules" / "network").mkdir(parents=True)
+    (module / "main.tf").write_text(MAIN_TF)
+    (module / "variables.tf").write_text('variable "name" {}\n')
+    (module / "modules" / "network" / "main.tf").write_text('resource "aws_vpc" "vpc" {}\n')
+    return module
+
+
+def test_fingerprint_ignores_non_init_changes(module_dir):
+    fingerprint = terraform.init_fingerprint(str(module_dir))
+
+    (module_dir / "variables.tf").write_text('variable "name" {\n  default = "x"\n}\nvariable "other" {}\n')
+    (module_dir / "outputs.tf").write_text('output "id" {\n  value = aws_s3_bucket.bucket.id\n}\n')
+    (module_dir / "main.tf").write_text("\n\n" + MAIN_TF.replace("var.name", '"fixed"'))
+
+    assert terraform.init_fingerprint(str(module_dir)) == fingerprint
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda m: (m / "main.tf").write_text(MAIN_TF.replace("~> 5.0", "~> 6.0")),
+        lambda m: (m / "main.tf").write_text(MAIN_TF.replace("./modules/network", "./modules/other")),
+        lambda m: (m / "extra.tf").write_text('resource "random_id" "id" {}\n'),
+        lambda m: (m / "extra.tf").write_text('provider "google" {}\n'),
+        lambda m: (m / "modules" / "network" / "main.tf").write_text('resource "azurerm_vnet" "vpc" {}\n'),
+        lambda m: (m / ".terraform.lock.hcl").write_text("# lock\n"),
+    ],
+)
+def test_fingerprint_covers_init_requirements(module_dir, change):
+    fingerprint = terraform.init_fingerprint(str(module_dir))
+    change(module_dir)
+    assert terraform.init_fingerprint(str(module_dir)) != fingerprint
+
+
+def test_fingerprint_covers_provider_mirror(module_dir, tmp_path):
+    assert terraform.init_fingerprint(str(module_dir)) != terraform.init_fingerprint(
+        str(module_dir), str(tmp_path)
+    )
+
+
+def test_is_initialized(module_dir, tmp_path):
+    fingerprint = terraform.init_fingerprint(str(module_dir))
+    assert not terraform.is_initialized(str(module_dir), fingerprint)
+
+    provider_dir = module_dir / ".terraform" / "providers" / "registry.terraform.io" / "hashicorp" / "aws"
+    provider_dir.mkdir(parents=True)
+    cached_provider = tmp_path / "plugin-cache" / "aws"
+    cached_provider.mkdir(parents=True)
+    (provider_dir / "5.0.0").symlink_to(cached_provider)
+    terraform.record_init(str(module_dir), fingerprint)
+
+    assert terraform.is_initialized(str(module_dir), fingerprint)
+    assert not terraform.is_initialized(str(module_dir), "other")
+
+    cached_provider.rmdir()
+    assert not terraform.is_initialized(str(module_dir), fingerprint)
+
+
+def test_is_initialized_requires_terraform_dir_contents(module_dir):
+    fingerprint = terraform.init_fingerprint(str(module_dir))
+    (module_dir / ".terraform" / "providers").mkdir(parents=True)
+    terraform.record_init(str(module_dir), fingerprint)
+
+    (module_dir / ".terraform" / "providers").rmdir()
+
+    assert not terraform.is_initialized(str(module_dir), fingerprint)
@@ -1,3 +1,6 @@
+import os
+from unittest.mock import patch
+
 from ftf_cli.utils import generate_output_tree
 from ftf_cli.utils import generate_output_lookup_tree
 
@@ -190,6 +193,9 @@ def test_lookup_tree_mixed_nested_lists():
 
 import pytest
 from ftf_cli.utils import properties_to_lookup_tree, transform_properties_to_terraform
+from ftf_cli.utils import resolve_default_profile, set_default_profile
+from ftf_cli.utils import discover_resources
+from ftf_cli import module, utils
 
 
 class TestPropertiesToLookupTree:
@@ -545,3 +551,131 @@ class TestTransformPropertiesToTerraform:
         assert any('  level1 = object({' in line for line in lines)
         assert any('    level2 = object({' in line for line in lines)
         assert any('      field = string' in line for line in lines)
+
+
+class TestResolveDefaultProfile:
+    """Test cases for the deferred default profile resolver."""
+
+    def setup_method(self):
+        resolve_default_profile.cache_clear()
+
+    def teardown_method(self):
+        resolve_default_profile.cache_clear()
+
+    def test_env_var_takes_precedence(self, monkeypatch):
+        monkeypatch.setenv("FACETS_PROFILE", "from-env")
+        assert resolve_default_profile() == "from-env"
+
+    def test_resolved_once_per_process(self, monkeypatch):
+        monkeypatch.delenv("FACETS_PROFILE", raising=False)
+        with patch("ftf_cli.utils.get_default_profile", return_value="cfg") as mock_default:
+            assert resolve_default_profile() == "cfg"
+            assert resolve_default_profile() == "cfg"
+        mock_default.assert_called_once()
+
+    def test_set_default_profile_resets_cache(self, monkeypatch, tmp_path):
+        monkeypatch.delenv("FACETS_PROFILE", raising=False)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert resolve_default_profile() == "default"
+        set_default_profile("work")
+        assert resolve_default_profile() == "work"
+
+    def test_command_import_does_not_resolve_profile(self):
+        import importlib
+        import ftf_cli.commands.get_output_types as get_output_types_module
+
+        with patch("ftf_cli.utils.get_profile_with_priority") as mock_resolve:
+            importlib.reload(get_output_types_module)
+        mock_resolve.assert_not_called()
+        profile_option = next(
+            p for p in get_output_types_module.get_output_types.params if p.name == "profile"
+        )
+        assert profile_option.default is resolve_default_profile
+
+
+class TestDiscoverResources:
+    """Test cases for discover_resources."""
+
+    @pytest.fixture
+    def module_dir(self, tmp_path):
+        for i in range(10):
+            (tmp_path / f"file{i}.tf").write_text(
+                f'resource "aws_s3_bucket" "bucket{i}" {{\n  count = 2\n}}\n'
+                f'resource "aws_sqs_queue" "queue{i}" {{\n  for_each = var.queues\n}}\n'
+                # Declared in every file; reported once, for file0.tf.
+                'resource "aws_iam_role" "shared" {\n  name = "shared"\n}\n'
+            )
+        return tmp_path
+
+    def test_parallel_matches_sequential(self, module_dir):
+        sequential = discover_resources(str(module_dir), jobs=1)
+
+        assert discover_resources(str(module_dir), jobs=2) == sequential
+        assert len(sequential) == 21
+        assert [r["address"] for r in sequential] == sorted(r["address"] for r in sequential)
+        shared = next(r for r in sequential if r["address"] == "aws_iam_role.shared")
+        assert shared["source_file"] == "file0.tf"
+        bucket = next(r for r in sequential if r["address"] == "aws_s3_bucket.bucket3")
+        assert bucket["index_type"] == "count" and bucket["source_file"] == "file3.tf"
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_reports_every_unparsable_file(self, module_dir, capsys, jobs):
+        (module_dir / "file2.tf").write_text('resource "broken" {\n')
+        (module_dir / "file7.tf").write_text("= nope\n")
+
+        with pytest.raises(SystemExit) as exc_info:
+            discover_resources(str(module_dir), jobs=jobs)
+
+        assert exc_info.value.code == 1
+        output = capsys.readouterr().out
+        assert "Could not parse " + str(module_dir / "file2.tf") in output
+        assert "Could not parse " + str(module_dir / "file7.tf") in output
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_no_cache_validates_every_file(self, module_dir, capsys, jobs):
+        (module_dir / "file3.tf").write_text('resource "aws_s3_bucket" "bucket3" {\n  x = 1 +\n}\n')
+
+        # The scanner only reads resource headers and meta-arguments.
+        resources = discover_resources(str(module_dir), jobs=jobs)
+        assert "aws_s3_bucket.bucket3" in {r["address"] for r in resources}
+
+        with pytest.raises(SystemExit):
+            discover_resources(str(module_dir), jobs=jobs, use_cache=False)
+        assert "Could not parse " + str(module_dir / "file3.tf") in capsys.readouterr().out
+
+    def test_index_is_rebuilt_when_discovery_code_changes(self, module_dir):
+        from ftf_cli import cache, hcl_scan
+
+        discover_resources(str(module_dir), jobs=1)
+        source_digest = cache.source_digest
+
+        def changed_scanner(*files):
+            digest = source_digest(*files)
+            return digest + "-changed" if os.path.abspath(hcl_scan.__file__) in files else digest
+
+        with patch("ftf_cli.cache.source_digest", side_effect=changed_scanner), \
+                patch("ftf_cli.utils._file_resources", wraps=utils._file_resources) as file_resources:
+            discover_resources(str(module_dir), jobs=1)
+        assert file_resources.call_count == 10
+
+    def test_only_changed_files_are_parsed_again(self, module_dir):
+        first = discover_resources(str(module_dir), jobs=1)
+        (module_dir / "file4.tf").write_text('resource "aws_sns_topic" "topic" {}\n')
+        (module_dir / "file9.tf").unlink()
+
+        with patch("ftf_cli.utils._file_resources", wraps=utils._file_resources) as file_resources:
+            module.clear()
+            resources = discover_resources(str(module_dir), jobs=1)
+            assert file_resources.call_count == 1
+            assert discover_resources(str(module_dir), jobs=1) == resources
+            assert file_resources.call_count == 1
+
+            module.clear()
+            assert discover_resources(str(module_dir), jobs=1, use_cache=False) == resources
+            assert file_resources.call_count == 10
+
+        addresses = {r["address"] for r in resources}
+        assert "aws_sns_topic.topic" in addresses
+        assert addresses == {r["address"] for r in first} - {
+            "aws_s3_bucket.bucket4", "aws_sqs_queue.queue4", "aws_s3_bucket.bucket9", "aws_sqs_queue.queue9"
+        } | {"aws_sns_topic.topic"}
@@ -4,7 +4,7 @@ from ftf_cli.utils import check_no_array_or_invalid_pattern_in_spec, check_confl
 import os
 import tempfile
 import yaml
-from ftf_cli.utils import validate_yaml
+from ftf_cli.utils import validate_yaml, check_spec
 
 
 def test_no_array_type_pass():
@@ -313,3 +313,128 @@ def test_facets_yaml_with_iac_validated_files_array_of_non_strings():
     with pytest.raises(click.UsageError) as excinfo:
         validate_yaml(data)
     assert "validated_files" in str(excinfo.value)
+
+
+# Tests for the single-pass check_spec walker
+
+
+def _separate_checks(spec):
+    """The spec checks as separate passes: the field checks, then both recursive schemas."""
+    import jsonschema
+    from ftf_cli.schema import spec_schema, additional_properties_schema
+
+    try:
+        check_no_array_or_invalid_pattern_in_spec(spec)
+        check_conflicting_ui_properties(spec)
+    except click.UsageError as e:
+        return "usage", str(e)
+    try:
+        jsonschema.validate(instance=spec, schema=spec_schema)
+        spec_error = None
+    except jsonschema.exceptions.ValidationError as e:
+        spec_error = str(e)
+    try:
+        jsonschema.validate(instance=spec, schema=additional_properties_schema)
+        has_additional_properties = False
+    except jsonschema.exceptions.ValidationError:
+        has_additional_properties = True
+    return "ok", spec_error, has_additional_properties
+
+
+def _single_pass(spec):
+    try:
+        spec_error, has_additional_properties = check_spec(spec)
+    except click.UsageError as e:
+        return "usage", str(e)
+    return "ok", str(spec_error) if spec_error else None, has_additional_properties
+
+
+def _random_spec(rng, depth=0):
+    keys = [
+        "a", "b", "properties", "patternProperties", "type", "additionalProperties",
+        "x-ui-toggle", "x-ui-dynamic-enum", "x-ui-visible-if", "x-ui-yaml-editor",
+        "x-ui-override-disable", "x-ui-overrides-only", "x-ui-custom",
+    ]
+    leaves = [
+        True, False, 1, "object", "string", "array", "spec.a", "not a spec path",
+        {"type": "string"}, {"field": "spec.a"}, [{"field": "spec.a", "values": [1]}],
+    ]
+    if depth > 4 or rng.random() < 0.3:
+        return rng.choice(leaves)
+    return {rng.choice(keys): _random_spec(rng, depth + 1) for _ in range(rng.randint(1, 4))}
+
+
+def test_check_spec_matches_separate_checks():
+    import random
+
+    rng = random.Random(1234)
+    for _ in range(500):
+        spec = {"type": "object", "properties": _random_spec(rng)}
+        try:
+            expected = _separate_checks(spec)
+        except AttributeError:
+            continue  # malformed patternProperties crash both implementations alike
+        assert _single_pass(spec) == expected, spec
+
+
+def test_check_spec_reports_x_ui_error():
+    spec = {"properties": {"a": {"type": "object", "properties": {"b": {"x-ui-toggle": "yes"}}}}}
+    spec_error, has_additional_properties = check_spec(spec)
+    assert spec_error.message == "'yes' is not of type 'boolean'"
+    assert list(spec_error.path) == ["properties", "a", "properties", "b", "x-ui-toggle"]
+    assert not has_additional_properties
+
+
+def test_check_spec_reports_nested_additional_properties():
+    spec = {"properties": {"a": {"type": "object", "additionalProperties": False}}}
+    assert check_spec(spec) == (None, True)
+
+
+def test_check_spec_array_error_takes_priority():
+    spec = {
+        "properties": {
+            "a": {"x-ui-override-disable": True, "x-ui-overrides-only": True},
+            "b": {"type": "array", "x-ui-toggle": "yes"},
+        }
+    }
+    with pytest.raises(click.UsageError) as excinfo:
+        check_spec(spec)
+    assert "Invalid array type found at spec.properties.b" in str(excinfo.value)
+
+
+def test_check_spec_handles_deeply_nested_spec():
+    spec = {"type": "object"}
+    node = spec
+    for _ in range(2000):
+        node["properties"] = {"a": {"type": "object"}}
+        node = node["properties"]["a"]
+    node["x-ui-toggle"] = "yes"
+    spec_error, _ = check_spec(spec)
+    assert len(spec_error.path) == 4001
+
+
+def _deeply_nested_facets_yaml(leaf):
+    spec = {"type": "object"}
+    node = spec
+    for _ in range(2000):
+        node["properties"] = {"a": {"type": "object"}}
+        node = node["properties"]["a"]
+    node.update(leaf)
+    return {
+        "intent": "test",
+        "flavor": "default",
+        "version": "1.0",
+        "description": "deeply nested spec",
+        "clouds": ["aws"],
+        "spec": spec,
+    }
+
+
+def test_validate_yaml_handles_deeply_nested_spec():
+    assert validate_yaml(_deeply_nested_facets_yaml({"title": "leaf"})) is True
+
+    with pytest.raises(click.UsageError) as excinfo:
+        validate_yaml(_deeply_nested_facets_yaml({"type": "strin"}))
+    assert "is not following Facets Schema: 'strin' is not valid under any of the given schemas" in str(
+        excinfo.value
+    )
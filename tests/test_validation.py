@@ -0,0 +1,92 @@
+import copy
+from unittest.mock import patch
+
+import jsonschema
+import pytest
+
+from ftf_cli import schema, validation
+
+
+@pytest.fixture(autouse=True)
+def clear_validator_cache():
+    validation.get_validator.cache_clear()
+    yield
+    validation.get_validator.cache_clear()
+
+
+def test_validator_built_once_per_schema():
+    assert validation.get_validator("spec_schema") is validation.get_validator("spec_schema")
+    assert validation.get_validator("spec_schema") is not validation.get_validator("yaml_schema")
+
+
+def test_schema_checked_only_on_first_use():
+    validator_cls = jsonschema.validators.validator_for(schema.spec_schema)
+    with patch.object(validator_cls, "check_schema") as check_schema:
+        for _ in range(3):
+            validation.validate({"type": "object"}, "spec_schema")
+    check_schema.assert_called_once_with(schema.spec_schema)
+
+
+def test_unknown_schema_raises():
+    with pytest.raises(ValueError):
+        validation.get_validator("not_a_schema")
+
+
+@pytest.mark.parametrize(
+    "schema_name, instance",
+    [
+        ("yaml_schema", {"intent": "x"}),
+        ("yaml_schema", {"intent": 1, "flavor": "f", "version": "1", "description": "d", "spec": {}, "clouds": ["x"]}),
+        ("spec_schema", {"type": "object", "x-ui-dynamic-enum": "not-a-spec-path"}),
+        ("spec_schema", {"properties": {"a": {"x-ui-secret-ref": "yes"}}}),
+        ("additional_properties_schema", {"properties": {"a": {"additionalProperties": False}}}),
+    ],
+)
+def test_errors_match_jsonschema_validate(schema_name, instance):
+    schema_obj = getattr(schema, schema_name)
+    with pytest.raises(jsonschema.exceptions.ValidationError) as expected:
+        jsonschema.validate(instance=instance, schema=schema_obj)
+    with pytest.raises(jsonschema.exceptions.ValidationError) as actual:
+        validation.validate(instance, schema_name)
+    assert str(actual.value) == str(expected.value)
+
+
+def test_valid_instance_passes():
+    validation.validate({"type": "object", "properties": {"a": {"type": "string"}}}, "spec_schema")
+    validation.validate({"type": "object", "properties": {}}, "additional_properties_schema")
+
+
+FACETS_YAML = {"intent": "i", "flavor": "f", "version": "1", "description": "d", "clouds": ["aws"], "spec": {}}
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"spec": 5},
+        {"spec": {"type": 5}},
+        {"spec": {"required": "a", "allOf": []}},
+        {"spec": {"properties": {"a": {"type": "object", "properties": {"b": {"type": "strin"}}}}}},
+        {"spec": {"properties": {"a": {"items": [{"minLength": -1}]}}}},
+        {"spec": {"dependencies": {"a": {"type": 1}}}},
+        {"spec": {"anyOf": [{"not": {"minimum": "x"}}], "if": {"const": 1}, "then": {"maxLength": "x"}}},
+        {"spec": {"type": "object"}, "metadata": {"properties": []}},
+        {"spec": {"required": 5}, "clouds": "aws"},
+    ],
+)
+@pytest.mark.filterwarnings("ignore:The metaschema specified by \\$schema was not found")
+def test_yaml_errors_match_recursive_metaschema(document):
+    recursive_schema = copy.deepcopy(schema.yaml_schema)
+    for key in schema.SCHEMA_VALUED_KEYS:
+        recursive_schema["properties"][key] = jsonschema.Draft7Validator.META_SCHEMA
+    instance = {**FACETS_YAML, **document}
+
+    with pytest.raises(jsonschema.exceptions.ValidationError) as expected:
+        jsonschema.validate(instance=instance, schema=recursive_schema)
+    with pytest.raises(jsonschema.exceptions.ValidationError) as actual:
+        validation.validate_yaml_schema(instance)
+    assert actual.value.message == expected.value.message
+    assert actual.value.absolute_path == expected.value.absolute_path
+
+
+def test_valid_yaml_passes():
+    validation.validate_yaml_schema({**FACETS_YAML, "spec": {"type": "object", "properties": {"a": {"items": [{}]}}}})